@@ -9,32 +9,51 @@ programmatically to start research tasks and retrieve results.
 import requests
 import time
 import json
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 class CrewAIClient:
-    def __init__(self, base_url: str = "http://localhost:5000"):
+    def __init__(self, base_url: str = "http://localhost:5000", user_id: Optional[str] = None,
+                 priority: Optional[str] = None, api_token: Optional[str] = None):
         """
         Initialize the CrewAI API client.
         
         Args:
             base_url: The base URL of your hosted CrewAI system
+            user_id: Who the research is for; tasks are queued fairly per user
+            priority: Default priority class: "interactive", "normal" or "batch"
+            api_token: Token of a trusted caller (TRUSTED_CALLERS on the server),
+                needed for user_id and for priorities above "normal"
         """
         self.base_url = base_url.rstrip('/')
+        self.user_id = user_id
+        self.priority = priority
+        self.headers = {"Authorization": f"Bearer {api_token}"} if api_token else {}
     
-    def start_research(self, topic: str) -> Dict[str, Any]:
+    def start_research(self, topic: str, priority: Optional[str] = None,
+                       refresh: bool = False) -> Dict[str, Any]:
         """
         Start a new research task.
         
         Args:
             topic: The research topic
+            priority: Priority class for this task (use "batch" when
+                submitting many topics at once)
+            refresh: Update the latest report on this topic instead of
+                starting from scratch
             
         Returns:
             Dictionary containing task_id and status
         """
         url = f"{self.base_url}/start_research"
         payload = {"topic": topic}
-        
-        response = requests.post(url, json=payload)
+        if self.user_id:
+            payload["user_id"] = self.user_id
+        if priority or self.priority:
+            payload["priority"] = priority or self.priority
+        if refresh:
+            payload["refresh"] = True
+        
+        response = requests.post(url, json=payload, headers=self.headers)
         response.raise_for_status()
         
         return response.json()
@@ -82,19 +101,27 @@ class CrewAIClient:
         
         raise TimeoutError(f"Task {task_id} did not complete within {timeout} seconds")
     
-    def get_report_content(self, task_id: str) -> Dict[str, Any]:
+    def get_report_content(self, task_id: str, max_chars: Optional[int] = None,
+                           sections: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get the content of a completed research report.
         
         Args:
             task_id: The task ID
+            max_chars: Optional limit on the returned content length
+            sections: Optional section headings (or numbers) to return
             
         Returns:
             Dictionary containing report content and metadata
         """
         url = f"{self.base_url}/api/report/{task_id}"
+        params = {}
+        if max_chars:
+            params["max_chars"] = max_chars
+        if sections:
+            params["section"] = ",".join(str(s) for s in sections)
         
-        response = requests.get(url)
+        response = requests.get(url, params=params)
         response.raise_for_status()
         
         return response.json()
@@ -0,0 +1,223 @@
+"""
+ASGI Entry Point for the Web API
+Serves the same routes as web_app.py. Health checks, task status (including
+?wait=N long polling) and the report listing are answered on the event loop,
+so idle and polling connections don't hold a thread each. Every other route
+runs the Flask app on a bounded thread pool; its response is iterated
+lazily, one chunk at a time, and streamed back as it is produced.
+
+Run with:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5000
+    python asgi_app.py
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Tuple
+from urllib.parse import parse_qs
+
+import web_app
+from web_app import FINISHED_STATUSES, STATUS_POLL_INTERVAL, research_tasks, task_state
+
+# Threads running the Flask routes (report reads, research submissions, ...)
+WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 16))
+
+# Response bodies are sent in chunks of this size
+STREAM_CHUNK_BYTES = 64 * 1024
+
+_wsgi_executor = ThreadPoolExecutor(max_workers=WSGI_THREADS, thread_name_prefix="asgi-wsgi")
+
+
+class _Args:
+    """Query string accessor matching what web_app.status_wait expects"""
+
+    def __init__(self, query_string: bytes):
+        self.values = parse_qs(query_string.decode('latin-1'))
+
+    def get(self, key, default=None, type=None):
+        if key not in self.values:
+            return default
+        value = self.values[key][0]
+        try:
+            return type(value) if type else value
+        except ValueError:
+            return default
+
+
+async def _send_body(send, body: bytes, more_body: bool):
+    """Send a body part in chunks of at most STREAM_CHUNK_BYTES"""
+    for start in range(0, len(body), STREAM_CHUNK_BYTES):
+        await send({
+            'type': 'http.response.body',
+            'body': body[start:start + STREAM_CHUNK_BYTES],
+            'more_body': more_body or start + STREAM_CHUNK_BYTES < len(body),
+        })
+    if not body and not more_body:
+        await send({'type': 'http.response.body', 'body': b''})
+
+
+async def _send_response(send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes):
+    await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+    await _send_body(send, body, more_body=False)
+
+
+async def _send_json(send, payload: Any, status: int = 200):
+    body = json.dumps(payload).encode('utf-8')
+    await _send_response(send, status, [
+        (b'content-type', b'application/json'),
+        (b'content-length', str(len(body)).encode()),
+    ], body)
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            break
+        chunks.append(message.get('body', b''))
+        if not message.get('more_body'):
+            break
+    return b''.join(chunks)
+
+
+def _wsgi_environ(scope: Dict[str, Any], body: bytes) -> Dict[str, Any]:
+    """Build a WSGI environ for an ASGI HTTP request"""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode('utf-8').decode('latin-1'),
+        'PATH_INFO': scope['path'].encode('utf-8').decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': str(server[0]),
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'CONTENT_LENGTH': str(len(body)),
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(body),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': False,
+        'wsgi.run_once': False,
+    }
+    for raw_name, raw_value in scope['headers']:
+        name, value = raw_name.decode('latin-1'), raw_value.decode('latin-1')
+        if name == 'content-length':
+            continue
+        if name == 'content-type':
+            environ['CONTENT_TYPE'] = value
+            continue
+        key = 'HTTP_' + name.upper().replace('-', '_')
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+def _start_flask(environ: Dict[str, Any]):
+    """
+    Run the Flask app for one request up to its first body chunk (on a pool
+    thread). Returns status, headers, the WSGI result and its iterator, and
+    the first chunk (None if the body is empty).
+    """
+    started = {}
+
+    def start_response(status, headers, exc_info=None):
+        started['status'] = int(status.split(' ', 1)[0])
+        started['headers'] = [
+            (name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in headers
+        ]
+
+    result = web_app.app(environ, start_response)
+    iterator = iter(result)
+    try:
+        # Streamed responses may only call start_response once iterated
+        first = next(iterator, None)
+    except BaseException:
+        if hasattr(result, 'close'):
+            result.close()
+        raise
+    return started['status'], started['headers'], result, iterator, first
+
+
+async def _flask_route(scope, receive, send):
+    body = await _read_body(receive)
+    loop = asyncio.get_running_loop()
+    status, headers, result, iterator, chunk = await loop.run_in_executor(
+        _wsgi_executor, _start_flask, _wsgi_environ(scope, body)
+    )
+    try:
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        # Each further chunk is produced on the pool only once the previous one was sent
+        while chunk is not None:
+            await _send_body(send, chunk, more_body=True)
+            chunk = await loop.run_in_executor(_wsgi_executor, next, iterator, None)
+        await _send_body(send, b'', more_body=False)
+    finally:
+        if hasattr(result, 'close'):
+            await loop.run_in_executor(_wsgi_executor, result.close)
+
+
+async def _task_status(scope, send, task_id: str):
+    """Non-blocking /task_status: long polls sleep on the event loop, not a thread"""
+    task = research_tasks.get(task_id)
+    if task is None:
+        await _send_json(send, {'error': 'Task not found'}, 404)
+        return
+
+    state = task_state(task)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + web_app.status_wait(_Args(scope['query_string']))
+    while task['status'] not in FINISHED_STATUSES and task_state(task) == state and loop.time() < deadline:
+        await asyncio.sleep(STATUS_POLL_INTERVAL)
+    await _send_json(send, task)
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            web_app.start_background_services()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            _wsgi_executor.shutdown(wait=False)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI application"""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+        return
+    if scope['type'] != 'http':
+        return
+
+    path, method = scope['path'], scope['method']
+    if method == 'GET':
+        if path == '/healthz':
+            await _send_json(send, {'status': 'ok'})
+            return
+        if path == '/readyz':
+            payload, ready = web_app.readiness()
+            await _send_json(send, payload, 200 if ready else 503)
+            return
+        if path.startswith('/task_status/'):
+            await _task_status(scope, send, path[len('/task_status/'):])
+            return
+        if path == '/api/reports':
+            await _send_json(send, web_app.completed_reports())
+            return
+
+    await _flask_route(scope, receive, send)
+
+
+if __name__ == '__main__':
+    import uvicorn
+
+    uvicorn.run(app, host='0.0.0.0', port=int(os.getenv('PORT', 5000)), log_level='warning')
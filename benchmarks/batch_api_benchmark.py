@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark bulk research through provider batch APIs against direct calls
+
+Runs batch_research for the same topics twice against the fake LLM (which
+also serves the OpenAI batch endpoints): once with direct chat completions
+and once with --batch-api. Reports wall time, how many calls hit the
+synchronous API (the quota interactive users share) and how many went
+through batches.
+
+Usage:
+    python benchmarks/batch_api_benchmark.py --topics 20
+    python benchmarks/batch_api_benchmark.py --topics 50 --batch-turnaround 5 --llm-latency 1
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_services import ServiceProfile, start_fake_llm, start_fake_serp
+from pipeline_benchmark import fake_service_env
+from startup_benchmark import PROJECT_DIR
+
+
+def run_batch(args, llm, llm_url, serp_url, batch_api: bool):
+    """Run batch_research once and return what the fake LLM saw"""
+    workdir = tempfile.mkdtemp(prefix="firstcrew-batch-api-")
+    topics_path = os.path.join(workdir, "topics.txt")
+    with open(topics_path, "w") as f:
+        f.write("\n".join(f"Bulk topic {i}" for i in range(1, args.topics + 1)) + "\n")
+
+    env = fake_service_env(llm_url, serp_url)
+    env.update({
+        "PYTHONPATH": os.path.join(PROJECT_DIR, "src"),
+        "RETRIEVAL_ENABLED": "0",
+        "LLM_BATCH_MAX_WAIT": str(args.max_wait),
+        "LLM_BATCH_POLL_INTERVAL": str(args.poll_interval),
+    })
+    command = [sys.executable, "-m", "firstcrew.batch", topics_path,
+               "--output-dir", os.path.join(workdir, "out"), "--parallel", str(args.parallel)]
+    if batch_api:
+        command.append("--batch-api")
+
+    direct_before, batched_before = llm.RequestHandlerClass.profile.requests, llm.batches.requests
+    batches_before = llm.batches.submitted
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+
+    results = []
+    with open(os.path.join(workdir, "out", "results.jsonl")) as f:
+        results = [json.loads(line) for line in f if line.strip()]
+    return {
+        "mode": "batch-api" if batch_api else "direct",
+        "exit_code": completed.returncode,
+        "completed": sum(1 for r in results if r["status"] == "completed"),
+        "seconds": elapsed,
+        "direct_calls": llm.RequestHandlerClass.profile.requests - direct_before,
+        "batched_calls": llm.batches.requests - batched_before,
+        "batches": llm.batches.submitted - batches_before,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Provider batch API vs direct calls for bulk research")
+    parser.add_argument("--topics", type=int, default=20)
+    parser.add_argument("--parallel", type=int, default=None,
+                        help="concurrent crews (default: one per topic)")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="latency of direct calls")
+    parser.add_argument("--batch-turnaround", type=float, default=2.0, help="seconds until a batch finishes")
+    parser.add_argument("--max-wait", type=float, default=1.0, help="LLM_BATCH_MAX_WAIT for the run")
+    parser.add_argument("--poll-interval", type=float, default=0.5, help="LLM_BATCH_POLL_INTERVAL for the run")
+    parser.add_argument("--timeout", type=float, default=900)
+    parser.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = parser.parse_args()
+    args.parallel = args.parallel or args.topics
+
+    llm = start_fake_llm(ServiceProfile(latency=args.llm_latency), batch_turnaround=args.batch_turnaround)
+    serp = start_fake_serp()
+    llm_url = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+    serp_url = f"http://127.0.0.1:{serp.server_address[1]}/search"
+
+    print(f"🧪 Batch API benchmark ({args.topics} topics, {args.parallel} crews in parallel)")
+    print("=" * 78)
+    print("mode        done   seconds  direct calls  batched calls  batches")
+    results = []
+    for batch_api in (False, True):
+        result = run_batch(args, llm, llm_url, serp_url, batch_api)
+        results.append(result)
+        print(f"{result['mode']:10} {result['completed']:5} {result['seconds']:9.1f} "
+              f"{result['direct_calls']:13} {result['batched_calls']:14} {result['batches']:8}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
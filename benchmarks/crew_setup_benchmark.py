@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request crew setup time and memory
+
+Compares building a crew from scratch (``Firstcrew().crew()``) with cloning
+the cached template from ``CrewFactory``. No LLM or search calls are made.
+
+Usage:
+    python benchmarks/crew_setup_benchmark.py [runs] [--enhanced]
+"""
+
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Add the src directory to Python path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+
+def measure(label, build, runs):
+    """Time and trace memory for `runs` calls of build()"""
+    build()  # warm up imports and caches
+    gc.collect()
+
+    timings = []
+    tracemalloc.start()
+    start_current, _ = tracemalloc.get_traced_memory()
+
+    crews = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        crews.append(build())
+        timings.append(time.perf_counter() - started)
+
+    end_current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    timings.sort()
+    per_run_kb = (end_current - start_current) / runs / 1024
+    print(f"📊 {label}")
+    print(f"   runs:       {runs}")
+    print(f"   mean:       {statistics.mean(timings) * 1000:.3f} ms")
+    print(f"   p50:        {timings[len(timings) // 2] * 1000:.3f} ms")
+    print(f"   p95:        {timings[int(len(timings) * 0.95) - 1] * 1000:.3f} ms")
+    print(f"   total:      {sum(timings):.2f} s")
+    print(f"   memory/run: {per_run_kb:.1f} KiB (peak {peak / 1024 / 1024:.1f} MiB)")
+    print()
+    return statistics.mean(timings)
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 and sys.argv[1].isdigit() else 1000
+
+    if "--enhanced" in sys.argv:
+        from firstcrew.enhanced_crew import EnhancedFirstcrew as crew_class
+    else:
+        from firstcrew.crew import Firstcrew as crew_class
+
+    from firstcrew.crew_factory import CrewFactory
+
+    print(f"🧪 Crew setup benchmark ({crew_class.__name__})")
+    print("=" * 50)
+
+    rebuild = measure("Rebuild per request", lambda: crew_class().crew(), runs)
+
+    factory = CrewFactory(crew_class)
+    cloned = measure("Clone cached template", factory.create, runs)
+
+    print(f"🚀 Speedup: {rebuild / cloned:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+Fake OpenAI-compatible LLM server and fake SerpAPI for offline benchmarks
+
+Both servers answer with canned but well-formed payloads, sleep for a
+configurable (long-tailed) latency and can inject errors, so the real crew
+pipeline can be exercised without spending API credits. The LLM server also
+speaks the OpenAI (/v1/files + /v1/batches) and Anthropic
+(/v1/messages/batches) batch APIs; batches finish after a fixed turnaround,
+and reports cached prompt tokens the way providers with prefix caching do.
+
+Usage:
+    python benchmarks/fake_services.py --llm-port 8901 --serp-port 8902
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import uuid
+from email.parser import BytesParser
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class ServiceProfile:
+    """Latency and error injection settings for a fake service"""
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0,
+                 error_rate: float = 0.0, error_status: int = 500):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.errors = 0
+        self.lock = threading.Lock()
+
+    def delay(self):
+        """Sleep for the base latency plus an exponential (long-tail) jitter"""
+        extra = random.expovariate(1 / self.jitter) if self.jitter > 0 else 0.0
+        if self.latency + extra > 0:
+            time.sleep(self.latency + extra)
+
+    def should_fail(self) -> bool:
+        with self.lock:
+            self.requests += 1
+            failed = random.random() < self.error_rate
+            if failed:
+                self.errors += 1
+        return failed
+
+
+class _JSONHandler(BaseHTTPRequestHandler):
+    profile: ServiceProfile
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status: int, payload: dict):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _maybe_fail(self) -> bool:
+        self.profile.delay()
+        if self.profile.should_fail():
+            self._send_json(self.profile.error_status, {
+                "error": {"message": "Injected failure", "type": "fake_error"}
+            })
+            return True
+        return False
+
+
+def _research_answer(topic: str, structured: bool = False) -> str:
+    if structured:
+        findings = [
+            {"claim": f"{topic} development #{i}: a notable change reported this year",
+             "source_url": f"https://example.com/{i}", "date": "2025-01-15", "confidence": 0.8}
+            for i in range(1, 11)
+        ]
+        return "Thought: I now know the final answer\nFinal Answer: " + json.dumps({"findings": findings})
+    bullets = [
+        f"- {topic} development #{i}: a notable change reported this year "
+        f"(https://example.com/{i}, confidence: high)"
+        for i in range(1, 11)
+    ]
+    return "Thought: I now know the final answer\nFinal Answer: " + "\n".join(bullets)
+
+
+def _report_answer(topic: str, report_chars: int) -> str:
+    sections = []
+    paragraph = f"This section discusses {topic} in depth. " * 8
+    i = 1
+    while sum(len(s) for s in sections) < report_chars:
+        sections.append(f"## Section {i}\n\n{paragraph}\n")
+        i += 1
+    return "Thought: I now know the final answer\nFinal Answer: # Report on " + topic + "\n\n" + "\n".join(sections)
+
+
+def _text(content) -> str:
+    """Message content as plain text, also for lists of content blocks"""
+    if isinstance(content, list):
+        return "\n".join(block.get("text", "") for block in content if isinstance(block, dict))
+    return str(content or "")
+
+
+class FakePromptCache:
+    """
+    Prefix cache like the providers': a prompt reuses the longest run of
+    leading messages an earlier prompt started with. Counts served tokens.
+    """
+
+    def __init__(self):
+        self.prefixes = set()
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.lock = threading.Lock()
+
+    def lookup(self, messages: list, prompt_tokens: int) -> int:
+        keys = []
+        for message in messages:
+            keys.append(hash((keys[-1] if keys else None, message.get("role"), _text(message.get("content")))))
+        with self.lock:
+            hits = 0
+            while hits < len(keys) and keys[hits] in self.prefixes:
+                hits += 1
+            self.prefixes.update(keys)
+            cached = min(prompt_tokens, sum(len(_text(m.get("content"))) for m in messages[:hits]) // 4)
+            self.prompt_tokens += prompt_tokens
+            self.cached_tokens += cached
+        return cached
+
+    @property
+    def hit_rate(self) -> float:
+        return self.cached_tokens / self.prompt_tokens if self.prompt_tokens else 0.0
+
+
+# Queries of a looping researcher: the same search, trivially reworded
+SEARCH_REWORDINGS = ["latest developments", "recent developments", "news and developments",
+                     "latest news", "developments", "new developments", "current trends", "updates"]
+
+
+def _completion(request: dict, cache: Optional[FakePromptCache] = None) -> dict:
+    """Chat completion payload answering in crewai's ReAct format"""
+    messages = request.get("messages", [])
+    transcript = "\n".join(_text(m.get("content")) for m in messages)
+    system = next((_text(m.get("content")) for m in messages if m.get("role") == "system"), "")
+    conversation = "\n".join(_text(m.get("content")) for m in messages if m.get("role") != "system")
+    # The topic is part of the task (user message); older prompts also put it in the role
+    match = (re.search(r"about (.+?) (?:using|and expand|as context)", conversation)
+             or re.search(r"You are (.+?) (?:Senior Data Researcher|Reporting Analyst)", system))
+    topic = match.group(1).strip() if match else "the topic"
+
+    searches = conversation.count("Observation:")
+    if ("Action Input" in system and "Web Search" in system and searches < request.get("search_loops", 1)
+            and "Stop searching" not in conversation):
+        # Researcher turns: search, then (search_loops > 1) keep re-searching reworded queries
+        # like a model that can't decide it is done
+        query = f"{topic} {SEARCH_REWORDINGS[searches % len(SEARCH_REWORDINGS)]}"
+        content = (
+            "Thought: I should search for recent developments\n"
+            "Action: Web Search\n"
+            f"Action Input: {json.dumps({'query': query})}"
+        )
+    elif "Task Execution Evaluator" in system:
+        # crew.test() scoring
+        content = 'Thought: I now know the final answer\nFinal Answer: {"quality": 8.0}'
+    elif "Reporting Analyst" in system:
+        content = _report_answer(topic, request.get("report_chars", 4000))
+    else:
+        # crewai asks for JSON when the task has a structured output
+        content = _research_answer(topic, "in the following format" in conversation)
+
+    prompt_tokens = max(1, len(transcript) // 4)
+    completion_tokens = max(1, len(content) // 4)
+    cached_tokens = cache.lookup(messages, prompt_tokens) if cache else 0
+    return {
+        "id": f"chatcmpl-fake-{random.getrandbits(32):08x}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": request.get("model", "fake-model"),
+        "choices": [{
+            "index": 0,
+            "message": {"role": "assistant", "content": content},
+            "finish_reason": "stop",
+        }],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            "prompt_tokens_details": {"cached_tokens": cached_tokens},
+        },
+    }
+
+
+class FakeBatches:
+    """Files and batches of the fake batch APIs, finished after `turnaround` seconds"""
+
+    def __init__(self, turnaround: float = 1.0):
+        self.turnaround = turnaround
+        self.files = {}
+        self.batches = {}
+        self.submitted = 0
+        self.requests = 0
+        self.lock = threading.Lock()
+
+    def add_file(self, content: bytes) -> str:
+        file_id = f"file-{uuid.uuid4().hex[:12]}"
+        with self.lock:
+            self.files[file_id] = content
+        return file_id
+
+    def add_batch(self, batch: dict, finish) -> dict:
+        with self.lock:
+            self.batches[batch["id"]] = batch
+            self.submitted += 1
+        timer = threading.Timer(self.turnaround, finish)
+        timer.daemon = True
+        timer.start()
+        return batch
+
+
+class FakeLLMHandler(_JSONHandler):
+    """
+    Minimal /v1/chat/completions endpoint speaking crewai's ReAct format,
+    plus the OpenAI and Anthropic batch endpoints
+    """
+
+    report_chars = 4000
+    search_loops = 1
+    batches: FakeBatches
+    prompt_cache: FakePromptCache
+
+    def _body(self) -> bytes:
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _send_text(self, text: str):
+        body = text.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/jsonl")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        path = self.path.rstrip("/")
+        if path.endswith("/messages/batches"):
+            self._create_anthropic_batch(json.loads(self._body() or b"{}"))
+            return
+        if path.endswith("/files"):
+            self._upload_file()
+            return
+        if path.endswith("/batches"):
+            self._create_openai_batch(json.loads(self._body() or b"{}"))
+            return
+        if not path.endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": "Not found"}})
+            return
+
+        request = json.loads(self._body() or b"{}")
+        if self._maybe_fail():
+            return
+        self._send_json(200, _completion({**request, "report_chars": self.report_chars,
+                                          "search_loops": self.search_loops},
+                                             self.prompt_cache))
+
+    def do_GET(self):
+        path = self.path.rstrip("/")
+        match = re.search(r"/messages/batches/([\w-]+)(/results)?$", path)
+        if match:
+            batch = self.batches.batches.get(match.group(1))
+            if batch is None:
+                self._send_json(404, {"error": {"message": "No such batch"}})
+            elif match.group(2):
+                self._send_text(batch["_results"])
+            else:
+                self._send_json(200, {k: v for k, v in batch.items() if not k.startswith("_")})
+            return
+        match = re.search(r"/files/([\w-]+)/content$", path)
+        if match and match.group(1) in self.batches.files:
+            self._send_text(self.batches.files[match.group(1)].decode("utf-8"))
+            return
+        match = re.search(r"/batches/([\w-]+)$", path)
+        if match and match.group(1) in self.batches.batches:
+            self._send_json(200, self.batches.batches[match.group(1)])
+            return
+        self._send_json(404, {"error": {"message": "Not found"}})
+
+    def _upload_file(self):
+        head = f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode()
+        message = BytesParser(policy=default_policy).parsebytes(head + self._body())
+        content = next(
+            (part.get_payload(decode=True) for part in message.iter_parts() if part.get_filename()), b""
+        )
+        self._send_json(200, {"id": self.batches.add_file(content), "object": "file", "purpose": "batch",
+                              "bytes": len(content)})
+
+    def _create_openai_batch(self, request: dict):
+        content = self.batches.files.get(request.get("input_file_id"))
+        if content is None:
+            self._send_json(404, {"error": {"message": "No such file"}})
+            return
+        lines = [json.loads(line) for line in content.decode("utf-8").splitlines() if line.strip()]
+        batch = {"id": f"batch_{uuid.uuid4().hex[:12]}", "object": "batch", "status": "in_progress",
+                 "endpoint": request.get("endpoint"), "input_file_id": request["input_file_id"],
+                 "output_file_id": None, "error_file_id": None, "created_at": int(time.time()),
+                 "request_counts": {"total": len(lines), "completed": 0, "failed": 0}}
+
+        def finish():
+            output = "".join(json.dumps({
+                "id": f"batch_req_{uuid.uuid4().hex[:12]}",
+                "custom_id": line["custom_id"],
+                "response": {"status_code": 200, "body": _completion(
+                    {**line["body"], "report_chars": self.report_chars}, self.prompt_cache
+                )},
+                "error": None,
+            }) + "\n" for line in lines)
+            with self.batches.lock:
+                self.batches.requests += len(lines)
+            batch.update(status="completed", output_file_id=self.batches.add_file(output.encode("utf-8")),
+                         request_counts={"total": len(lines), "completed": len(lines), "failed": 0})
+
+        self._send_json(200, self.batches.add_batch(batch, finish))
+
+    def _create_anthropic_batch(self, request: dict):
+        entries = request.get("requests", [])
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:12]}"
+        host, port = self.server.server_address[:2]
+        batch = {"id": batch_id, "type": "message_batch", "processing_status": "in_progress",
+                 "results_url": None, "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+
+        def finish():
+            results = []
+            for entry in entries:
+                params = entry["params"]
+                messages = [{"role": "system", "content": params.get("system", "")}] + params["messages"]
+                body = _completion({"messages": messages, "model": params["model"],
+                                    "report_chars": self.report_chars}, self.prompt_cache)
+                cached = body["usage"]["prompt_tokens_details"]["cached_tokens"]
+                results.append(json.dumps({"custom_id": entry["custom_id"], "result": {
+                    "type": "succeeded",
+                    "message": {
+                        "id": body["id"], "type": "message", "role": "assistant", "model": params["model"],
+                        "content": [{"type": "text", "text": body["choices"][0]["message"]["content"]}],
+                        "usage": {"input_tokens": body["usage"]["prompt_tokens"] - cached,
+                                  "output_tokens": body["usage"]["completion_tokens"],
+                                  "cache_read_input_tokens": cached},
+                    },
+                }}) + "\n")
+            with self.batches.lock:
+                self.batches.requests += len(entries)
+            batch.update(_results="".join(results), processing_status="ended",
+                         results_url=f"http://{host}:{port}/v1/messages/batches/{batch_id}/results")
+
+        self._send_json(200, self.batches.add_batch(batch, finish))
+
+
+class FakeSerpHandler(_JSONHandler):
+    """Minimal SerpAPI /search endpoint for web and news results"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query).get("q", [""])[0]
+        is_news = parse_qs(url.query).get("tbm", [""])[0] == "nws"
+        if self._maybe_fail():
+            return
+
+        results = [
+            {
+                "title": f"{query} result {i}",
+                "snippet": f"Snippet {i} about {query}.",
+                "link": f"https://example.com/{i}",
+                "source": "Example News",
+                "date": "1 day ago",
+            }
+            for i in range(1, 11)
+        ]
+        key = "news_results" if is_news else "organic_results"
+        self._send_json(200, {key: results})
+
+
+def start_server(handler_class, profile: ServiceProfile, port: int = 0,
+                 **attributes) -> ThreadingHTTPServer:
+    """Start a fake service in a daemon thread and return the server"""
+    handler = type(handler_class.__name__, (handler_class,), {"profile": profile, **attributes})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, name=handler_class.__name__)
+    thread.daemon = True
+    thread.start()
+    return server
+
+
+def start_fake_llm(profile: Optional[ServiceProfile] = None, port: int = 0,
+                   report_chars: int = 4000, batch_turnaround: float = 1.0,
+                   search_loops: int = 1) -> ThreadingHTTPServer:
+    """
+    Start the fake LLM; its batch state is available as server.batches and
+    its prompt cache as server.prompt_cache
+    """
+    batches = FakeBatches(batch_turnaround)
+    prompt_cache = FakePromptCache()
+    server = start_server(FakeLLMHandler, profile or ServiceProfile(), port,
+                          report_chars=report_chars, search_loops=search_loops, batches=batches,
+                          prompt_cache=prompt_cache)
+    server.batches = batches
+    server.prompt_cache = prompt_cache
+    return server
+
+
+def start_fake_serp(profile: Optional[ServiceProfile] = None, port: int = 0) -> ThreadingHTTPServer:
+    return start_server(FakeSerpHandler, profile or ServiceProfile(), port)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run fake LLM and SerpAPI servers")
+    parser.add_argument("--llm-port", type=int, default=8901)
+    parser.add_argument("--serp-port", type=int, default=8902)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--batch-turnaround", type=float, default=1.0, help="seconds until a batch finishes")
+    parser.add_argument("--serp-latency", type=float, default=0.3)
+    parser.add_argument("--serp-jitter", type=float, default=0.1)
+    parser.add_argument("--serp-error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    llm = start_fake_llm(ServiceProfile(args.llm_latency, args.llm_jitter, args.llm_error_rate), args.llm_port,
+                         batch_turnaround=args.batch_turnaround)
+    serp = start_fake_serp(ServiceProfile(args.serp_latency, args.serp_jitter, args.serp_error_rate), args.serp_port)
+
+    print(f"🤖 Fake LLM:     http://127.0.0.1:{llm.server_address[1]}/v1")
+    print(f"🔍 Fake SerpAPI: http://127.0.0.1:{serp.server_address[1]}/search")
+    print("🛑 Press Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+Offline end-to-end benchmark of the research pipeline
+
+Starts a fake OpenAI-compatible LLM and a fake SerpAPI, launches the real
+web_app.py pointed at them, submits research jobs through /start_research
+and polls /task_status until every job finishes. Reports jobs/min,
+p50/p95/p99 end-to-end latency and server memory per job for each
+concurrency level. No real API keys are used.
+
+Usage:
+    python benchmarks/pipeline_benchmark.py --concurrency 1 2 4 --jobs 8
+    python benchmarks/pipeline_benchmark.py --crew basic --llm-error-rate 0.05
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_services import ServiceProfile, start_fake_llm, start_fake_serp
+from startup_benchmark import PROJECT_DIR, free_port
+
+# Provider keys that must not leak from the caller's environment into the run
+PROVIDER_KEY_PREFIXES = (
+    "GROQ_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY", "ANTHROPIC_API_KEY", "KIMI_API_KEY",
+)
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+
+def rss_mib(pid: int):
+    """Resident memory of a process in MiB (Linux /proc only)"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+class MemorySampler(threading.Thread):
+    """Tracks peak RSS of the server process while jobs run"""
+
+    def __init__(self, pid: int, interval: float = 0.2):
+        super().__init__(daemon=True)
+        self.pid = pid
+        self.interval = interval
+        self.peak = rss_mib(pid) or 0.0
+        self.running = True
+
+    def run(self):
+        while self.running:
+            current = rss_mib(self.pid)
+            if current:
+                self.peak = max(self.peak, current)
+            time.sleep(self.interval)
+
+
+def fake_service_env(llm_url, serp_url):
+    """Environment pointing the crews at the fake services, with no real provider keys"""
+    env = {
+        key: value for key, value in os.environ.items()
+        if not key.startswith(PROVIDER_KEY_PREFIXES)
+    }
+    # Blank values also stop load_dotenv() from re-adding keys from a .env file
+    for prefix in PROVIDER_KEY_PREFIXES:
+        env[prefix] = ""
+        env.update({f"{prefix}_{i}": "" for i in range(2, 11)})
+    env.update({
+        "OPENAI_API_KEY": "fake-key",
+        "OPENAI_BASE_URL": llm_url,
+        "OPENAI_API_BASE": llm_url,
+        "MODEL": "gpt-4o-mini",
+        "OPENAI_QUALITY_MODEL": "gpt-4o-mini",
+        "SERP_API_KEY": "fake-key",
+        "SERP_API_URL": serp_url,
+        "SERP_CACHE_TTL": "0",
+        "CREWAI_DISABLE_TELEMETRY": "true",
+        "OTEL_SDK_DISABLED": "true",
+        "LLM_ENV_FILE": os.devnull,
+    })
+    return env
+
+
+def start_web_app(args, concurrency, llm_url, serp_url, script="web_app.py"):
+    port = free_port()
+    env = fake_service_env(llm_url, serp_url)
+    env.update({
+        "PORT": str(port),
+        "FLASK_DEBUG": "0",
+        "PRELOAD_CREW": "1",
+        "MAX_CONCURRENT_RESEARCH": str(concurrency),
+        "RESEARCH_CREW": args.crew,
+    })
+
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_DIR, script)],
+        cwd=args.workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.time() + 120
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"{script} exited with code {process.returncode}")
+        try:
+            if requests.get(f"{base_url}/healthz", timeout=1).status_code == 200:
+                return process, base_url
+        except requests.exceptions.ConnectionError:
+            pass
+        time.sleep(0.05)
+    process.terminate()
+    raise TimeoutError(f"{script} did not start")
+
+
+def run_jobs(base_url, jobs, timeout):
+    """Submit all jobs at once and return (latencies, failures, wall seconds)"""
+    submitted = {}
+    started = time.perf_counter()
+    for i in range(jobs):
+        response = requests.post(f"{base_url}/start_research", json={"topic": f"Benchmark topic {i}"}, timeout=10)
+        response.raise_for_status()
+        submitted[response.json()["task_id"]] = time.perf_counter()
+
+    latencies, failures = [], 0
+    pending = dict(submitted)
+    while pending and time.perf_counter() - started < timeout:
+        for task_id in list(pending):
+            status = requests.get(f"{base_url}/task_status/{task_id}", timeout=10).json()
+            if status.get("status") in ("completed", "failed"):
+                latencies.append(time.perf_counter() - pending.pop(task_id))
+                if status["status"] == "failed":
+                    failures += 1
+        time.sleep(0.1)
+
+    failures += len(pending)  # timed out
+    return latencies, failures, time.perf_counter() - started
+
+
+def benchmark_level(args, concurrency, llm_url, serp_url):
+    process, base_url = start_web_app(args, concurrency, llm_url, serp_url)
+    try:
+        # One warm-up job so import and template build time is not measured
+        run_jobs(base_url, 1, args.timeout)
+        baseline = rss_mib(process.pid) or 0.0
+
+        sampler = MemorySampler(process.pid)
+        sampler.start()
+        latencies, failures, wall = run_jobs(base_url, args.jobs, args.timeout)
+        sampler.running = False
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {
+        "concurrency": concurrency,
+        "jobs": args.jobs,
+        "failures": failures,
+        "jobs_per_min": len(latencies) / wall * 60 if wall else 0.0,
+        "p50_s": percentile(latencies, 0.50),
+        "p95_s": percentile(latencies, 0.95),
+        "p99_s": percentile(latencies, 0.99),
+        "mean_s": statistics.mean(latencies) if latencies else 0.0,
+        "baseline_rss_mib": baseline,
+        "peak_rss_mib": sampler.peak,
+        "memory_per_job_mib": (sampler.peak - baseline) / concurrency if baseline else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline research pipeline benchmark")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--jobs", type=int, default=8, help="jobs per concurrency level")
+    parser.add_argument("--crew", choices=["enhanced", "basic"], default="enhanced")
+    parser.add_argument("--llm-latency", type=float, default=0.3)
+    parser.add_argument("--llm-jitter", type=float, default=0.2)
+    parser.add_argument("--llm-error-rate", type=float, default=0.0)
+    parser.add_argument("--serp-latency", type=float, default=0.2)
+    parser.add_argument("--serp-jitter", type=float, default=0.1)
+    parser.add_argument("--serp-error-rate", type=float, default=0.0)
+    parser.add_argument("--report-chars", type=int, default=4000)
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--workdir", default=None,
+                        help="directory web_app.py runs in (defaults to a temporary directory)")
+    parser.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = parser.parse_args()
+    args.workdir = args.workdir or tempfile.mkdtemp(prefix="firstcrew-bench-")
+
+    llm_profile = ServiceProfile(args.llm_latency, args.llm_jitter, args.llm_error_rate)
+    serp_profile = ServiceProfile(args.serp_latency, args.serp_jitter, args.serp_error_rate)
+    llm = start_fake_llm(llm_profile, report_chars=args.report_chars)
+    serp = start_fake_serp(serp_profile)
+    llm_url = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+    serp_url = f"http://127.0.0.1:{serp.server_address[1]}/search"
+
+    print(f"🧪 Offline pipeline benchmark ({args.crew} crew, {args.jobs} jobs per level)")
+    print("=" * 88)
+    print(f"{'conc':>4} {'jobs/min':>9} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} "
+          f"{'failed':>7} {'peak MiB':>9} {'MiB/job':>8}")
+
+    results = []
+    for concurrency in args.concurrency:
+        result = benchmark_level(args, concurrency, llm_url, serp_url)
+        results.append(result)
+        per_job = result["memory_per_job_mib"]
+        print(f"{concurrency:>4} {result['jobs_per_min']:>9.1f} {result['p50_s']:>8.2f} "
+              f"{result['p95_s']:>8.2f} {result['p99_s']:>8.2f} {result['failures']:>7} "
+              f"{result['peak_rss_mib']:>9.1f} {per_job if per_job is not None else float('nan'):>8.1f}")
+
+    print(f"\n🤖 Fake LLM requests: {llm_profile.requests} ({llm_profile.errors} injected errors)")
+    print(f"🧊 Prompt tokens served from the prefix cache: {llm.prompt_cache.cached_tokens} "
+          f"of {llm.prompt_cache.prompt_tokens} ({llm.prompt_cache.hit_rate:.0%})")
+    print(f"🔍 Fake SerpAPI requests: {serp_profile.requests} ({serp_profile.errors} injected errors)")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results saved to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
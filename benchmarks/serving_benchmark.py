@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Flask server (web_app.py) against the ASGI server (asgi_app.py)
+
+For each server a research task is started against a fake LLM slow enough
+to keep it running, then an asyncio load generator (raw keep-alive HTTP/1.1
+connections, no client library) measures:
+
+    throughput   /task_status polling at several connection counts:
+                 requests/s, p50/p99 latency and errors
+    long polls   N connections held on /task_status?wait=S while /healthz
+                 latency is sampled: how well the server copes with many
+                 idle status connections
+
+Usage:
+    python benchmarks/serving_benchmark.py
+    python benchmarks/serving_benchmark.py --connections 50 500 --hold 2000 --servers asgi
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+import requests
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_services import ServiceProfile, start_fake_llm, start_fake_serp
+from pipeline_benchmark import percentile, rss_mib, start_web_app
+
+SERVERS = {"flask": "web_app.py", "asgi": "asgi_app.py"}
+
+
+def raise_fd_limit(wanted: int):
+    """Allow enough sockets for the held connections (inherited by the server)"""
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    target = min(hard, max(soft, wanted))
+    if target > soft:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+    return target
+
+
+class Connection:
+    """One keep-alive HTTP/1.1 client connection"""
+
+    def __init__(self, host: str, port: int):
+        self.host, self.port = host, port
+        self.reader = self.writer = None
+
+    async def request(self, path: str) -> int:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(f"GET {path} HTTP/1.1\r\nHost: {self.host}\r\n\r\n".encode())
+        await self.writer.drain()
+
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split()[1])
+        headers = {k.lower(): v.strip() for k, _, v in (line.partition(":") for line in lines[1:] if line)}
+        if "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            await self.reader.read()  # body runs until the server closes
+            headers["connection"] = "close"
+        if headers.get("connection", "").lower() == "close":
+            self.close()
+        return status
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+        self.reader = self.writer = None
+
+
+async def _poller(host, port, path, stop_at, latencies, errors):
+    connection = Connection(host, port)
+    while time.perf_counter() < stop_at:
+        started = time.perf_counter()
+        try:
+            status = await connection.request(path)
+            if status == 200:
+                latencies.append(time.perf_counter() - started)
+            else:
+                errors.append(status)
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            errors.append(type(e).__name__)
+            connection.close()
+            await asyncio.sleep(0.05)
+    connection.close()
+
+
+async def throughput(host, port, path, connections, seconds):
+    latencies, errors = [], []
+    stop_at = time.perf_counter() + seconds
+    await asyncio.gather(*[
+        _poller(host, port, path, stop_at, latencies, errors) for _ in range(connections)
+    ])
+    return {
+        "connections": connections,
+        "requests_per_s": len(latencies) / seconds,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "errors": len(errors),
+    }
+
+
+async def _long_poll(host, port, path, results):
+    connection = Connection(host, port)
+    try:
+        results.append(await connection.request(path))
+    except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+        results.append(type(e).__name__)
+    finally:
+        connection.close()
+
+
+async def long_polls(host, port, task_id, held, wait_seconds):
+    """Hold `held` long polls and sample /healthz latency meanwhile"""
+    results = []
+    path = f"/task_status/{task_id}?wait={wait_seconds}"
+    polls = [asyncio.ensure_future(_long_poll(host, port, path, results)) for _ in range(held)]
+    await asyncio.sleep(min(2.0, wait_seconds / 3))
+
+    health = []
+    probe = Connection(host, port)
+    probe_until = time.perf_counter() + wait_seconds / 3
+    while time.perf_counter() < probe_until:
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(probe.request("/healthz"), timeout=wait_seconds)
+            health.append(time.perf_counter() - started)
+        except (OSError, asyncio.IncompleteReadError, asyncio.TimeoutError, ValueError):
+            health.append(float("inf"))
+            probe.close()
+        await asyncio.sleep(0.05)
+    probe.close()
+
+    await asyncio.gather(*polls)
+    ok = sum(1 for result in results if result == 200)
+    return {
+        "held": held,
+        "completed": ok,
+        "failed": held - ok,
+        "healthz_p50_ms": percentile(health, 0.50) * 1000,
+        "healthz_max_ms": max(health) * 1000 if health else 0.0,
+    }
+
+
+def start_long_running_task(base_url):
+    """Start a research task that stays running for the whole benchmark"""
+    response = requests.post(f"{base_url}/start_research", json={"topic": "Serving benchmark"}, timeout=10)
+    response.raise_for_status()
+    task_id = response.json()["task_id"]
+    deadline = time.time() + 60
+    while time.time() < deadline:
+        if requests.get(f"{base_url}/task_status/{task_id}", timeout=5).json()["status"] == "running":
+            return task_id
+        time.sleep(0.1)
+    raise TimeoutError("benchmark task did not start")
+
+
+def benchmark_server(args, name, llm_url, serp_url):
+    # A workdir per server: the next one would otherwise resume this one's task
+    server_args = argparse.Namespace(**vars(args))
+    server_args.workdir = os.path.join(args.workdir, name)
+    os.makedirs(server_args.workdir, exist_ok=True)
+    process, base_url = start_web_app(server_args, 1, llm_url, serp_url, script=SERVERS[name])
+    host, port = base_url.rsplit("//", 1)[1].split(":")
+    try:
+        task_id = start_long_running_task(base_url)
+        baseline = rss_mib(process.pid)
+
+        levels = []
+        for connections in args.connections:
+            level = asyncio.run(throughput(host, int(port), f"/task_status/{task_id}", connections, args.seconds))
+            levels.append(level)
+            print(f"   {name:5} {connections:5} conns: {level['requests_per_s']:8.0f} req/s | "
+                  f"p50 {level['p50_ms']:7.1f} ms | p99 {level['p99_ms']:7.1f} ms | errors {level['errors']}")
+
+        held = asyncio.run(long_polls(host, int(port), task_id, args.hold, args.wait))
+        print(f"   {name:5} {args.hold} long polls: {held['completed']} ok, {held['failed']} failed | "
+              f"/healthz p50 {held['healthz_p50_ms']:.1f} ms, max {held['healthz_max_ms']:.1f} ms")
+        peak = rss_mib(process.pid)
+    finally:
+        process.terminate()
+        process.wait()
+
+    return {"server": name, "throughput": levels, "long_polls": held, "rss_mib": [baseline, peak]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Flask vs ASGI serving benchmark")
+    parser.add_argument("--servers", nargs="+", choices=list(SERVERS), default=list(SERVERS))
+    parser.add_argument("--connections", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--seconds", type=float, default=5.0, help="duration of each throughput level")
+    parser.add_argument("--hold", type=int, default=1000, help="concurrent long-poll connections")
+    parser.add_argument("--wait", type=float, default=10.0, help="long-poll wait in seconds")
+    parser.add_argument("--workdir", default=None)
+    parser.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = parser.parse_args()
+    args.workdir = args.workdir or tempfile.mkdtemp(prefix="firstcrew-serving-")
+    args.crew = "enhanced"
+
+    limit = raise_fd_limit(max(args.connections + [args.hold]) * 2 + 256)
+    if limit < args.hold + 64:
+        print(f"⚠️  Open file limit {limit} is below --hold {args.hold}, expect connection errors")
+
+    # The fake LLM answers slower than the benchmark runs, so the task stays "running"
+    llm = start_fake_llm(ServiceProfile(latency=3600))
+    serp = start_fake_serp()
+    llm_url = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+    serp_url = f"http://127.0.0.1:{serp.server_address[1]}/search"
+
+    print("🧪 Serving benchmark (Flask vs ASGI)")
+    print("=" * 60)
+    results = [benchmark_server(args, name, llm_url, serp_url) for name in args.servers]
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
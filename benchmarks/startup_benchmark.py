@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark web_app cold start: time from process launch to first successful
+health request
+
+Exits non-zero when the median startup time exceeds --max-seconds, so it can
+be tracked as a regression check in CI or before a deploy.
+
+Usage:
+    python benchmarks/startup_benchmark.py [--runs 5] [--max-seconds 3] [--workdir /tmp/x]
+
+tests/test_startup.py runs it with a budget on every test run.
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import requests
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+HEALTH_PATH = "/healthz"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_startup(timeout: float, workdir: str = PROJECT_DIR) -> float:
+    """Launch web_app.py in `workdir` and return seconds until the health path answers 200"""
+    port = free_port()
+    env = dict(os.environ, PORT=str(port), FLASK_DEBUG="0", PRELOAD_CREW="0")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(PROJECT_DIR, "web_app.py")],
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    try:
+        while time.perf_counter() - started < timeout:
+            if process.poll() is not None:
+                raise RuntimeError(f"web_app.py exited with code {process.returncode}")
+            try:
+                response = requests.get(f"http://127.0.0.1:{port}{HEALTH_PATH}", timeout=1)
+                if response.status_code == 200:
+                    return time.perf_counter() - started
+            except requests.exceptions.ConnectionError:
+                pass
+            time.sleep(0.02)
+        raise TimeoutError(f"web_app.py did not become healthy within {timeout} seconds")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="web_app cold start benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="fail if the median startup time exceeds this")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--workdir", default=PROJECT_DIR,
+                        help="directory the app keeps its task and report stores in")
+    args = parser.parse_args()
+
+    print("🧪 web_app cold start benchmark")
+    print("=" * 40)
+
+    timings = []
+    for i in range(args.runs):
+        elapsed = measure_startup(args.timeout, args.workdir)
+        timings.append(elapsed)
+        print(f"   Run {i + 1}: {elapsed:.3f} s")
+
+    median = statistics.median(timings)
+    print(f"\n📊 median {median:.3f} s | min {min(timings):.3f} s | max {max(timings):.3f} s")
+
+    if args.max_seconds is not None:
+        if median > args.max_seconds:
+            print(f"❌ Startup regression: {median:.3f} s > {args.max_seconds:.3f} s")
+            sys.exit(1)
+        print(f"✅ Within budget ({args.max_seconds:.3f} s)")
+
+
+if __name__ == "__main__":
+    main()
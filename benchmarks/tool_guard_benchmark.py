@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Benchmark the run-scoped tool guard against a looping researcher
+
+The fake LLM plays a researcher that keeps re-issuing trivially reworded
+Web Search queries (--search-loops of them) instead of answering. Runs
+batch_research for the same topics with TOOL_GUARD=0 and TOOL_GUARD=1 and
+reports wall time, LLM calls and SerpAPI calls per topic.
+
+Usage:
+    python benchmarks/tool_guard_benchmark.py --topics 4
+    python benchmarks/tool_guard_benchmark.py --topics 8 --search-loops 20 --llm-latency 0.5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fake_services import ServiceProfile, start_fake_llm, start_fake_serp
+from pipeline_benchmark import fake_service_env
+from startup_benchmark import PROJECT_DIR
+
+
+def run_batch(args, llm, serp, llm_url, serp_url, guard: bool):
+    """Run batch_research once and return what the fake services saw"""
+    workdir = tempfile.mkdtemp(prefix="firstcrew-tool-guard-")
+    topics_path = os.path.join(workdir, "topics.txt")
+    with open(topics_path, "w") as f:
+        f.write("\n".join(f"Looping topic {i}" for i in range(1, args.topics + 1)) + "\n")
+
+    env = fake_service_env(llm_url, serp_url)
+    env.update({
+        "PYTHONPATH": os.path.join(PROJECT_DIR, "src"),
+        "RETRIEVAL_ENABLED": "0",
+        "TOOL_GUARD": "1" if guard else "0",
+    })
+    command = [sys.executable, "-m", "firstcrew.batch", topics_path,
+               "--output-dir", os.path.join(workdir, "out"), "--parallel", str(args.parallel)]
+
+    llm_before = llm.RequestHandlerClass.profile.requests
+    serp_before = serp.RequestHandlerClass.profile.requests
+    started = time.perf_counter()
+    completed = subprocess.run(command, cwd=workdir, env=env, stdout=subprocess.DEVNULL,
+                               stderr=subprocess.DEVNULL, timeout=args.timeout)
+    elapsed = time.perf_counter() - started
+
+    with open(os.path.join(workdir, "out", "results.jsonl")) as f:
+        results = [json.loads(line) for line in f if line.strip()]
+    return {
+        "guard": guard,
+        "exit_code": completed.returncode,
+        "completed": sum(1 for r in results if r["status"] == "completed"),
+        "seconds": elapsed,
+        "llm_calls_per_topic": (llm.RequestHandlerClass.profile.requests - llm_before) / args.topics,
+        "serp_calls_per_topic": (serp.RequestHandlerClass.profile.requests - serp_before) / args.topics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tool guard vs a researcher re-issuing reworded searches")
+    parser.add_argument("--topics", type=int, default=4)
+    parser.add_argument("--parallel", type=int, default=None,
+                        help="concurrent crews (default: one per topic)")
+    parser.add_argument("--search-loops", type=int, default=12,
+                        help="reworded searches the fake researcher tries before answering")
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--serp-latency", type=float, default=0.3)
+    parser.add_argument("--timeout", type=float, default=900)
+    parser.add_argument("--json", dest="json_path", default=None, help="write results to this file")
+    args = parser.parse_args()
+    args.parallel = args.parallel or args.topics
+
+    llm = start_fake_llm(ServiceProfile(latency=args.llm_latency), search_loops=args.search_loops)
+    serp = start_fake_serp(ServiceProfile(latency=args.serp_latency))
+    llm_url = f"http://127.0.0.1:{llm.server_address[1]}/v1"
+    serp_url = f"http://127.0.0.1:{serp.server_address[1]}/search"
+
+    print(f"🧪 Tool guard benchmark ({args.topics} topics, researcher loops {args.search_loops} searches)")
+    print("=" * 70)
+    print("guard  done   seconds  LLM calls/topic  SerpAPI calls/topic")
+    results = []
+    for guard in (False, True):
+        result = run_batch(args, llm, serp, llm_url, serp_url, guard)
+        results.append(result)
+        print(f"{'on' if guard else 'off':5} {result['completed']:5} {result['seconds']:9.1f} "
+              f"{result['llm_calls_per_topic']:16.1f} {result['serp_calls_per_topic']:20.1f}")
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n💾 Results written to {args.json_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,8 +17,10 @@ logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class TechResearchSlackBot:
-    def __init__(self, bot_token: str, app_token: str, api_base_url: str):
+    def __init__(self, bot_token: str, app_token: str, api_base_url: str, api_token: str = None):
         self.api_base_url = api_base_url.rstrip('/')
+        # Authenticates the bot as the slack channel (TRUSTED_CALLERS on the web app)
+        self.api_headers = {'Authorization': f'Bearer {api_token}'} if api_token else {}
         self.app = AsyncApp(token=bot_token)
         self.app_token = app_token
         self.setup_handlers()
@@ -60,7 +62,11 @@ class TechResearchSlackBot:
         @self.app.command("/reports")
         async def reports_command(ack, respond, command):
             await ack()
-            await self.list_reports(respond)
+            query = command.get('text', '').strip()
+            if query:
+                await self.search_reports(respond, query)
+            else:
+                await self.list_reports(respond)
         
         @self.app.event("app_mention")
         async def handle_app_mention(event, say):
@@ -101,7 +107,8 @@ class TechResearchSlackBot:
             # Start research via API
             response = requests.post(
                 f"{self.api_base_url}/start_research",
-                json={"topic": topic},
+                json={"topic": topic, "user_id": user_id},
+                headers=self.api_headers,
                 timeout=10
             )
             
@@ -172,7 +179,8 @@ class TechResearchSlackBot:
         try:
             response = requests.post(
                 f"{self.api_base_url}/start_research",
-                json={"topic": topic},
+                json={"topic": topic, "user_id": user_id},
+                headers=self.api_headers,
                 timeout=10
             )
             
@@ -241,7 +249,11 @@ class TechResearchSlackBot:
     async def send_research_results_dm(self, task_id: str, topic: str, user_id: str):
         """Send research results via DM"""
         try:
-            response = requests.get(f"{self.api_base_url}/api/report/{task_id}")
+            # Only fetch what fits in a Slack message
+            response = requests.get(
+                f"{self.api_base_url}/api/report/{task_id}",
+                params={"max_chars": 3000}
+            )
             
             if response.status_code == 200:
                 data = response.json()
@@ -275,8 +287,8 @@ class TechResearchSlackBot:
                 )
                 
                 # Send report content (truncated if too long)
-                if len(content) > 3000:
-                    content = content[:3000] + "\n\n... (truncated, download full report)"
+                if data.get('truncated'):
+                    content += "\n\n... (truncated, download full report)"
                 
                 await self.app.client.chat_postMessage(
                     channel=user_id,
@@ -355,6 +367,59 @@ class TechResearchSlackBot:
                 "text": f"❌ System Status: Error\n\n{str(e)}"
             })
     
+    async def search_reports(self, respond, query: str):
+        """Search past reports (`/reports <query>`)"""
+        try:
+            response = requests.get(
+                f"{self.api_base_url}/api/reports/search",
+                params={"q": query, "limit": 5},
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                data = response.json()
+                
+                if not data['results']:
+                    await respond({
+                        "text": f"🔎 No reports match *{query}*\n\nStart a new one with `/research {query}`"
+                    })
+                    return
+                
+                report_blocks = [
+                    {
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"🔎 *{data['total']} report(s) match* _{query}_"
+                        }
+                    }
+                ]
+                
+                for result in data['results']:
+                    report_blocks.append({
+                        "type": "section",
+                        "text": {
+                            "type": "mrkdwn",
+                            "text": f"📄 *{result['topic']}*\n{result['snippet'].replace('**', '*')}\n"
+                                    f"<{self.api_base_url}/download_report/{result['task_id']}|Download> | ID: `{result['task_id']}`"
+                        }
+                    })
+                
+                await respond({
+                    "text": f"Reports matching {query}",
+                    "blocks": report_blocks
+                })
+            
+            else:
+                await respond({
+                    "text": "❌ Error searching reports\n\nPlease try again later."
+                })
+        
+        except Exception as e:
+            await respond({
+                "text": f"❌ Error: {str(e)}\n\nCannot connect to research system."
+            })
+    
     async def list_reports(self, respond):
         """List recent reports"""
         try:
@@ -431,7 +496,7 @@ def main():
         print("Please add your Slack tokens to .env file")
         return
     
-    bot = TechResearchSlackBot(bot_token, app_token, api_url)
+    bot = TechResearchSlackBot(bot_token, app_token, api_url, os.getenv('SLACK_RESEARCH_API_TOKEN'))
     
     async def run_bot():
         await bot.start()
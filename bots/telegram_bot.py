@@ -8,7 +8,9 @@ import asyncio
 import logging
 from datetime import datetime
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.error import BadRequest
 from telegram.ext import Application, CommandHandler, CallbackQueryHandler, MessageHandler, filters, ContextTypes
+from telegram.helpers import escape_markdown
 import requests
 import json
 
@@ -19,10 +21,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+def markdown_snippet(snippet: str) -> str:
+    """Escape a search snippet for Telegram Markdown, keeping its **highlighted** terms bold"""
+    parts = snippet.split('**')
+    return ''.join(
+        f"*{escape_markdown(part)}*" if i % 2 and part else escape_markdown(part)
+        for i, part in enumerate(parts)
+    )
+
 class TechResearchBot:
-    def __init__(self, token: str, api_base_url: str):
+    def __init__(self, token: str, api_base_url: str, api_token: str = None):
         self.token = token
         self.api_base_url = api_base_url.rstrip('/')
+        # Authenticates the bot as the telegram channel (TRUSTED_CALLERS on the web app)
+        self.api_headers = {'Authorization': f'Bearer {api_token}'} if api_token else {}
         self.application = Application.builder().token(token).build()
         self.setup_handlers()
     
@@ -33,6 +45,7 @@ class TechResearchBot:
         self.application.add_handler(CommandHandler("research", self.research))
         self.application.add_handler(CommandHandler("status", self.status))
         self.application.add_handler(CommandHandler("reports", self.list_reports))
+        self.application.add_handler(CommandHandler("search", self.search_reports))
         self.application.add_handler(CallbackQueryHandler(self.button_callback))
         self.application.add_handler(MessageHandler(filters.TEXT & ~filters.COMMAND, self.handle_message))
     
@@ -47,6 +60,7 @@ I'm your personal AI research assistant for software development and tech trends
 🔍 `/research <topic>` - Start AI research
 📊 `/status` - Check system status  
 📋 `/reports` - View recent reports
+🔎 `/search <words>` - Find past reports
 ❓ `/help` - Show all commands
 
 **Example:**
@@ -88,7 +102,11 @@ Ready to keep you ahead of the tech curve! 🚀
         try:
             response = requests.post(
                 f"{self.api_base_url}/start_research",
-                json={"topic": topic},
+                json={
+                    "topic": topic,
+                    "user_id": str(update.effective_user.id) if update.effective_user else None,
+                },
+                headers=self.api_headers,
                 timeout=10
             )
             
@@ -121,6 +139,49 @@ Ready to keep you ahead of the tech curve! 🚀
                 parse_mode='Markdown'
             )
     
+    async def search_reports(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Search past reports"""
+        if not context.args:
+            await update.message.reply_text(
+                "🔎 **What should I look for?**\n\n"
+                "Example: `/search vector databases`",
+                parse_mode='Markdown'
+            )
+            return
+        
+        query = ' '.join(context.args)
+        try:
+            response = requests.get(
+                f"{self.api_base_url}/api/reports/search",
+                params={"q": query, "limit": 5},
+                timeout=10
+            )
+            response.raise_for_status()
+            data = response.json()
+        except Exception as e:
+            await update.message.reply_text(f"❌ Error searching reports: {str(e)}")
+            return
+        
+        if not data['results']:
+            await update.message.reply_text(f"🔎 No reports match {query}\n\nStart one with /research {query}")
+            return
+        
+        # Topics and snippets come from reports, so Markdown characters in them are escaped
+        lines = [f"🔎 *{data['total']} report(s) match:* {escape_markdown(query)}\n"]
+        plain = [f"🔎 {data['total']} report(s) match: {query}\n"]
+        for result in data['results']:
+            download_url = f"{self.api_base_url}/download_report/{result['task_id']}"
+            lines.append(
+                f"📄 *{escape_markdown(result['topic'])}*\n{markdown_snippet(result['snippet'])}\n"
+                f"[Download]({download_url})\n"
+            )
+            plain.append(f"📄 {result['topic']}\n{result['snippet'].replace('**', '')}\n{download_url}\n")
+        try:
+            await update.message.reply_text('\n'.join(lines), parse_mode='Markdown', disable_web_page_preview=True)
+        except BadRequest as e:
+            logger.warning(f"Search results rejected as Markdown, sending plain text: {e}")
+            await update.message.reply_text('\n'.join(plain), disable_web_page_preview=True)
+    
     def run(self):
         """Start the bot"""
         logger.info("Starting Telegram bot...")
@@ -136,7 +197,7 @@ def main():
         print("Please add your Telegram bot token to .env file")
         return
     
-    bot = TechResearchBot(bot_token, api_url)
+    bot = TechResearchBot(bot_token, api_url, os.getenv('TELEGRAM_RESEARCH_API_TOKEN'))
     bot.run()
 
 if __name__ == '__main__':
@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+"""
+Batch Research
+Runs the research crew for many topics in parallel, spreading the runs over
+the configured LLM keys, and streams results to an output directory:
+
+    <output-dir>/results.jsonl   one JSON record per finished topic
+    <output-dir>/<slug>.md       the report of each completed topic
+    <output-dir>/<slug>.findings.json   its structured research findings
+    <output-dir>/checkpoints.db  crew task checkpoints of unfinished topics
+
+Topics already completed in the output directory are skipped and topics cut
+short resume after their last finished crew task, so an interrupted batch
+can simply be started again.
+
+Usage:
+    batch_research topics.txt --output-dir reports/nightly --parallel 4
+    batch_research topics.txt --batch-api    # LLM calls via provider batch APIs
+    cat topics.txt | batch_research - --crew basic
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import re
+import sys
+import threading
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from firstcrew.crew_factory import load_crew_class
+from firstcrew.llm_batch import LLM_BATCH_API, LLM_BATCH_CONCURRENCY
+from firstcrew.llm_manager import get_available_llm_count, get_llm_config_names, prefer_llm_config
+from firstcrew.research_run import execute_research
+from firstcrew.task_store import TaskStore
+from firstcrew.token_budget import create_budget
+
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+
+RESULTS_FILE = "results.jsonl"
+CHECKPOINTS_FILE = "checkpoints.db"
+
+
+def read_topics(lines: Iterable[str]) -> List[str]:
+    """One topic per line; blank lines, # comments and duplicates are ignored"""
+    topics, seen = [], set()
+    for line in lines:
+        topic = line.strip()
+        if topic and not topic.startswith("#") and topic not in seen:
+            seen.add(topic)
+            topics.append(topic)
+    return topics
+
+
+def topic_slug(topic: str) -> str:
+    """Readable, collision-free file name for a topic"""
+    slug = re.sub(r"[^a-z0-9]+", "-", topic.lower()).strip("-")[:60] or "topic"
+    digest = hashlib.sha1(topic.encode("utf-8")).hexdigest()[:8]
+    return f"{slug}-{digest}"
+
+
+def completed_topics(output_dir: str) -> Set[str]:
+    """Topics with a completed record and report in the output directory"""
+    done = set()
+    path = os.path.join(output_dir, RESULTS_FILE)
+    if not os.path.exists(path):
+        return done
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # partially written line from a killed run
+            report = os.path.join(output_dir, record.get("report_file") or "")
+            if record.get("status") == "completed" and os.path.isfile(report):
+                done.add(record["topic"])
+    return done
+
+
+def default_parallelism(crew_name: str) -> int:
+    """One run per available LLM key for the enhanced crew, otherwise one"""
+    if crew_name != "enhanced":
+        return 1
+    return max(1, get_available_llm_count())
+
+
+class ResultWriter:
+    """Appends one JSON line per finished topic, safe across threads"""
+
+    def __init__(self, output_dir: str):
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, RESULTS_FILE)
+        self.lock = threading.Lock()
+
+    def _write(self, filename: str, content: str) -> str:
+        tmp_path = os.path.join(self.output_dir, f"{filename}.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(tmp_path, os.path.join(self.output_dir, filename))
+        return filename
+
+    def write_report(self, slug: str, content: str) -> str:
+        return self._write(f"{slug}.md", content)
+
+    def write_findings(self, slug: str, findings: List[Dict[str, Any]]) -> str:
+        return self._write(f"{slug}.findings.json", json.dumps(findings, ensure_ascii=False, indent=2))
+
+    def append(self, record: Dict[str, Any]):
+        line = json.dumps(record, ensure_ascii=False)
+        with self.lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+                f.flush()
+
+
+def assign_llm_configs(crew_name: str, n_topics: int) -> List[Optional[str]]:
+    """Round-robin LLM keys over topics for the enhanced crew (None: no preference)"""
+    if crew_name != "enhanced":
+        return [None] * n_topics
+    names = get_llm_config_names()
+    return [names[i % len(names)] if names else None for i in range(n_topics)]
+
+
+def research_topic(crew_class, topic: str, writer: ResultWriter, checkpoints: TaskStore,
+                   batch_api: bool = False, llm_config: Optional[str] = None) -> Dict[str, Any]:
+    """Run the crew for one topic (pinned to llm_config) and record the outcome"""
+    slug = topic_slug(topic)
+    # Stable per topic, so a rerun finds the checkpoints of an interrupted run
+    task_id = f"batch_{slug}"
+    record: Dict[str, Any] = {
+        "topic": topic,
+        "slug": slug,
+        "task_id": task_id,
+        "started_at": datetime.now().isoformat(),
+    }
+    started = time.perf_counter()
+    budget = create_budget()
+    try:
+        prefer_llm_config(llm_config)
+        content, findings = execute_research(task_id, topic, crew_class, checkpoints, budget,
+                                             progress=lambda message: None, batch_api=batch_api)
+        record["report_file"] = writer.write_report(slug, content)
+        if findings is not None:
+            record["findings_file"] = writer.write_findings(slug, findings)
+        record["status"] = "completed"
+        checkpoints.delete_outputs(task_id)
+    except Exception as e:
+        record["status"] = "failed"
+        record["error"] = str(e)
+
+    record["duration_seconds"] = round(time.perf_counter() - started, 2)
+    record["finished_at"] = datetime.now().isoformat()
+    record["token_usage"] = budget.summary()
+    writer.append(record)
+    return record
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Research many topics in parallel")
+    parser.add_argument("topics", nargs="?", default="-",
+                        help="file with one topic per line ('-' or omitted reads stdin)")
+    parser.add_argument("--output-dir", "-o", default="batch_reports")
+    parser.add_argument("--parallel", "-p", type=int, default=None,
+                        help="concurrent crew runs (default: one per available LLM key)")
+    parser.add_argument("--crew", choices=["enhanced", "basic"], default="enhanced")
+    parser.add_argument("--force", action="store_true", help="re-run topics that already completed")
+    parser.add_argument("--batch-api", action="store_true", default=LLM_BATCH_API,
+                        help="send LLM calls through provider batch APIs (cheaper, results within 24h)")
+    args = parser.parse_args(argv)
+
+    if args.topics == "-":
+        topics = read_topics(sys.stdin)
+    else:
+        with open(args.topics, "r", encoding="utf-8") as f:
+            topics = read_topics(f)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    skipped = set() if args.force else completed_topics(args.output_dir) & set(topics)
+    pending = [topic for topic in topics if topic not in skipped]
+
+    print(f"📚 {len(topics)} topics: {len(pending)} to research, {len(skipped)} already completed")
+    if not pending:
+        return 0
+
+    crew_class = load_crew_class(args.crew)
+    if args.batch_api:
+        # Crews mostly wait for batches, so many can share the same keys
+        parallel = args.parallel or min(len(pending), LLM_BATCH_CONCURRENCY)
+    else:
+        parallel = args.parallel or default_parallelism(args.crew)
+    writer = ResultWriter(args.output_dir)
+    checkpoints = TaskStore(os.path.join(args.output_dir, CHECKPOINTS_FILE))
+    llm_configs = assign_llm_configs(args.crew, len(pending))
+    mode = " through provider batch APIs" if args.batch_api else ""
+    print(f"🚀 Running {parallel} crew(s) in parallel{mode}, writing to {args.output_dir}")
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=parallel, thread_name_prefix="batch-research") as executor:
+        futures = [
+            executor.submit(research_topic, crew_class, topic, writer, checkpoints, args.batch_api, llm_config)
+            for topic, llm_config in zip(pending, llm_configs)
+        ]
+        for done, future in enumerate(as_completed(futures), 1):
+            record = future.result()
+            if record["status"] == "completed":
+                print(f"✅ [{done}/{len(pending)}] {record['topic']} ({record['duration_seconds']}s)")
+            else:
+                failed += 1
+                print(f"❌ [{done}/{len(pending)}] {record['topic']}: {record['error']}")
+
+    print(f"🏁 Batch finished: {len(pending) - failed} completed, {failed} failed")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,6 +3,7 @@ from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
 from typing import List
 from .tools import SearchTool, NewsSearchTool
+from .findings import ResearchFindings, findings_guardrail
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
 # https://docs.crewai.com/concepts/crews#example-crew-class-with-decorators
@@ -42,6 +43,8 @@ class Firstcrew():
     def research_task(self) -> Task:
         return Task(
             config=self.tasks_config['research_task'], # type: ignore[index]
+            output_pydantic=ResearchFindings,
+            guardrail=findings_guardrail,
         )
 
     @task
@@ -0,0 +1,80 @@
+"""
+Crew Factory with Template Caching
+Builds each crew class once and hands out cheap per-run copies
+"""
+
+import threading
+from typing import Any, Dict, Optional
+
+
+class CrewFactory:
+    """
+    Builds a crew template once and clones it for every run.
+
+    Constructing a ``@CrewBase`` class re-parses ``agents.yaml`` and
+    ``tasks.yaml`` and instantiates every tool. The factory does that work a
+    single time and then uses ``Crew.copy()`` so each run gets its own agents
+    and tasks (and therefore its own outputs) while sharing the parsed config
+    and tool instances.
+    """
+
+    def __init__(self, crew_class):
+        self.crew_class = crew_class
+        self.lock = threading.Lock()
+        self._instance: Optional[Any] = None
+        self._template: Optional[Any] = None
+
+    def _build_template(self):
+        """Instantiate the crew class and build the template crew (once)"""
+        with self.lock:
+            if self._template is None:
+                self._instance = self.crew_class()
+                self._template = self._instance.crew()
+            return self._template
+
+    def create(self):
+        """Return a fresh crew cloned from the cached template"""
+        template = self._template or self._build_template()
+        crew = template.copy()
+
+        # Let the crew class refresh per-run state (e.g. pick new LLMs)
+        prepare_crew = getattr(self._instance, "prepare_crew", None)
+        if prepare_crew:
+            prepare_crew(crew)
+
+        return crew
+
+    @property
+    def tasks_config(self) -> Dict[str, Any]:
+        """Parsed tasks.yaml of the crew class"""
+        if self._template is None:
+            self._build_template()
+        return self._instance.tasks_config
+
+    def reset(self):
+        """Drop the cached template so the next create() rebuilds it"""
+        with self.lock:
+            self._instance = None
+            self._template = None
+
+
+# Global factories, one per crew class
+_factories: Dict[type, CrewFactory] = {}
+_factories_lock = threading.Lock()
+
+def get_crew_factory(crew_class) -> CrewFactory:
+    """Get the shared factory for a crew class"""
+    with _factories_lock:
+        factory = _factories.get(crew_class)
+        if factory is None:
+            factory = CrewFactory(crew_class)
+            _factories[crew_class] = factory
+        return factory
+
+def load_crew_class(name: str = "enhanced"):
+    """Import a crew class by name: "enhanced" (multi-LLM) or "basic" """
+    if name == "basic":
+        from .crew import Firstcrew
+        return Firstcrew
+    from .enhanced_crew import EnhancedFirstcrew
+    return EnhancedFirstcrew
@@ -2,12 +2,14 @@
 Enhanced CrewAI with Multi-LLM Support and Rate Limit Bypass
 """
 
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from typing import Dict, List, Optional
 from .tools import SearchTool, NewsSearchTool
+from .findings import ResearchFindings, findings_guardrail
 from .llm_manager import get_dynamic_llm_config, initialize_llm_manager
+from .managed_llm import ManagedLLM
 import os
 
 @CrewBase
@@ -22,32 +24,56 @@ class EnhancedFirstcrew():
         # Initialize the LLM manager
         initialize_llm_manager()
 
-    def _get_llm(self):
-        """Get a dynamically selected LLM"""
+    def _agent_tier(self, name: str) -> Optional[str]:
+        """Model tier set with `llm_tier` in agents.yaml"""
+        return self.agents_config[name].get('llm_tier')
+
+    def _task_tiers(self) -> Dict[str, str]:
+        """Model tiers set with `llm_tier` in tasks.yaml, by task name"""
+        return {
+            name: config['llm_tier']
+            for name, config in self.tasks_config.items()
+            if config.get('llm_tier')
+        }
+
+    def _get_llm(self, tier: Optional[str] = None):
+        """Get a dynamically selected LLM for a model tier"""
         try:
-            config = get_dynamic_llm_config()
-            return LLM(
+            config = get_dynamic_llm_config(tier=tier)
+            return ManagedLLM(
+                config_name=config["name"],
+                tier=tier,
+                task_tiers=self._task_tiers(),
                 model=config["model"],
                 api_key=config["api_key"],
+                base_url=config.get("base_url"),
                 max_tokens=config["max_tokens"],
-                temperature=config["temperature"]
+                temperature=config["temperature"],
+                cache_breakpoints=config.get("cache_breakpoints", False)
             )
         except Exception as e:
             print(f"⚠️  Error getting LLM config: {e}")
             # Fallback to default
-            return LLM(
+            return ManagedLLM(
+                config_name="fallback",
+                tier=tier,
                 model=os.getenv("MODEL", "groq/llama-3.1-8b-instant"),
                 api_key=os.getenv("GROQ_API_KEY"),
                 max_tokens=4000,
                 temperature=0.1
             )
 
+    def prepare_crew(self, crew: Crew):
+        """Give each agent of a cloned crew a freshly selected LLM on its tier"""
+        for crew_agent in crew.agents:
+            crew_agent.llm = self._get_llm(getattr(crew_agent.llm, "tier", None))
+
     @agent
     def researcher(self) -> Agent:
         return Agent(
             config=self.agents_config['researcher'],
             tools=[SearchTool(), NewsSearchTool()],
-            llm=self._get_llm(),
+            llm=self._get_llm(self._agent_tier('researcher')),
             verbose=True,
             max_retry_limit=3,  # Retry with different LLMs
         )
@@ -56,7 +82,7 @@ class EnhancedFirstcrew():
     def reporting_analyst(self) -> Agent:
         return Agent(
             config=self.agents_config['reporting_analyst'],
-            llm=self._get_llm(),
+            llm=self._get_llm(self._agent_tier('reporting_analyst')),
             verbose=True,
             max_retry_limit=3,
         )
@@ -65,6 +91,8 @@ class EnhancedFirstcrew():
     def research_task(self) -> Task:
         return Task(
             config=self.tasks_config['research_task'],
+            output_pydantic=ResearchFindings,
+            guardrail=findings_guardrail,
         )
 
     @task
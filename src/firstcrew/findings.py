@@ -0,0 +1,75 @@
+"""
+Structured Research Findings
+research_task answers with typed findings instead of markdown bullets. They
+reach reporting_task as compact JSON context, are stored next to the report
+and can be served by the API without another LLM pass
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError
+
+# Longest claim handed on to the reporting task and stored with the report
+FINDING_MAX_CHARS = int(os.getenv("FINDING_MAX_CHARS", 400))
+
+
+class Finding(BaseModel):
+    """One development the researcher found"""
+    claim: str = Field(description="The development in one or two sentences, with concrete names and figures")
+    source_url: Optional[str] = Field(default=None, description="URL of the search result it comes from")
+    date: Optional[str] = Field(default=None, description="Publication date as YYYY-MM-DD, if known")
+    confidence: float = Field(default=0.5, ge=0.0, le=1.0,
+                              description="How well the sources support the claim, from 0 to 1")
+
+
+class ResearchFindings(BaseModel):
+    """Answer of research_task"""
+    findings: List[Finding] = Field(description="The most relevant findings, most important first")
+
+
+def compact_findings(findings: ResearchFindings) -> List[Dict[str, Any]]:
+    """Findings as plain dicts: duplicates dropped, long claims cut, empty fields left out"""
+    compact, seen = [], set()
+    for finding in findings.findings:
+        claim = " ".join(finding.claim.split())
+        key = claim.casefold()
+        if not claim or key in seen:
+            continue
+        seen.add(key)
+        if len(claim) > FINDING_MAX_CHARS:
+            claim = claim[:FINDING_MAX_CHARS].rsplit(" ", 1)[0] + "…"
+        compact.append({**finding.model_dump(exclude_none=True), "claim": claim})
+    return compact
+
+
+def findings_guardrail(output) -> Tuple[bool, Any]:
+    """
+    research_task guardrail: rewrite parsed findings as compact JSON, which
+    is the context the reporting task gets. Answers that aren't findings
+    (e.g. NO CHANGES in refresh mode) pass through unchanged.
+    """
+    if not isinstance(output.pydantic, ResearchFindings):
+        return True, output
+    findings = compact_findings(output.pydantic)
+    return True, json.dumps({"findings": findings}, ensure_ascii=False, separators=(",", ":"))
+
+
+def parse_findings(output) -> Optional[List[Dict[str, Any]]]:
+    """Findings of a task output (live or restored from a checkpoint), or None"""
+    if isinstance(getattr(output, "pydantic", None), ResearchFindings):
+        return compact_findings(output.pydantic)
+    try:
+        return compact_findings(ResearchFindings.model_validate_json(getattr(output, "raw", "") or ""))
+    except ValidationError:
+        return None
+
+
+def research_findings(outputs: Iterable[Any]) -> Optional[List[Dict[str, Any]]]:
+    """Findings of the first task output among a run's outputs that has them"""
+    for output in outputs:
+        findings = parse_findings(output)
+        if findings is not None:
+            return findings
+    return None
@@ -0,0 +1,58 @@
+"""
+Hedged LLM Requests
+Opt-in tail-latency reduction: when an LLM call is slower than the usual p95,
+a duplicate request goes to another API key/provider and the first response wins
+"""
+
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+
+HEDGING_ENABLED = os.getenv("LLM_HEDGING", "0") == "1"
+
+# Seconds to wait before hedging, or "auto" to use the observed p95 per model
+HEDGE_AFTER = os.getenv("LLM_HEDGE_AFTER", "auto")
+HEDGE_DEFAULT_AFTER = float(os.getenv("LLM_HEDGE_DEFAULT_AFTER", 10))
+HEDGE_MIN_SAMPLES = 20
+
+# No duplicates once a run has used this fraction of its token budget
+HEDGE_BUDGET_FRACTION = float(os.getenv("LLM_HEDGE_BUDGET_FRACTION", 0.8))
+
+
+class LatencyWindow:
+    """Rolling window of recent call latencies per model"""
+
+    def __init__(self, size: int = 200):
+        self.samples: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=size))
+        self.lock = threading.Lock()
+
+    def record(self, model: str, seconds: float):
+        with self.lock:
+            self.samples[model].append(seconds)
+
+    def percentile(self, model: str, fraction: float) -> Optional[float]:
+        """Latency percentile for a model, or None until enough calls were seen"""
+        with self.lock:
+            ordered = sorted(self.samples[model])
+        if len(ordered) < HEDGE_MIN_SAMPLES:
+            return None
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+latency_window = LatencyWindow()
+
+
+def hedge_delay(model: str) -> float:
+    """How long a call to `model` may run before a hedge request is sent"""
+    if HEDGE_AFTER != "auto":
+        return float(HEDGE_AFTER)
+    p95 = latency_window.percentile(model, 0.95)
+    return p95 if p95 is not None else HEDGE_DEFAULT_AFTER
+
+
+def hedge_allowed(budget) -> bool:
+    """Whether a run with this token budget (or None) can afford a duplicate request"""
+    if budget is None or not budget.limited:
+        return True
+    return not budget.downgraded and budget.used < budget.max_tokens * HEDGE_BUDGET_FRACTION
@@ -0,0 +1,356 @@
+"""
+Shared Research Job Queue
+Lets research crews run in separate worker processes, on this host or
+others: the web app submits jobs, workers claim them under a lease, report
+progress and checkpoints, and hand the result back through the queue
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .worker_pool import DEFAULT_PRIORITY, PRIORITY_WEIGHTS
+
+# Broker URL, e.g. sqlite:///shared/jobs.db (empty = crews run inside the web app)
+JOB_QUEUE_URL = os.getenv("JOB_QUEUE_URL", "")
+
+# Seconds a claimed job stays with its worker without a heartbeat
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", 120))
+
+# Claims of a job (first run plus retries after lost leases) before it fails
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", 3))
+
+# Job statuses, as seen by the web app
+QUEUED, RUNNING, COMPLETED, FAILED = "queued", "running", "completed", "failed"
+
+
+class JobBroker(ABC):
+    """
+    Interface of a job queue shared by the web app and research workers.
+
+    Jobs are JSON payloads keyed by the research task id. A worker claims a
+    job for `lease_seconds` and keeps it by calling heartbeat(); a job whose
+    lease ran out (the worker died) is handed to the next claim. Workers
+    report progress with update() and the outcome with finish(); the web app
+    reads both back with changes() and removes finished jobs once collected.
+
+    Brokers also implement the checkpoint methods of the task store
+    (save_output / load_outputs / delete_outputs), so a run picked up by
+    another worker resumes after the last finished crew task.
+    """
+
+    @abstractmethod
+    def submit(self, job_id: str, payload: Dict[str, Any], principal: str = "anonymous",
+               priority: str = DEFAULT_PRIORITY) -> bool:
+        """Queue a job; returns False if a job with this id already exists"""
+
+    @abstractmethod
+    def claim(self, worker_id: str, lease_seconds: float = JOB_LEASE_SECONDS
+              ) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Take the next job, returning (job_id, payload), or None if there is none"""
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, slots: int, job_ids: List[str],
+                  lease_seconds: float = JOB_LEASE_SECONDS):
+        """Register a live worker and extend the leases of its running jobs"""
+
+    @abstractmethod
+    def update(self, job_id: str, worker_id: str, **fields: Any) -> bool:
+        """Merge progress fields into a running job; False if the lease was lost"""
+
+    @abstractmethod
+    def finish(self, job_id: str, worker_id: str, status: str,
+               result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> bool:
+        """Record the outcome of a job; False if the lease was lost"""
+
+    @abstractmethod
+    def changes(self, since: float) -> List[Dict[str, Any]]:
+        """Jobs changed after `since` (an updated_at value), oldest change first"""
+
+    @abstractmethod
+    def remove(self, job_id: str):
+        """Drop a job and its checkpoints once the web app has collected it"""
+
+    @abstractmethod
+    def queued_for(self, principal: str) -> int:
+        """Queued (not yet claimed) jobs of a principal"""
+
+    @abstractmethod
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and worker capacity, shaped like WorkerPool.stats()"""
+
+    @abstractmethod
+    def save_output(self, task_id: str, task_name: str, position: int, output: Dict[str, Any]):
+        """Checkpoint the output of a finished crew task"""
+
+    @abstractmethod
+    def load_outputs(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        """Checkpointed crew task outputs of a job by task name, in crew order"""
+
+    @abstractmethod
+    def delete_outputs(self, task_id: str):
+        """Drop the checkpoints of a job"""
+
+
+class SQLiteBroker(JobBroker):
+    """
+    Job queue in a SQLite file, for workers on one host (or on hosts sharing
+    a filesystem with working locks).
+
+    Claims run in an IMMEDIATE transaction, so concurrent workers never take
+    the same job. Among queued jobs the higher priority class goes first,
+    then the principal with the fewest running jobs, then the oldest job.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False, timeout=30, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                principal TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                payload TEXT NOT NULL,
+                fields TEXT NOT NULL DEFAULT '{}',
+                result TEXT,
+                error TEXT,
+                worker_id TEXT,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS jobs_by_status ON jobs (status, priority, created_at);
+            CREATE INDEX IF NOT EXISTS jobs_by_update ON jobs (updated_at);
+            CREATE TABLE IF NOT EXISTS job_outputs (
+                job_id TEXT NOT NULL,
+                task_name TEXT NOT NULL,
+                position INTEGER NOT NULL,
+                output TEXT NOT NULL,
+                PRIMARY KEY (job_id, task_name)
+            );
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                slots INTEGER NOT NULL,
+                seen_at REAL NOT NULL
+            );
+            """
+        )
+
+    def _write(self, fn: Callable[[sqlite3.Connection], Any]) -> Any:
+        """Run fn in an IMMEDIATE transaction (one writer across processes)"""
+        with self.lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                value = fn(self.conn)
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+            return value
+
+    def _read(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def submit(self, job_id, payload, principal="anonymous", priority=DEFAULT_PRIORITY):
+        if priority not in PRIORITY_WEIGHTS:
+            raise ValueError(f"Unknown priority class: {priority}")
+        cursor = self._write(lambda conn: conn.execute(
+            "INSERT OR IGNORE INTO jobs (job_id, status, principal, priority, payload, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, QUEUED, principal, -PRIORITY_WEIGHTS[priority], json.dumps(payload, default=str),
+             time.time(), time.time()),
+        ))
+        return cursor.rowcount == 1
+
+    def claim(self, worker_id, lease_seconds=JOB_LEASE_SECONDS):
+        def take(conn):
+            now = time.time()
+            # Jobs whose worker stopped sending heartbeats go back to the queue
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_until < ? AND attempts < ?",
+                (QUEUED, now, RUNNING, now, JOB_MAX_ATTEMPTS),
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, worker_id = NULL, updated_at = ? "
+                "WHERE status = ? AND lease_until < ?",
+                (FAILED, "Research worker stopped responding", now, RUNNING, now),
+            )
+            row = conn.execute(
+                "SELECT job_id, payload FROM jobs AS j WHERE status = ? ORDER BY priority, "
+                "(SELECT COUNT(*) FROM jobs AS r WHERE r.status = ? AND r.principal = j.principal), "
+                "created_at LIMIT 1",
+                (QUEUED, RUNNING),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, worker_id = ?, lease_until = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE job_id = ?",
+                (RUNNING, worker_id, now + lease_seconds, now, row[0]),
+            )
+            return row[0], json.loads(row[1])
+
+        return self._write(take)
+
+    def heartbeat(self, worker_id, slots, job_ids, lease_seconds=JOB_LEASE_SECONDS):
+        def beat(conn):
+            now = time.time()
+            conn.execute(
+                "INSERT OR REPLACE INTO workers (worker_id, slots, seen_at) VALUES (?, ?, ?)",
+                (worker_id, slots, now),
+            )
+            conn.executemany(
+                "UPDATE jobs SET lease_until = ? WHERE job_id = ? AND worker_id = ? AND status = ?",
+                [(now + lease_seconds, job_id, worker_id, RUNNING) for job_id in job_ids],
+            )
+            conn.execute("DELETE FROM workers WHERE seen_at < ?", (now - 10 * lease_seconds,))
+
+        self._write(beat)
+
+    def update(self, job_id, worker_id, **fields):
+        def merge(conn):
+            row = conn.execute(
+                "SELECT fields FROM jobs WHERE job_id = ? AND worker_id = ? AND status = ?",
+                (job_id, worker_id, RUNNING),
+            ).fetchone()
+            if row is None:
+                return False
+            merged = {**json.loads(row[0]), **fields}
+            conn.execute(
+                "UPDATE jobs SET fields = ?, updated_at = ? WHERE job_id = ?",
+                (json.dumps(merged, default=str), time.time(), job_id),
+            )
+            return True
+
+        return self._write(merge)
+
+    def finish(self, job_id, worker_id, status, result=None, error=None):
+        cursor = self._write(lambda conn: conn.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, lease_until = NULL, updated_at = ? "
+            "WHERE job_id = ? AND worker_id = ? AND status = ?",
+            (status, json.dumps(result, default=str) if result is not None else None, error,
+             time.time(), job_id, worker_id, RUNNING),
+        ))
+        return cursor.rowcount == 1
+
+    def changes(self, since):
+        rows = self._read(
+            "SELECT job_id, status, fields, result, error, worker_id, attempts, updated_at "
+            "FROM jobs WHERE updated_at > ? ORDER BY updated_at",
+            (since,),
+        )
+        return [{
+            "job_id": job_id,
+            "status": status,
+            "fields": json.loads(fields),
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "worker_id": worker_id,
+            "attempts": attempts,
+            "updated_at": updated_at,
+        } for job_id, status, fields, result, error, worker_id, attempts, updated_at in rows]
+
+    def remove(self, job_id):
+        def delete(conn):
+            conn.execute("DELETE FROM jobs WHERE job_id = ?", (job_id,))
+            conn.execute("DELETE FROM job_outputs WHERE job_id = ?", (job_id,))
+
+        self._write(delete)
+
+    def queued_for(self, principal):
+        return self._read(
+            "SELECT COUNT(*) FROM jobs WHERE status = ? AND principal = ?", (QUEUED, principal)
+        )[0][0]
+
+    def stats(self):
+        now = time.time()
+        counts = self._read(
+            "SELECT status, priority, COUNT(*) FROM jobs WHERE status IN (?, ?) GROUP BY status, priority",
+            (QUEUED, RUNNING),
+        )
+        slots = self._read(
+            "SELECT COUNT(*), COALESCE(SUM(slots), 0) FROM workers WHERE seen_at >= ?",
+            (now - JOB_LEASE_SECONDS,),
+        )[0]
+        names = {-weight: name for name, weight in PRIORITY_WEIGHTS.items()}
+        queued_by_priority = {name: 0 for name in PRIORITY_WEIGHTS}
+        active = 0
+        for status, priority, count in counts:
+            if status == QUEUED:
+                queued_by_priority[names.get(priority, DEFAULT_PRIORITY)] += count
+            else:
+                active += count
+        return {
+            "workers": slots[1],
+            "active": active,
+            "idle": max(0, slots[1] - active),
+            "queued": sum(queued_by_priority.values()),
+            "queued_by_priority": queued_by_priority,
+            "worker_processes": slots[0],
+        }
+
+    def save_output(self, task_id, task_name, position, output):
+        self._write(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO job_outputs (job_id, task_name, position, output) VALUES (?, ?, ?, ?)",
+            (task_id, task_name, position, json.dumps(output, default=str)),
+        ))
+
+    def load_outputs(self, task_id):
+        rows = self._read(
+            "SELECT task_name, output FROM job_outputs WHERE job_id = ? ORDER BY position", (task_id,)
+        )
+        return {task_name: json.loads(output) for task_name, output in rows}
+
+    def delete_outputs(self, task_id):
+        self._write(lambda conn: conn.execute("DELETE FROM job_outputs WHERE job_id = ?", (task_id,)))
+
+
+# Broker implementations by URL scheme; register_broker() adds others (e.g. Redis)
+BROKERS: Dict[str, Callable[[str], JobBroker]] = {
+    "sqlite": SQLiteBroker,
+}
+
+def register_broker(scheme: str, factory: Callable[[str], JobBroker]):
+    """Make `scheme://...` queue URLs open with factory(location)"""
+    BROKERS[scheme] = factory
+
+def open_broker(url: str) -> JobBroker:
+    """Open a broker from a URL such as sqlite:///var/lib/firstcrew/jobs.db"""
+    scheme, separator, location = url.partition("://")
+    if not separator:
+        scheme, location = "sqlite", url  # a bare path is a SQLite file
+    if scheme not in BROKERS:
+        raise ValueError(f"Unknown job queue scheme '{scheme}', expected one of: {', '.join(BROKERS)}")
+    if scheme == "sqlite" and location.startswith("/"):
+        location = location[1:]  # sqlite:///jobs.db is relative, sqlite:////var/jobs.db absolute
+    return BROKERS[scheme](location)
+
+
+# Global broker, opened on first use (None when crews run in-process)
+_broker: Optional[JobBroker] = None
+_broker_lock = threading.Lock()
+
+def get_job_broker() -> Optional[JobBroker]:
+    """Get the shared broker, or None if JOB_QUEUE_URL is not set"""
+    global _broker
+    if not JOB_QUEUE_URL:
+        return None
+    with _broker_lock:
+        if _broker is None:
+            _broker = open_broker(JOB_QUEUE_URL)
+        return _broker
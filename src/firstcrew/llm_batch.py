@@ -0,0 +1,383 @@
+"""
+Provider Batch-API Mode
+Non-interactive runs can send their LLM calls through provider batch
+endpoints (OpenAI /v1/batches, Anthropic /v1/messages/batches) instead of
+the synchronous API: batched calls are billed at a discount and don't draw
+on the per-minute limits interactive users depend on.
+
+A crew's calls are sequential, so the calling thread simply waits for its
+result. The collector gathers the calls of many such waiting crews into one
+batch per provider key and model, submits it once it is full or its oldest
+call has waited LLM_BATCH_MAX_WAIT seconds, polls it and hands each result
+back, at which point the crew continues.
+"""
+
+import contextvars
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import requests
+
+from .metrics import LLM_BATCHES, LLM_BATCH_REQUESTS
+
+# Run bulk (priority "batch") research through provider batch APIs
+LLM_BATCH_API = os.getenv("LLM_BATCH_API", "0") == "1"
+
+# A batch is submitted when it holds this many calls or its oldest call has
+# waited this many seconds
+LLM_BATCH_MAX_REQUESTS = int(os.getenv("LLM_BATCH_MAX_REQUESTS", 500))
+LLM_BATCH_MAX_WAIT = float(os.getenv("LLM_BATCH_MAX_WAIT", 60))
+
+# Seconds between status checks of submitted batches, and how long a call may
+# wait for its result (providers promise results within 24 hours)
+LLM_BATCH_POLL_INTERVAL = float(os.getenv("LLM_BATCH_POLL_INTERVAL", 30))
+LLM_BATCH_TIMEOUT = float(os.getenv("LLM_BATCH_TIMEOUT", 25 * 3600))
+
+# Research runs sharing the batch worker pool (they mostly wait for results)
+LLM_BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", 32))
+
+_batching: contextvars.ContextVar[bool] = contextvars.ContextVar("firstcrew_llm_batch", default=False)
+
+
+class BatchRequestError(Exception):
+    """A call failed inside a provider batch (or the whole batch did)"""
+
+
+def batching_enabled() -> bool:
+    """Whether LLM calls in this context go through batch APIs"""
+    return _batching.get()
+
+
+@contextmanager
+def batch_llm_calls(enabled: bool = True) -> Iterator[bool]:
+    """Send the LLM calls made inside the block through provider batch APIs"""
+    token = _batching.set(enabled)
+    try:
+        yield enabled
+    finally:
+        _batching.reset(token)
+
+
+def batch_target(model: str, base_url: Optional[str] = None) -> Optional[Tuple[str, str, str]]:
+    """
+    (api style, base URL, model name) for a litellm model string, or None if
+    the provider has no batch API (those calls are made directly).
+    """
+    provider, _, name = model.partition("/")
+    if not name:
+        provider, name = ("anthropic" if model.startswith("claude") else "openai"), model
+    if provider == "openai":
+        return "openai", (base_url or "https://api.openai.com/v1").rstrip("/"), name
+    if provider == "groq":
+        return "openai", (base_url or "https://api.groq.com/openai/v1").rstrip("/"), name
+    if provider == "anthropic":
+        return "anthropic", (base_url or "https://api.anthropic.com").rstrip("/"), name
+    return None
+
+
+class OpenAIBatchClient:
+    """OpenAI-style batches: upload a JSONL file, create a batch, download the output file"""
+
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url
+        self.headers = {"Authorization": f"Bearer {api_key}"}
+
+    def build_request(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int],
+                      temperature: Optional[float], stop: Optional[List[str]]) -> Dict[str, Any]:
+        body: Dict[str, Any] = {"model": model, "messages": messages}
+        if max_tokens:
+            body["max_tokens"] = max_tokens
+        if temperature is not None:
+            body["temperature"] = temperature
+        if stop:
+            body["stop"] = stop[:4]
+        return body
+
+    def submit(self, requests_by_id: Dict[str, Dict[str, Any]]) -> str:
+        lines = "".join(
+            json.dumps({"custom_id": custom_id, "method": "POST", "url": "/v1/chat/completions", "body": body}) + "\n"
+            for custom_id, body in requests_by_id.items()
+        )
+        upload = requests.post(
+            f"{self.base_url}/files", headers=self.headers, timeout=120,
+            data={"purpose": "batch"}, files={"file": ("batch.jsonl", lines.encode("utf-8"), "application/jsonl")},
+        )
+        upload.raise_for_status()
+        batch = requests.post(
+            f"{self.base_url}/batches", headers=self.headers, timeout=60,
+            json={"input_file_id": upload.json()["id"], "endpoint": "/v1/chat/completions",
+                  "completion_window": "24h"},
+        )
+        batch.raise_for_status()
+        return batch.json()["id"]
+
+    def _file_lines(self, file_id: Optional[str]) -> List[Dict[str, Any]]:
+        if not file_id:
+            return []
+        response = requests.get(f"{self.base_url}/files/{file_id}/content", headers=self.headers, timeout=300)
+        response.raise_for_status()
+        return [json.loads(line) for line in response.text.splitlines() if line.strip()]
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """None while the batch runs, then the result of each call by custom id"""
+        response = requests.get(f"{self.base_url}/batches/{batch_id}", headers=self.headers, timeout=60)
+        response.raise_for_status()
+        batch = response.json()
+        if batch["status"] not in ("completed", "failed", "expired", "cancelled"):
+            return None
+
+        results: Dict[str, Any] = {}
+        for line in self._file_lines(batch.get("output_file_id")) + self._file_lines(batch.get("error_file_id")):
+            body = (line.get("response") or {}).get("body") or {}
+            if line.get("error") or not body.get("choices"):
+                error = line.get("error") or body.get("error") or {"message": "no completion returned"}
+                results[line["custom_id"]] = BatchRequestError(error.get("message", str(error)))
+                continue
+            results[line["custom_id"]] = {
+                "content": body["choices"][0]["message"].get("content") or "",
+                "prompt_tokens": (body.get("usage") or {}).get("prompt_tokens", 0),
+                "completion_tokens": (body.get("usage") or {}).get("completion_tokens", 0),
+                "cached_tokens": ((body.get("usage") or {}).get("prompt_tokens_details") or {}).get(
+                    "cached_tokens", 0
+                ),
+            }
+        if batch["status"] != "completed":
+            errors = (batch.get("errors") or {}).get("data") or []
+            results.setdefault("*", BatchRequestError(
+                f"Batch {batch_id} {batch['status']}" + (f": {errors[0].get('message')}" if errors else "")
+            ))
+        return results
+
+
+class AnthropicBatchClient:
+    """Anthropic-style batches: one request with every call, results as JSONL from results_url"""
+
+    def __init__(self, base_url: str, api_key: str):
+        self.base_url = base_url
+        self.headers = {"x-api-key": api_key, "anthropic-version": "2023-06-01"}
+
+    def build_request(self, model: str, messages: List[Dict[str, Any]], max_tokens: Optional[int],
+                      temperature: Optional[float], stop: Optional[List[str]]) -> Dict[str, Any]:
+        # System content blocks keep their cache_control breakpoints
+        system = [
+            block for m in messages if m.get("role") == "system"
+            for block in (m["content"] if isinstance(m["content"], list)
+                          else [{"type": "text", "text": str(m["content"])}])
+        ]
+        params: Dict[str, Any] = {
+            "model": model,
+            "max_tokens": max_tokens or 4096,
+            "messages": [
+                {"role": m["role"], "content": m["content"]} for m in messages if m.get("role") != "system"
+            ],
+        }
+        if system:
+            params["system"] = system
+        if temperature is not None:
+            params["temperature"] = temperature
+        if stop:
+            params["stop_sequences"] = stop
+        return params
+
+    def submit(self, requests_by_id: Dict[str, Dict[str, Any]]) -> str:
+        response = requests.post(
+            f"{self.base_url}/v1/messages/batches", headers=self.headers, timeout=120,
+            json={"requests": [
+                {"custom_id": custom_id, "params": params} for custom_id, params in requests_by_id.items()
+            ]},
+        )
+        response.raise_for_status()
+        return response.json()["id"]
+
+    def poll(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """None while the batch runs, then the result of each call by custom id"""
+        response = requests.get(f"{self.base_url}/v1/messages/batches/{batch_id}", headers=self.headers, timeout=60)
+        response.raise_for_status()
+        batch = response.json()
+        if batch["processing_status"] != "ended":
+            return None
+
+        output = requests.get(batch["results_url"], headers=self.headers, timeout=300)
+        output.raise_for_status()
+        results: Dict[str, Any] = {}
+        for line in output.text.splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            result = entry.get("result") or {}
+            if result.get("type") != "succeeded":
+                error = (result.get("error") or {}).get("message") or result.get("type", "failed")
+                results[entry["custom_id"]] = BatchRequestError(error)
+                continue
+            message = result["message"]
+            usage = message.get("usage") or {}
+            # input_tokens leaves out the prompt tokens read from or written to the cache
+            cached = usage.get("cache_read_input_tokens") or 0
+            results[entry["custom_id"]] = {
+                "content": "".join(block.get("text", "") for block in message.get("content", [])),
+                "prompt_tokens": usage.get("input_tokens", 0) + cached + (usage.get("cache_creation_input_tokens") or 0),
+                "completion_tokens": usage.get("output_tokens", 0),
+                "cached_tokens": cached,
+            }
+        return results
+
+
+BATCH_CLIENTS = {"openai": OpenAIBatchClient, "anthropic": AnthropicBatchClient}
+
+
+class _Group:
+    """Calls waiting for the same provider key and model"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls: Dict[str, Dict[str, Any]] = {}
+        self.futures: Dict[str, Future] = {}
+        self.oldest: Optional[float] = None
+
+
+class BatchCollector:
+    """
+    Collects LLM calls into provider batches and resolves each call's future
+    when its batch finishes. One background thread submits due batches and
+    polls the submitted ones.
+    """
+
+    def __init__(self, max_requests: int = LLM_BATCH_MAX_REQUESTS, max_wait: float = LLM_BATCH_MAX_WAIT,
+                 poll_interval: float = LLM_BATCH_POLL_INTERVAL, timeout: float = LLM_BATCH_TIMEOUT):
+        self.max_requests = max_requests
+        self.max_wait = max_wait
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.cond = threading.Condition()
+        self.groups: Dict[Tuple[str, str, str, str], _Group] = {}
+        self.full: List[_Group] = []
+        self.in_flight: List[Tuple[Any, str, Dict[str, Future], float]] = []
+        self.thread: Optional[threading.Thread] = None
+
+    def submit(self, style: str, base_url: str, api_key: str, model: str, messages: List[Dict[str, Any]],
+               max_tokens: Optional[int] = None, temperature: Optional[float] = None,
+               stop: Optional[List[str]] = None) -> Future:
+        """Queue one chat call; the future resolves to {content, prompt_tokens, completion_tokens}"""
+        future: Future = Future()
+        custom_id = uuid.uuid4().hex
+        with self.cond:
+            key = (style, base_url, api_key, model)
+            group = self.groups.get(key)
+            if group is None:
+                group = self.groups[key] = _Group(BATCH_CLIENTS[style](base_url, api_key))
+            group.calls[custom_id] = group.client.build_request(model, messages, max_tokens, temperature, stop)
+            group.futures[custom_id] = future
+            group.oldest = group.oldest or time.time()
+            if len(group.calls) >= self.max_requests:
+                self.full.append(self.groups.pop(key))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name="llm-batch-collector", daemon=True)
+                self.thread.start()
+            self.cond.notify()
+        return future
+
+    def _due_groups(self) -> List[_Group]:
+        now = time.time()
+        due, self.full = self.full, []
+        for key, group in list(self.groups.items()):
+            if now - group.oldest >= self.max_wait:
+                due.append(group)
+                del self.groups[key]
+        return due
+
+    def _send(self, group: _Group):
+        try:
+            batch_id = group.client.submit(group.calls)
+        except Exception as e:
+            LLM_BATCHES.inc(status="submit_failed")
+            for future in group.futures.values():
+                future.set_exception(BatchRequestError(f"Batch submission failed: {e}"))
+            return
+        LLM_BATCH_REQUESTS.inc(len(group.calls))
+        print(f"📦 Submitted LLM batch {batch_id} ({len(group.calls)} calls)")
+        with self.cond:
+            self.in_flight.append((group.client, batch_id, group.futures, time.time()))
+
+    def _check(self, client, batch_id: str, futures: Dict[str, Future], submitted_at: float) -> bool:
+        """Resolve the futures of a finished or expired batch; False while it is still running"""
+        try:
+            results = client.poll(batch_id)
+        except Exception as e:
+            print(f"⚠️  Could not poll LLM batch {batch_id}: {e}")
+            results = None
+        if results is None:
+            if time.time() - submitted_at < self.timeout:
+                return False
+            # Its callers have given up by now; stop polling a batch that may never finish
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(BatchRequestError(
+                        f"Batch {batch_id} gave no results within {self.timeout:.0f} seconds"
+                    ))
+            LLM_BATCHES.inc(status="expired")
+            print(f"⌛ LLM batch {batch_id} expired")
+            return True
+
+        fallback = results.get("*", BatchRequestError(f"Batch {batch_id} returned no result for the call"))
+        for custom_id, future in futures.items():
+            result = results.get(custom_id, fallback)
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+        LLM_BATCHES.inc(status="completed" if "*" not in results else "failed")
+        print(f"📬 LLM batch {batch_id} finished")
+        return True
+
+    def _run(self):
+        last_poll = 0.0
+        while True:
+            with self.cond:
+                wait = self.poll_interval
+                if self.groups:
+                    oldest = min(group.oldest for group in self.groups.values())
+                    wait = min(wait, max(0.0, oldest + self.max_wait - time.time()))
+                self.cond.wait(timeout=wait)
+                due = self._due_groups()
+            for group in due:
+                self._send(group)
+
+            if time.time() - last_poll < self.poll_interval:
+                continue
+            last_poll = time.time()
+            with self.cond:
+                in_flight = list(self.in_flight)
+            finished = [
+                batch for batch in in_flight
+                if self._check(*batch)
+            ]
+            if finished:
+                with self.cond:
+                    self.in_flight = [batch for batch in self.in_flight if batch not in finished]
+
+    def stats(self) -> Dict[str, Any]:
+        with self.cond:
+            return {
+                "waiting_calls": sum(len(group.calls) for group in [*self.groups.values(), *self.full]),
+                "batches_in_flight": len(self.in_flight),
+                "calls_in_flight": sum(len(batch[2]) for batch in self.in_flight),
+            }
+
+
+# Global collector, created on first use
+_collector: Optional[BatchCollector] = None
+_collector_lock = threading.Lock()
+
+def get_batch_collector() -> BatchCollector:
+    """Get the shared batch collector"""
+    global _collector
+    with _collector_lock:
+        if _collector is None:
+            _collector = BatchCollector()
+        return _collector
@@ -5,18 +5,23 @@ Supports multiple API keys and providers with automatic failover
 
 # Load environment variables from .env file
 try:
-    from dotenv import load_dotenv
+    from dotenv import load_dotenv, dotenv_values
     load_dotenv()
 except ImportError:
+    dotenv_values = None
     print("⚠️  python-dotenv not installed. Install with: pip install python-dotenv")
 
+import contextvars
 import os
 import random
 import time
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from typing import List, Dict, Any, Mapping, Optional
+from dataclasses import dataclass, field
 import threading
-from collections import defaultdict
+from collections import defaultdict, deque
+
+from .metrics import LLM_SELECTIONS
+from .tracing import span
 
 @dataclass
 class LLMConfig:
@@ -28,6 +33,45 @@ class LLMConfig:
     max_tokens: int = 4000
     rate_limit_per_minute: int = 6000
     provider: str = "groq"  # groq, openai, gemini, anthropic, kimi
+    tier_models: Dict[str, str] = field(default_factory=dict)  # tier -> model
+
+    def model_for(self, tier: Optional[str] = None) -> str:
+        """Model to use for a tier (the config's own model if the tier is unknown)"""
+        return self.tier_models.get(tier, self.model) if tier else self.model
+
+# Model tiers: "fast" runs tool-selection loops, "quality" the final synthesis.
+# A provider's fast model is its config model; override either tier with
+# <PROVIDER>_FAST_MODEL / <PROVIDER>_QUALITY_MODEL.
+LLM_TIERS = ("fast", "quality")
+DEFAULT_QUALITY_MODELS = {
+    "groq": "groq/llama-3.3-70b-versatile",
+    "openai": "gpt-4o",
+    "gemini": "gemini/gemini-1.5-pro",
+    "anthropic": "claude-3-5-sonnet-20240620",
+    "kimi": "moonshot-v1-32k",
+}
+
+# Provider preference per tier (no tier keeps the original order)
+DEFAULT_PRIORITY = ["openai", "gemini", "anthropic", "groq", "kimi"]
+TIER_PRIORITY = {
+    "fast": ["groq", "openai", "gemini", "kimi", "anthropic"],
+    "quality": ["openai", "anthropic", "gemini", "groq", "kimi"],
+}
+
+# Prompt caching: agent system prompts are the same for every run, so providers
+# can serve them from their prompt cache. OpenAI, Gemini, Groq and Kimi cache
+# repeated prefixes automatically; these providers only cache up to explicit
+# cache_control breakpoints, which ManagedLLM adds to their requests.
+PROMPT_CACHING = os.getenv("PROMPT_CACHING", "1") == "1"
+CACHE_BREAKPOINT_PROVIDERS = {"anthropic"}
+
+def _tier_models(provider: str, default_model: str, environ: Mapping[str, str]) -> Dict[str, str]:
+    """Models a provider uses for each tier"""
+    prefix = provider.upper()
+    return {
+        "fast": environ.get(f"{prefix}_FAST_MODEL") or default_model,
+        "quality": environ.get(f"{prefix}_QUALITY_MODEL") or DEFAULT_QUALITY_MODELS[provider],
+    }
 
 class LLMManager:
     """
@@ -36,7 +80,9 @@ class LLMManager:
     
     def __init__(self):
         self.configs: List[LLMConfig] = []
-        self.usage_tracker = defaultdict(list)  # Track usage per config
+        self.usage_tracker = defaultdict(deque)  # Track usage per config (oldest first)
+        self.prompt_tokens = defaultdict(int)  # Prompt tokens per config
+        self.cached_tokens = defaultdict(int)  # ...and how many the provider served from its cache
         self.lock = threading.Lock()
         self.current_index = 0
         
@@ -45,19 +91,22 @@ class LLMManager:
         self.configs.append(config)
         print(f"✅ Added LLM config: {config.name} ({config.provider}) - {config.model}")
     
-    def load_from_env(self):
-        """Load LLM configurations from environment variables"""
+    def _read_env_configs(self, environ: Optional[Mapping[str, str]] = None) -> List[LLMConfig]:
+        """Build LLM configurations from environment variables"""
+        if environ is None:
+            environ = os.environ
+        configs = []
         
         # Groq configurations
         groq_keys = []
         for i in range(1, 11):  # Support up to 10 Groq keys
             key_name = f"GROQ_API_KEY_{i}" if i > 1 else "GROQ_API_KEY"
-            key = os.getenv(key_name)
+            key = environ.get(key_name)
             if key:
                 groq_keys.append(key)
         
         for i, key in enumerate(groq_keys, 1):
-            self.add_config(LLMConfig(
+            configs.append(LLMConfig(
                 name=f"Groq-{i}",
                 model="groq/llama-3.1-8b-instant",
                 api_key=key,
@@ -69,15 +118,16 @@ class LLMManager:
         openai_keys = []
         for i in range(1, 6):  # Support up to 5 OpenAI keys
             key_name = f"OPENAI_API_KEY_{i}" if i > 1 else "OPENAI_API_KEY"
-            key = os.getenv(key_name)
+            key = environ.get(key_name)
             if key:
                 openai_keys.append(key)
         
         for i, key in enumerate(openai_keys, 1):
-            self.add_config(LLMConfig(
+            configs.append(LLMConfig(
                 name=f"OpenAI-{i}",
                 model="gpt-4o-mini",
                 api_key=key,
+                base_url=environ.get("OPENAI_BASE_URL"),  # OpenAI-compatible endpoints
                 rate_limit_per_minute=30000,  # Much higher limit
                 provider="openai"
             ))
@@ -86,12 +136,12 @@ class LLMManager:
         gemini_keys = []
         for i in range(1, 6):  # Support up to 5 Gemini keys
             key_name = f"GEMINI_API_KEY_{i}" if i > 1 else "GEMINI_API_KEY"
-            key = os.getenv(key_name)
+            key = environ.get(key_name)
             if key:
                 gemini_keys.append(key)
         
         for i, key in enumerate(gemini_keys, 1):
-            self.add_config(LLMConfig(
+            configs.append(LLMConfig(
                 name=f"Gemini-{i}",
                 model="gemini/gemma-3n-e2b-it",  # Using Gemma 2 2B model as requested
                 api_key=key,
@@ -103,12 +153,12 @@ class LLMManager:
         anthropic_keys = []
         for i in range(1, 6):  # Support up to 5 Anthropic keys
             key_name = f"ANTHROPIC_API_KEY_{i}" if i > 1 else "ANTHROPIC_API_KEY"
-            key = os.getenv(key_name)
+            key = environ.get(key_name)
             if key:
                 anthropic_keys.append(key)
         
         for i, key in enumerate(anthropic_keys, 1):
-            self.add_config(LLMConfig(
+            configs.append(LLMConfig(
                 name=f"Anthropic-{i}",
                 model="claude-3-haiku-20240307",
                 api_key=key,
@@ -120,12 +170,12 @@ class LLMManager:
         kimi_keys = []
         for i in range(1, 6):  # Support up to 5 Kimi keys
             key_name = f"KIMI_API_KEY_{i}" if i > 1 else "KIMI_API_KEY"
-            key = os.getenv(key_name)
+            key = environ.get(key_name)
             if key:
                 kimi_keys.append(key)
         
         for i, key in enumerate(kimi_keys, 1):
-            self.add_config(LLMConfig(
+            configs.append(LLMConfig(
                 name=f"Kimi-{i}",
                 model="moonshot-v1-8k",  # Kimi/Moonshot model
                 api_key=key,
@@ -134,42 +184,113 @@ class LLMManager:
                 provider="kimi"
             ))
         
+        for config in configs:
+            config.tier_models = _tier_models(config.provider, config.model, environ)
+        
+        return configs
+
+    def load_from_env(self):
+        """Load LLM configurations from environment variables"""
+        for config in self._read_env_configs():
+            self.add_config(config)
+
         print(f"🚀 Loaded {len(self.configs)} LLM configurations")
         return len(self.configs) > 0
+
+    def reload(self, environ: Mapping[str, str]) -> Dict[str, List[str]]:
+        """
+        Atomically swap in the configurations found in `environ`.
+
+        Configs are matched by name; usage stats are kept for configs whose
+        settings did not change and dropped for changed or removed ones.
+        """
+        new_configs = self._read_env_configs(environ)
+
+        with self.lock:
+            old_by_name = {config.name: config for config in self.configs}
+            new_by_name = {config.name: config for config in new_configs}
+
+            diff = {
+                "added": [name for name in new_by_name if name not in old_by_name],
+                "removed": [name for name in old_by_name if name not in new_by_name],
+                "changed": [
+                    name for name, config in new_by_name.items()
+                    if name in old_by_name and old_by_name[name] != config
+                ],
+            }
+            diff["unchanged"] = [
+                name for name in new_by_name
+                if name in old_by_name and name not in diff["changed"]
+            ]
+
+            for name in diff["removed"] + diff["changed"]:
+                self.usage_tracker.pop(name, None)
+
+            # Readers take a reference to the list, so a single assignment is atomic
+            self.configs = new_configs
+
+        print(
+            f"🔁 Reloaded LLM configurations: {len(diff['added'])} added, "
+            f"{len(diff['changed'])} changed, {len(diff['removed'])} removed, "
+            f"{len(diff['unchanged'])} unchanged"
+        )
+        return diff
+
     
     def _is_rate_limited(self, config: LLMConfig) -> bool:
         """Check if a config is currently rate limited"""
         with self.lock:
             now = time.time()
-            # Remove old usage records (older than 1 minute)
-            self.usage_tracker[config.name] = [
-                timestamp for timestamp in self.usage_tracker[config.name]
-                if now - timestamp < 60
-            ]
+            # Remove old usage records (older than 1 minute) from the front
+            usage = self.usage_tracker[config.name]
+            while usage and now - usage[0] >= 60:
+                usage.popleft()
             
             # Check if we're near the rate limit
-            usage_count = len(self.usage_tracker[config.name])
+            usage_count = len(usage)
             return usage_count >= (config.rate_limit_per_minute * 0.8)  # 80% of limit
     
     def _record_usage(self, config: LLMConfig):
         """Record usage for rate limiting"""
         with self.lock:
             self.usage_tracker[config.name].append(time.time())
+
+    def record_prompt_tokens(self, config_name: str, prompt_tokens: int, cached_tokens: int):
+        """Record a call's prompt tokens and the share that hit the provider's prompt cache"""
+        with self.lock:
+            self.prompt_tokens[config_name] += prompt_tokens
+            self.cached_tokens[config_name] += cached_tokens
     
-    def get_best_config(self) -> Optional[LLMConfig]:
-        """Get the best available LLM configuration"""
-        if not self.configs:
+    def available_count(self) -> int:
+        """Count configurations that are not currently rate limited"""
+        return sum(1 for config in self.configs if not self._is_rate_limited(config))
+
+    def get_best_config(self, model: Optional[str] = None, tier: Optional[str] = None,
+                        exclude: Optional[List[str]] = None) -> Optional[LLMConfig]:
+        """Get the best available LLM configuration, optionally for a specific model or tier"""
+        configs = self.configs  # Snapshot in case a reload swaps the list
+        if model:
+            configs = [c for c in configs if model == c.model or model in c.tier_models.values()]
+        if exclude:
+            configs = [c for c in configs if c.name not in exclude]
+        if not configs:
             return None
         
         # First, try to find a non-rate-limited config
         available_configs = [
-            config for config in self.configs
+            config for config in configs
             if not self._is_rate_limited(config)
         ]
         
         if available_configs:
-            # Prefer higher-tier providers (OpenAI > Gemini > Anthropic > Groq > Kimi)
-            priority_order = ["openai", "gemini", "anthropic", "groq", "kimi"]
+            # A pinned config (e.g. one key per worker process) wins while it has capacity
+            for config in available_configs:
+                if config.name == _preferred_config.get():
+                    return config
+            
+            # Prefer higher-tier providers (OpenAI > Gemini > Anthropic > Groq > Kimi),
+            # or the providers best suited to the requested tier
+            priority_order = TIER_PRIORITY.get(tier, DEFAULT_PRIORITY)
             
             for provider in priority_order:
                 provider_configs = [c for c in available_configs if c.provider == provider]
@@ -178,15 +299,24 @@ class LLMManager:
                     return random.choice(provider_configs)
         
         # If all are rate limited, return the one with the least recent usage
-        return min(self.configs, key=lambda c: len(self.usage_tracker[c.name]))
+        return min(configs, key=lambda c: len(self.usage_tracker[c.name]))
     
-    def get_litellm_config(self) -> Dict[str, Any]:
+    def get_litellm_config(self, model: Optional[str] = None, tier: Optional[str] = None,
+                           exclude: Optional[List[str]] = None) -> Dict[str, Any]:
         """Get configuration for LiteLLM"""
-        config = self.get_best_config()
+        with span("llm.select") as select_span:
+            config = self.get_best_config(model, tier, exclude)
+            if config:
+                model = model or config.model_for(tier)
+            if select_span is not None and config:
+                select_span.set_attribute("llm.config", config.name)
+                select_span.set_attribute("llm.model", model)
+                select_span.set_attribute("llm.tier", tier or "default")
         if not config:
             raise Exception("No LLM configurations available")
         
         self._record_usage(config)
+        LLM_SELECTIONS.inc(config=config.name)
         
         # Set environment variable for the selected API key
         if config.provider == "groq":
@@ -200,13 +330,16 @@ class LLMManager:
         elif config.provider == "kimi":
             os.environ["MOONSHOT_API_KEY"] = config.api_key  # Kimi uses MOONSHOT_API_KEY
         
-        print(f"🔄 Using LLM: {config.name} ({config.model})")
+        print(f"🔄 Using LLM: {config.name} ({model})")
         
         llm_config = {
-            "model": config.model,
+            "name": config.name,
+            "model": model,
+            "tier": tier,
             "api_key": config.api_key,
             "max_tokens": config.max_tokens,
             "temperature": 0.1,
+            "cache_breakpoints": PROMPT_CACHING and config.provider in CACHE_BREAKPOINT_PROVIDERS,
         }
         
         # Add base_url for Kimi
@@ -215,25 +348,42 @@ class LLMManager:
         
         return llm_config
     
+    def get_hedge_config(self, exclude: str, tier: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Get a second configuration to hedge a slow call on, or None if every
+        other key is rate limited. The hedge counts against that key's rate budget.
+        """
+        config = self.get_best_config(tier=tier, exclude=[exclude])
+        if config is None or self._is_rate_limited(config):
+            return None
+        return self.get_litellm_config(model=config.model_for(tier), tier=tier, exclude=[exclude])
+
     def get_status(self) -> Dict[str, Any]:
         """Get status of all LLM configurations"""
+        configs = self.configs
         status = {
-            "total_configs": len(self.configs),
+            "total_configs": len(configs),
             "configs": []
         }
         
-        for config in self.configs:
+        for config in configs:
             usage_count = len(self.usage_tracker[config.name])
             is_limited = self._is_rate_limited(config)
+            prompt_tokens = self.prompt_tokens[config.name]
+            cached_tokens = self.cached_tokens[config.name]
             
             status["configs"].append({
                 "name": config.name,
                 "provider": config.provider,
                 "model": config.model,
+                "tier_models": config.tier_models,
                 "usage_last_minute": usage_count,
                 "rate_limit": config.rate_limit_per_minute,
                 "is_rate_limited": is_limited,
-                "utilization": f"{(usage_count / config.rate_limit_per_minute) * 100:.1f}%"
+                "utilization": f"{(usage_count / config.rate_limit_per_minute) * 100:.1f}%",
+                "prompt_tokens": prompt_tokens,
+                "cached_prompt_tokens": cached_tokens,
+                "prompt_cache_hit_rate": f"{(cached_tokens / prompt_tokens * 100) if prompt_tokens else 0:.1f}%"
             })
         
         return status
@@ -241,17 +391,107 @@ class LLMManager:
 # Global instance
 llm_manager = LLMManager()
 
+# Config pinned by the current worker (e.g. one key per parallel test iteration)
+_preferred_config: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "firstcrew_preferred_llm_config", default=None
+)
+
+# Initialization state for the global instance
+_init_lock = threading.Lock()
+_initialized = False
+_base_environ: Dict[str, str] = {}
+_env_file = os.getenv("LLM_ENV_FILE", ".env")
+_env_file_mtime: Optional[float] = None
+
+def _read_env_file() -> Dict[str, str]:
+    """Read key/value pairs from the .env file, if there is one"""
+    if dotenv_values is None or not os.path.exists(_env_file):
+        return {}
+    return {key: value for key, value in dotenv_values(_env_file).items() if value is not None}
+
+def _env_file_modified_time() -> Optional[float]:
+    try:
+        return os.path.getmtime(_env_file)
+    except OSError:
+        return None
+
 def initialize_llm_manager():
-    """Initialize the LLM manager with configurations from environment"""
-    success = llm_manager.load_from_env()
+    """Initialize the LLM manager with configurations from environment (only once)"""
+    global _initialized, _env_file_mtime
+    with _init_lock:
+        if _initialized:
+            return len(llm_manager.configs) > 0
+
+        # Remember the process environment without the .env values so reloads
+        # can tell keys that were removed from the file
+        file_keys = _read_env_file().keys()
+        _base_environ.update({
+            key: value for key, value in os.environ.items()
+            if key not in file_keys
+        })
+        _env_file_mtime = _env_file_modified_time()
+
+        success = llm_manager.load_from_env()
+        _initialized = True
+
     if not success:
         print("⚠️  No LLM configurations found in environment variables")
         print("Please add API keys to your .env file")
     return success
 
-def get_dynamic_llm_config():
-    """Get the best available LLM configuration"""
-    return llm_manager.get_litellm_config()
+def reload_llm_manager() -> Dict[str, List[str]]:
+    """Re-read the environment and .env file and swap in changed keys"""
+    global _env_file_mtime
+    if not _initialized:
+        initialize_llm_manager()
+
+    with _init_lock:
+        environ = dict(_base_environ)
+        environ.update(_read_env_file())
+        _env_file_mtime = _env_file_modified_time()
+        return llm_manager.reload(environ)
+
+def watch_llm_config(interval: float = 30.0) -> threading.Thread:
+    """Reload the LLM manager in the background whenever the .env file changes"""
+    def watch():
+        while True:
+            time.sleep(interval)
+            if _env_file_modified_time() != _env_file_mtime:
+                try:
+                    reload_llm_manager()
+                except Exception as e:
+                    print(f"⚠️  Error reloading LLM configurations: {e}")
+
+    thread = threading.Thread(target=watch, name="llm-config-watcher")
+    thread.daemon = True
+    thread.start()
+    return thread
+
+def get_dynamic_llm_config(model: Optional[str] = None, tier: Optional[str] = None):
+    """Get the best available LLM configuration, optionally for a model tier"""
+    return llm_manager.get_litellm_config(model, tier)
+
+def get_hedge_llm_config(exclude: str, tier: Optional[str] = None):
+    """Get a configuration other than `exclude` to send a hedge request to"""
+    return llm_manager.get_hedge_config(exclude, tier)
+
+def record_llm_prompt_tokens(config_name: str, prompt_tokens: int, cached_tokens: int):
+    """Count a call's prompt tokens, and the cached ones, against its configuration"""
+    llm_manager.record_prompt_tokens(config_name, prompt_tokens, cached_tokens)
+
+def get_llm_config_names() -> List[str]:
+    """Names of all loaded LLM configurations"""
+    initialize_llm_manager()
+    return [config.name for config in llm_manager.configs]
+
+def prefer_llm_config(name: Optional[str]):
+    """Use the named configuration in this thread/context whenever it is not rate limited"""
+    _preferred_config.set(name)
+
+def get_available_llm_count():
+    """Get the number of LLM configurations that are not rate limited"""
+    initialize_llm_manager()
+    return llm_manager.available_count()
 
 def get_llm_status():
     """Get status of all LLM configurations"""
@@ -5,6 +5,7 @@ import warnings
 from datetime import datetime
 
 from firstcrew.crew import Firstcrew
+from firstcrew.tool_guard import tool_guard
 
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
@@ -23,20 +24,32 @@ def run():
     }
     
     try:
-        Firstcrew().crew().kickoff(inputs=inputs)
+        with tool_guard():
+            Firstcrew().crew().kickoff(inputs=inputs)
     except Exception as e:
         raise Exception(f"An error occurred while running the crew: {e}")
 
 
+def _parallel_workers(position: int) -> int:
+    """Optional number of parallel iterations passed after the usual arguments"""
+    return int(sys.argv[position]) if len(sys.argv) > position else 1
+
+
 def train():
     """
     Train the crew for a given number of iterations.
+    Usage: train <n_iterations> <filename> [parallel_workers]
     """
     inputs = {
         "topic": "AI LLMs",
         'current_year': str(datetime.now().year)
     }
     try:
+        workers = _parallel_workers(3)
+        if workers > 1:
+            from firstcrew.parallel_eval import parallel_train
+            parallel_train(int(sys.argv[1]), sys.argv[2], inputs=inputs, workers=workers, crew_name="basic")
+            return
         Firstcrew().crew().train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
 
     except Exception as e:
@@ -55,6 +68,7 @@ def replay():
 def test():
     """
     Test the crew execution and returns the results.
+    Usage: test <n_iterations> <eval_llm> [parallel_workers]
     """
     inputs = {
         "topic": "AI LLMs",
@@ -62,6 +76,11 @@ def test():
     }
     
     try:
+        workers = _parallel_workers(3)
+        if workers > 1:
+            from firstcrew.parallel_eval import parallel_test
+            parallel_test(int(sys.argv[1]), sys.argv[2], inputs=inputs, workers=workers, crew_name="basic")
+            return
         Firstcrew().crew().test(n_iterations=int(sys.argv[1]), eval_llm=sys.argv[2], inputs=inputs)
 
     except Exception as e:
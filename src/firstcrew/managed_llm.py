@@ -0,0 +1,304 @@
+"""
+Managed LLM wrapper
+Ties a crewai LLM to the LLMManager config it came from, records
+per-config latency, token and error metrics for every call, applies
+the token budget of the current run, optionally hedges slow calls,
+sends the calls of bulk runs through provider batch APIs and marks
+prompt cache breakpoints for providers that need them
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from crewai import LLM
+from litellm import Usage
+from litellm.integrations.custom_logger import CustomLogger
+
+from .hedging import HEDGING_ENABLED, hedge_allowed, hedge_delay, latency_window
+from .llm_batch import LLM_BATCH_TIMEOUT, batch_target, batching_enabled, get_batch_collector
+from .llm_manager import get_dynamic_llm_config, get_hedge_llm_config, record_llm_prompt_tokens
+from .metrics import LLM_CALL_SECONDS, LLM_ERRORS, LLM_HEDGE_WINS, LLM_HEDGES, LLM_TOKENS
+from .token_budget import current_budget, estimate_tokens
+from .tracing import span
+
+
+class UsageCollector(CustomLogger):
+    """Captures the token usage crewai reports for a single call"""
+
+    def __init__(self):
+        super().__init__()
+        self.usage = None
+
+    def log_success_event(self, kwargs, response_obj, start_time, end_time):
+        if isinstance(response_obj, dict) and response_obj.get("usage"):
+            self.usage = response_obj["usage"]
+
+
+def add_cache_breakpoints(messages: Any) -> Any:
+    """
+    Mark the system prompt and the newest message as prompt cache breakpoints.
+    The system prompt is the same for every run of an agent; the newest
+    message caches the conversation so far for the agent's next iteration.
+    """
+    if isinstance(messages, str):
+        return messages
+    marked = []
+    last = len(messages) - 1
+    for i, message in enumerate(messages):
+        content = message.get("content")
+        if (message.get("role") == "system" or i == last) and isinstance(content, str) and content:
+            message = {**message, "content": [
+                {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+            ]}
+        marked.append(message)
+    return marked
+
+
+def cached_prompt_tokens(usage: Any) -> int:
+    """Prompt tokens the provider served from its prompt cache"""
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        cached = details.get("cached_tokens")
+    else:
+        cached = getattr(details, "cached_tokens", None)
+    return cached or getattr(usage, "cache_read_input_tokens", 0) or 0
+
+
+class ManagedLLM(LLM):
+    """
+    LLM bound to a named LLMManager configuration.
+
+    Args:
+        config_name: Name of the LLMManager config the model and key came from
+        tier: Model tier the agent runs on ("fast", "quality" or None)
+        task_tiers: Tier overrides by task name, applied when the agent
+            works on that task
+        cache_breakpoints: Mark prompt cache breakpoints in each request
+            (providers without automatic prompt caching)
+    """
+
+    def __init__(self, config_name: str = "default", tier: Optional[str] = None,
+                 task_tiers: Optional[Dict[str, str]] = None, cache_breakpoints: bool = False,
+                 **kwargs: Any):
+        self.config_name = config_name
+        self.tier = tier
+        self.active_tier = tier
+        self.task_tiers = dict(task_tiers or {})
+        self.cache_breakpoints = cache_breakpoints
+        super().__init__(**kwargs)
+
+    def _use_config(self, config: Dict[str, Any]):
+        """Send the following calls to another LLMManager config"""
+        self.config_name = config["name"]
+        self.model = config["model"]
+        self.api_key = config["api_key"]
+        self.base_url = config.get("base_url")
+        self.cache_breakpoints = config.get("cache_breakpoints", False)
+        # crewai derives these from the model in __init__
+        self.is_anthropic = self._is_anthropic_model(self.model)
+        self.context_window_size = 0
+
+    def _switch_tier(self, from_task):
+        """Move to the model tier of the task being worked on"""
+        tier = self.task_tiers.get(getattr(from_task, "name", None), self.tier)
+        if tier == self.active_tier:
+            return
+        try:
+            self._use_config(get_dynamic_llm_config(tier=tier))
+            self.active_tier = tier
+        except Exception as e:
+            print(f"⚠️  Could not switch to the {tier} tier: {e}")
+
+    def _resolve_downgrade(self, model: str):
+        try:
+            return get_dynamic_llm_config(model)
+        except Exception as e:
+            print(f"⚠️  No LLM configured for downgrade model {model}: {e}")
+            return None
+
+    def _apply_budget(self, budget, messages):
+        """Abort, downgrade or compress according to the run's token budget"""
+        budget.check()
+        config = budget.downgrade_config(self._resolve_downgrade)
+        if config and self.config_name != config["name"]:
+            print(f"💸 Token budget spent, switching {self.config_name} to {config['name']} ({config['model']})")
+            self._use_config(config)
+        return budget.prepare_messages(messages)
+
+    def call(self, messages, tools=None, callbacks=None, available_functions=None,
+             from_task=None, from_agent=None):
+        budget = current_budget()
+        if budget is None or not budget.downgraded:
+            self._switch_tier(from_task)
+        if budget is not None:
+            messages = self._apply_budget(budget, messages)
+
+        kwargs = dict(tools=tools, callbacks=callbacks, available_functions=available_functions,
+                      from_task=from_task, from_agent=from_agent)
+        # Bulk runs wait for provider batches (plain completions on providers with a batch API)
+        batched = batching_enabled() and not available_functions and batch_target(self.model, self.base_url)
+        # Function calling can run tools, so only plain completions are duplicated
+        if HEDGING_ENABLED and not available_functions and not batched:
+            return self._hedged_call(messages, budget, **kwargs)
+        if self.cache_breakpoints:
+            messages = add_cache_breakpoints(messages)
+        if batched:
+            return self._attempt(self._batched_call, self.config_name, self.model, messages, budget,
+                                 batched=True, **kwargs)
+        return self._attempt(super().call, self.config_name, self.model, messages, budget, **kwargs)
+
+    def _attempt(self, call, config_name: str, model: str, messages, budget,
+                 hedge: bool = False, batched: bool = False, callbacks=None,
+                 settle: Optional[Callable[[], bool]] = None, **kwargs):
+        """
+        Send one request with metrics, tracing and token budget accounting.
+        settle() is called when the request succeeds and returns True if its
+        answer is discarded (the other request of a hedged call won).
+        """
+        usage = UsageCollector()
+        attributes = {"llm.config": config_name, "llm.model": model,
+                      "llm.tier": self.active_tier or "default"}
+        if hedge:
+            attributes["llm.hedge"] = True
+        if batched:
+            attributes["llm.batch"] = True
+        with span("llm.call", **attributes) as call_span:
+            started = time.perf_counter()
+            try:
+                result = call(messages, callbacks=[*(callbacks or []), usage], **kwargs)
+            except Exception as e:
+                LLM_ERRORS.inc(config=config_name, error=type(e).__name__)
+                raise
+            finally:
+                # Batch turnaround would skew the latency metrics and hedge delays
+                if not batched:
+                    elapsed = time.perf_counter() - started
+                    LLM_CALL_SECONDS.observe(elapsed, config=config_name)
+                    latency_window.record(model, elapsed)
+
+            lost = settle() if settle is not None else False
+            prefix = "hedge_lost_" if lost else ""
+            if lost and call_span is not None:
+                call_span.set_attribute("llm.hedge_lost", True)
+
+            if usage.usage is not None:
+                prompt_tokens = getattr(usage.usage, "prompt_tokens", 0) or 0
+                completion_tokens = getattr(usage.usage, "completion_tokens", 0) or 0
+                cached_tokens = cached_prompt_tokens(usage.usage)
+                LLM_TOKENS.inc(prompt_tokens, config=config_name, type=prefix + "prompt")
+                LLM_TOKENS.inc(completion_tokens, config=config_name, type=prefix + "completion")
+                LLM_TOKENS.inc(cached_tokens, config=config_name, type=prefix + "cached_prompt")
+                record_llm_prompt_tokens(config_name, prompt_tokens, cached_tokens)
+                if call_span is not None:
+                    call_span.set_attribute("llm.prompt_tokens", prompt_tokens)
+                    call_span.set_attribute("llm.completion_tokens", completion_tokens)
+                    call_span.set_attribute("llm.cached_tokens", cached_tokens)
+            else:
+                # Some providers omit usage; estimate so the budget still moves
+                prompt_tokens = estimate_tokens(str(messages))
+                completion_tokens = estimate_tokens(str(result))
+                cached_tokens = 0
+
+            # The discarded request of a hedged call was still paid for
+            if budget is not None:
+                budget.record(prompt_tokens, completion_tokens, cached_tokens)
+
+        return result
+
+    def _batched_call(self, messages, callbacks=None, **kwargs):
+        """Queue the call for the provider's batch API and wait for its result"""
+        style, base_url, model = batch_target(self.model, self.base_url)
+        if isinstance(messages, str):
+            messages = [{"role": "user", "content": messages}]
+        future = get_batch_collector().submit(
+            style, base_url, self.api_key, model, messages,
+            max_tokens=self.max_tokens, temperature=self.temperature, stop=self.stop
+        )
+        result = future.result(timeout=LLM_BATCH_TIMEOUT)
+
+        # Report usage the way crewai does for direct calls
+        usage = Usage(
+            prompt_tokens=result["prompt_tokens"],
+            completion_tokens=result["completion_tokens"],
+            total_tokens=result["prompt_tokens"] + result["completion_tokens"],
+            prompt_tokens_details={"cached_tokens": result.get("cached_tokens", 0)},
+        )
+        for callback in callbacks or []:
+            if hasattr(callback, "log_success_event"):
+                callback.log_success_event(kwargs={}, response_obj={"usage": usage}, start_time=0, end_time=0)
+        return result["content"]
+
+    def _hedged_call(self, messages, budget, **kwargs):
+        """
+        Send the request and, if it is still running after the hedge delay
+        and the run's token budget allows it, a duplicate to another key. The
+        first successful response wins; the slower request is abandoned and
+        its tokens are counted as hedge_lost_*.
+        """
+        results: "queue.Queue" = queue.Queue()
+        winner = []
+        winner_lock = threading.Lock()
+
+        def settle(hedge):
+            with winner_lock:
+                if winner:
+                    return True
+                winner.append(hedge)
+                return False
+
+        def launch(call, config_name, model, hedge, cache_breakpoints):
+            prompt = add_cache_breakpoints(messages) if cache_breakpoints else messages
+
+            def run():
+                try:
+                    results.put((hedge, True, self._attempt(
+                        call, config_name, model, prompt, budget, hedge=hedge,
+                        settle=lambda: settle(hedge), **kwargs
+                    )))
+                except Exception as e:
+                    results.put((hedge, False, e))
+            # Copy the context so the request joins the run's trace and budget
+            context = contextvars.copy_context()
+            threading.Thread(target=context.run, args=(run,), daemon=True,
+                             name=f"llm-{'hedge' if hedge else 'primary'}").start()
+
+        launch(super().call, self.config_name, self.model, False, self.cache_breakpoints)
+        try:
+            _, ok, value = results.get(timeout=hedge_delay(self.model))
+        except queue.Empty:
+            pass
+        else:
+            if ok:
+                return value
+            raise value
+
+        config = get_hedge_llm_config(self.config_name, self.active_tier) if hedge_allowed(budget) else None
+        if config is None:
+            _, ok, value = results.get()
+            if ok:
+                return value
+            raise value
+
+        LLM_HEDGES.inc(config=self.config_name)
+        hedge_llm = LLM(
+            model=config["model"],
+            api_key=config["api_key"],
+            base_url=config.get("base_url"),
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        )
+        launch(hedge_llm.call, config["name"], config["model"], True, config.get("cache_breakpoints", False))
+
+        error = None
+        for _ in range(2):
+            hedge, ok, value = results.get()
+            # Both may succeed; only the request that settled first is the answer
+            if ok and winner and winner[0] == hedge:
+                LLM_HEDGE_WINS.inc(winner="hedge" if hedge else "primary")
+                return value
+            if not ok:
+                error = error or value
+        raise error
@@ -0,0 +1,316 @@
+"""
+Prometheus-style Metrics for the Research Pipeline
+Dependency-free counters, gauges and histograms rendered in the text
+exposition format served by /metrics
+"""
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric(ABC):
+    """Base class for a labelled metric"""
+
+    type_name = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> List[str]:
+        """Sample lines of the metric in the text exposition format"""
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] += amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Gauge(Metric):
+    """Value that can go up and down, or be computed at scrape time"""
+
+    type_name = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = defaultdict(float)
+        self.function: Optional[Callable[[], float]] = None
+        if not self.labelnames:
+            self.values[()] = 0.0
+
+    def set(self, value: float, **labels: str):
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] += amount
+
+    def dec(self, amount: float = 1, **labels: str):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], float]):
+        """Compute the (unlabelled) value on every scrape"""
+        self.function = function
+
+    def samples(self) -> List[str]:
+        if self.function is not None:
+            return [f"{self.name} {_format_value(self.function())}"]
+        with self.lock:
+            items = list(self.values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in items
+        ]
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = (0.1, 0.5, 1, 5, 10, 30, 60)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self.counts: Dict[Tuple[str, ...], List[int]] = {}
+        self.sums: Dict[Tuple[str, ...], float] = defaultdict(float)
+
+    def observe(self, value: float, **labels: str):
+        key = self._key(labels)
+        with self.lock:
+            counts = self.counts.get(key)
+            if counts is None:
+                counts = self.counts[key] = [0] * len(self.buckets)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self.sums[key] += value
+
+    def samples(self) -> List[str]:
+        lines = []
+        with self.lock:
+            items = [(key, list(counts), self.sums[key]) for key, counts in self.counts.items()]
+        for key, counts, total in items:
+            for bound, count in zip(self.buckets, counts):
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {counts[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self.metrics) + "\n"
+
+
+# Global registry
+REGISTRY = MetricsRegistry()
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Crew execution
+CREW_KICKOFF_SECONDS = REGISTRY.register(Histogram(
+    "research_crew_kickoff_seconds", "Duration of a full crew kickoff",
+    ["status"], buckets=(5, 15, 30, 60, 90, 120, 180, 300, 600)
+))
+TASK_SECONDS = REGISTRY.register(Histogram(
+    "research_task_seconds", "Duration of each crew task",
+    ["task", "agent"], buckets=(1, 5, 10, 20, 30, 60, 120, 300)
+))
+AGENT_SECONDS = REGISTRY.register(Histogram(
+    "research_agent_seconds", "Time spent per agent in a crew run",
+    ["agent"], buckets=(1, 5, 10, 20, 30, 60, 120, 300)
+))
+
+# LLM calls
+LLM_CALL_SECONDS = REGISTRY.register(Histogram(
+    "llm_call_seconds", "Latency of LLM completion calls",
+    ["config"], buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60)
+))
+LLM_TOKENS = REGISTRY.register(Counter(
+    "llm_tokens_total",
+    "Tokens consumed by LLM calls (type cached_prompt: prompt tokens served from the provider's cache; "
+    "hedge_lost_*: tokens of the discarded, slower request of a hedged call)",
+    ["config", "type"]
+))
+LLM_ERRORS = REGISTRY.register(Counter(
+    "llm_call_errors_total", "Failed LLM calls",
+    ["config", "error"]
+))
+RUN_TOKENS = REGISTRY.register(Histogram(
+    "research_run_tokens", "Prompt + completion tokens used per crew run",
+    buckets=(1000, 2500, 5000, 10000, 20000, 40000, 80000, 160000)
+))
+TOKEN_BUDGET_ACTIONS = REGISTRY.register(Counter(
+    "token_budget_actions_total", "Prompt compressions, model downgrades and aborts by the token budget",
+    ["action"]
+))
+LLM_HEDGES = REGISTRY.register(Counter(
+    "llm_hedges_total", "Duplicate LLM requests sent because the first one was slow",
+    ["config"]
+))
+LLM_HEDGE_WINS = REGISTRY.register(Counter(
+    "llm_hedge_wins_total", "Hedged LLM calls by which request answered first",
+    ["winner"]
+))
+LLM_SELECTIONS = REGISTRY.register(Counter(
+    "llm_selections_total", "LLM configurations handed out by the LLM manager",
+    ["config"]
+))
+LLM_BATCHES = REGISTRY.register(Counter(
+    "llm_batches_total", "Provider batches of LLM calls by outcome",
+    ["status"]
+))
+LLM_BATCH_REQUESTS = REGISTRY.register(Counter(
+    "llm_batch_requests_total", "LLM calls submitted through provider batch APIs"
+))
+
+# SerpAPI
+SERP_REQUEST_SECONDS = REGISTRY.register(Histogram(
+    "serpapi_request_seconds", "Latency of SerpAPI requests",
+    ["engine"], buckets=(0.1, 0.25, 0.5, 1, 2, 5, 10)
+))
+SERP_CACHE_REQUESTS = REGISTRY.register(Counter(
+    "serpapi_cache_requests_total", "SerpAPI lookups by cache result",
+    ["engine", "result"]
+))
+TOOL_GUARD_ACTIONS = REGISTRY.register(Counter(
+    "tool_guard_actions_total", "Search tool calls answered from the run's memory (memoized, similar) or stopped",
+    ["tool", "action"]
+))
+
+# Worker pool
+QUEUE_DEPTH = REGISTRY.register(Gauge(
+    "research_queue_depth", "Research runs waiting for a worker"
+))
+QUEUE_WAIT_SECONDS = REGISTRY.register(Histogram(
+    "research_queue_wait_seconds", "Time research runs spent waiting for a worker",
+    buckets=(0.01, 0.1, 1, 5, 15, 30, 60, 120, 300)
+))
+ACTIVE_WORKERS = REGISTRY.register(Gauge(
+    "research_active_workers", "Research workers currently running a crew"
+))
+
+
+def _agent_label(agent, topic: str) -> str:
+    """Agent role without the interpolated topic, to keep label cardinality low"""
+    if agent is None:
+        return ""
+    role = getattr(agent, "role", "") or ""
+    if topic:
+        role = role.replace(topic, "")
+    return " ".join(role.split())
+
+
+def observe_crew_tasks(crew, topic: str):
+    """Record per-task and per-agent durations of a finished crew"""
+    agent_seconds: Dict[str, float] = defaultdict(float)
+    for task in crew.tasks:
+        duration = getattr(task, "execution_duration", None)
+        if duration is None:
+            continue
+        agent = _agent_label(task.agent, topic)
+        TASK_SECONDS.observe(duration, task=task.name or "", agent=agent)
+        agent_seconds[agent] += duration
+
+    for agent, seconds in agent_seconds.items():
+        AGENT_SECONDS.observe(seconds, agent=agent)
+
+
+def render_metrics() -> str:
+    """Render all metrics in the Prometheus text format"""
+    return REGISTRY.render()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_metrics_server(port: int, host: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics on a daemon thread, for processes without the web app (research workers)"""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
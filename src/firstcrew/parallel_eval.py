@@ -0,0 +1,227 @@
+"""
+Parallel Crew Testing and Training
+Runs the independent iterations of crew.test / crew.train concurrently and
+aggregates the per-iteration results in iteration order, so the output
+table and trained-agents file match a sequential run.
+
+This reproduces crew.test()/crew.train() with crewai internals (private
+Crew attributes and CrewAgentExecutor methods), so check_crewai_internals()
+fails loudly if an installed crewai no longer has them.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+from .crew_factory import get_crew_factory, load_crew_class
+
+# The sequential `test` and `train` commands run the basic Firstcrew
+DEFAULT_CREW = "basic"
+
+
+def check_crewai_internals():
+    """Raise if the installed crewai lacks the internals parallel runs rely on"""
+    import crewai
+    from crewai import Crew
+    from crewai.agents.crew_agent_executor import CrewAgentExecutor
+    from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+    from crewai.utilities.evaluators.task_evaluator import TaskEvaluator
+
+    missing = [f"Crew.{name}" for name in ("_train", "_train_iteration")
+               if name not in Crew.__private_attributes__]
+    missing += [f"{cls.__name__}.{name}" for cls, names in (
+        (CrewAgentExecutor, ("_ask_human_input", "_handle_crew_training_output")),
+        (CrewEvaluator, ("set_iteration", "print_crew_evaluation_result")),
+        (TaskEvaluator, ("evaluate_training_data",)),
+    ) for name in names if not hasattr(cls, name)]
+    if missing:
+        raise RuntimeError(
+            f"crewai {crewai.__version__} lacks {', '.join(missing)}; parallel test/train "
+            "needs a crewai release compatible with 0.150 (run without parallel workers instead)"
+        )
+
+
+def _assign_llm_configs(n_iterations: int) -> List[Optional[str]]:
+    """Round-robin LLM keys over iterations (None if the manager has no keys)"""
+    from .llm_manager import get_llm_config_names
+    names = get_llm_config_names()
+    return [names[i % len(names)] if names else None for i in range(n_iterations)]
+
+
+def _pinned_crew(factory, llm_config: Optional[str]):
+    """
+    A crew copy whose agents call the iteration's LLM key. The enhanced crew
+    picks its LLMs through the manager, which follows the preferred config;
+    agents of other crews (the basic Firstcrew) get an LLM for that key.
+    """
+    from crewai import LLM
+    from .llm_manager import get_dynamic_llm_config, initialize_llm_manager, prefer_llm_config
+    from .managed_llm import ManagedLLM
+
+    prefer_llm_config(llm_config)
+    crew = factory.create()
+    if llm_config is None or not initialize_llm_manager():
+        return crew
+    for crew_agent in crew.agents:
+        if not isinstance(crew_agent.llm, ManagedLLM):
+            config = get_dynamic_llm_config()
+            crew_agent.llm = LLM(model=config["model"], api_key=config["api_key"],
+                                 base_url=config.get("base_url"), max_tokens=config["max_tokens"],
+                                 temperature=config["temperature"])
+    return crew
+
+
+def _test_iteration(crew_name: str, iteration: int, eval_llm: str,
+                    inputs: Optional[Dict[str, Any]], llm_config: Optional[str]) -> Dict[str, Any]:
+    """Run one test iteration in a worker process and return its scores"""
+    from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+    from crewai.utilities.llm_utils import create_llm
+
+    crew = _pinned_crew(get_crew_factory(load_crew_class(crew_name)), llm_config)
+    evaluator = CrewEvaluator(crew, create_llm(eval_llm))
+    evaluator.set_iteration(iteration)
+    crew.kickoff(inputs=inputs)
+
+    return {
+        "iteration": iteration,
+        "scores": list(evaluator.tasks_scores[iteration]),
+        "execution_times": list(evaluator.run_execution_times[iteration]),
+        "agents": [sorted(task.processed_by_agents) for task in crew.tasks],
+    }
+
+
+def parallel_test(n_iterations: int, eval_llm: str, inputs: Optional[Dict[str, Any]] = None,
+                  workers: int = 2, crew_name: str = DEFAULT_CREW):
+    """
+    Test the crew like crew.test(), running iterations in worker processes.
+
+    Each iteration is pinned to an LLM key (round robin) so concurrent
+    iterations don't compete for the same rate limit. Scores are collected
+    per iteration and printed in the same table crew.test() prints.
+    """
+    from crewai.utilities.evaluators.crew_evaluator_handler import CrewEvaluator
+    from crewai.utilities.llm_utils import create_llm
+
+    check_crewai_internals()
+    llm_configs = _assign_llm_configs(n_iterations)
+    print(f"🧪 Testing {n_iterations} iterations on {workers} worker processes")
+
+    # Spawned workers don't inherit crewai's background threads or locks
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        futures = [
+            executor.submit(_test_iteration, crew_name, i, eval_llm, inputs, llm_configs[i - 1])
+            for i in range(1, n_iterations + 1)
+        ]
+        results = sorted((future.result() for future in futures), key=lambda r: r["iteration"])
+
+    # Rebuild the evaluator state in iteration order and print the usual table
+    crew = get_crew_factory(load_crew_class(crew_name)).create()
+    evaluator = CrewEvaluator(crew, create_llm(eval_llm))
+    evaluator.tasks_scores.clear()
+    evaluator.run_execution_times.clear()
+    for result in results:
+        evaluator.tasks_scores[result["iteration"]] = result["scores"]
+        evaluator.run_execution_times[result["iteration"]] = result["execution_times"]
+        for task, agents in zip(crew.tasks, result["agents"]):
+            task.processed_by_agents.update(agents)
+    evaluator.print_crew_evaluation_result()
+    return results
+
+
+@contextmanager
+def _serialized_training():
+    """
+    Let concurrent training iterations share the terminal and the training
+    data file: feedback prompts are asked one at a time and updates to
+    training_data.pkl don't overwrite each other.
+    """
+    from crewai.agents.crew_agent_executor import CrewAgentExecutor
+
+    lock = threading.RLock()
+    original_ask = CrewAgentExecutor._ask_human_input
+    original_save = CrewAgentExecutor._handle_crew_training_output
+
+    def ask_human_input(self, final_answer):
+        with lock:
+            return original_ask(self, final_answer)
+
+    def handle_crew_training_output(self, *args, **kwargs):
+        with lock:
+            return original_save(self, *args, **kwargs)
+
+    CrewAgentExecutor._ask_human_input = ask_human_input
+    CrewAgentExecutor._handle_crew_training_output = handle_crew_training_output
+    try:
+        yield
+    finally:
+        CrewAgentExecutor._ask_human_input = original_ask
+        CrewAgentExecutor._handle_crew_training_output = original_save
+
+
+def parallel_train(n_iterations: int, filename: str, inputs: Optional[Dict[str, Any]] = None,
+                   workers: int = 2, crew_name: str = DEFAULT_CREW):
+    """
+    Train the crew like crew.train(), running iterations concurrently.
+
+    Training asks for human feedback on every task, so iterations run on
+    threads sharing this terminal (prompts are serialized) instead of
+    processes. Each iteration uses its own crew copy; its training data is
+    mapped back to the agents of one crew and evaluated in iteration order,
+    producing the same trained-agents file.
+    """
+    from crewai.utilities.constants import TRAINING_DATA_FILE
+    from crewai.utilities.evaluators.task_evaluator import TaskEvaluator
+    from crewai.utilities.training_handler import CrewTrainingHandler
+
+    check_crewai_internals()
+    factory = get_crew_factory(load_crew_class(crew_name))
+    CrewTrainingHandler(TRAINING_DATA_FILE).initialize_file()
+    CrewTrainingHandler(filename).initialize_file()
+    llm_configs = _assign_llm_configs(n_iterations)
+    print(f"🏋️ Training {n_iterations} iterations on {workers} threads")
+
+    def run_iteration(iteration: int):
+        crew = _pinned_crew(factory, llm_configs[iteration])
+        crew._train = True
+        for task in crew.tasks:
+            task.human_input = True
+        for crew_agent in crew.agents:
+            crew_agent.allow_delegation = False
+        crew._train_iteration = iteration
+        crew.kickoff(inputs=inputs)
+        return crew
+
+    try:
+        with _serialized_training(), ThreadPoolExecutor(max_workers=workers) as executor:
+            crews = list(executor.map(run_iteration, range(n_iterations)))
+    except Exception:
+        CrewTrainingHandler(TRAINING_DATA_FILE).clear()
+        CrewTrainingHandler(filename).clear()
+        raise
+
+    # Every crew copy has its own agent ids: merge the data of the agent at
+    # the same position into the first crew's agents, in iteration order
+    raw_data = CrewTrainingHandler(TRAINING_DATA_FILE).load() or {}
+    canonical_agents = crews[0].agents
+    training_data: Dict[str, Dict[int, Any]] = {}
+    for index, canonical_agent in enumerate(canonical_agents):
+        merged: Dict[int, Any] = {}
+        for crew in crews:
+            merged.update(raw_data.get(str(crew.agents[index].id)) or {})
+        if merged:
+            training_data[str(canonical_agent.id)] = dict(sorted(merged.items()))
+    CrewTrainingHandler(TRAINING_DATA_FILE).save(training_data)
+
+    for crew_agent in canonical_agents:
+        if training_data.get(str(crew_agent.id)):
+            result = TaskEvaluator(crew_agent).evaluate_training_data(
+                training_data=training_data, agent_id=str(crew_agent.id)
+            )
+            CrewTrainingHandler(filename).save_trained_data(
+                agent_id=str(crew_agent.role), trained_data=result.model_dump()
+            )
+    print(f"💾 Trained agent data saved to {os.path.abspath(filename)}")
@@ -0,0 +1,88 @@
+"""
+Incremental Refresh Mode
+Updates the previous report on a topic instead of regenerating it: news
+searches only return articles published since that report, and the
+reporting analyst returns just the sections that changed, which are merged
+back into the previous report
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from .report_delivery import section_level, split_sections
+
+# Reply of the refresh tasks when nothing relevant happened
+NO_CHANGES = "NO CHANGES"
+
+
+def find_previous_report(store, topic: str) -> Optional[Dict[str, Any]]:
+    """The newest stored report on a topic, or None"""
+    latest = store.latest_for_topic(topic)
+    if latest is None:
+        return None
+    task_id, entry = latest
+    content = store.get(task_id)
+    if content is None:
+        return None
+    return {
+        "task_id": task_id,
+        "content": content,
+        "created_at": datetime.fromtimestamp(entry["created_at"]),
+    }
+
+
+def refresh_inputs(previous: Dict[str, Any]) -> Dict[str, str]:
+    """Extra kickoff inputs used by the refresh task descriptions"""
+    headings = [heading for heading, _ in split_sections(previous["content"]) if heading]
+    return {
+        "last_run_date": previous["created_at"].date().isoformat(),
+        "previous_outline": "\n".join(f"- {heading}" for heading in headings) or "- (no sections)",
+        "previous_report": previous["content"],
+    }
+
+
+def apply_refresh(crew, tasks_config: Dict[str, Any]):
+    """
+    Switch the tasks of a cloned crew to their refresh prompts
+    (`refresh_description` / `refresh_expected_output` in tasks.yaml).
+    Refresh answers are free-form, so structured outputs are turned off.
+    """
+    for task in crew.tasks:
+        config = tasks_config.get(task.name) or {}
+        if config.get("refresh_description"):
+            task.description = config["refresh_description"]
+        if config.get("refresh_expected_output"):
+            task.expected_output = config["refresh_expected_output"]
+            task.output_pydantic = None
+
+
+def merge_sections(previous: str, patch: str) -> str:
+    """
+    Apply the analyst's changed sections to the previous report: a section
+    with the heading of an existing one replaces it, any other is appended.
+    """
+    if not patch.strip() or patch.strip().upper().startswith(NO_CHANGES):
+        return previous
+
+    level = section_level(previous) or 2
+    sections = split_sections(previous, level)
+    positions = {heading.strip().casefold(): i for i, (heading, _) in enumerate(sections) if heading}
+
+    patch_sections = split_sections(patch, level)
+    if not any(heading for heading, _ in patch_sections):
+        # Headings at another level than the report's, or none at all
+        patch_sections = split_sections(patch)
+        if not any(heading for heading, _ in patch_sections):
+            patch_sections = [("Latest updates", f"{'#' * level} Latest updates\n\n{patch.strip()}")]
+
+    for heading, text in patch_sections:
+        if not heading:
+            continue  # commentary before the first section
+        key = heading.strip().casefold()
+        if key in positions:
+            sections[positions[key]] = (heading, text)
+        else:
+            positions[key] = len(sections)
+            sections.append((heading, text))
+
+    return "".join(text.rstrip() + "\n\n" for _, text in sections).rstrip() + "\n"
@@ -0,0 +1,204 @@
+"""
+Report Delivery Helpers
+Section selection, truncation, gzip/brotli negotiation and conditional
+(ETag/Last-Modified/Range) responses for report endpoints
+"""
+
+import gzip
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from flask import Response
+
+# Bodies smaller than this are not worth compressing
+MIN_COMPRESS_BYTES = 512
+
+_HEADING = re.compile(r"^(#{1,6})\s+(.*\S)\s*$", re.MULTILINE)
+
+
+def section_level(markdown: str) -> Optional[int]:
+    """Heading level of a report's sections: the shallowest one below the title"""
+    levels = [len(m.group(1)) for m in _HEADING.finditer(markdown)]
+    if not levels:
+        return None
+    return min(levels[1:]) if len(set(levels)) > 1 else levels[0]
+
+
+def split_sections(markdown: str, level: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Split a report into (heading, text) pairs at its section headings (or at
+    headings of the given level). Text before the first section has no heading.
+    """
+    level = level or section_level(markdown)
+    starts = [m for m in _HEADING.finditer(markdown) if len(m.group(1)) == level]
+    if not starts:
+        return [("", markdown)]
+
+    sections = []
+    if starts[0].start() > 0:
+        sections.append(("", markdown[:starts[0].start()]))
+    for i, match in enumerate(starts):
+        end = starts[i + 1].start() if i + 1 < len(starts) else len(markdown)
+        sections.append((match.group(2), markdown[match.start():end]))
+    return sections
+
+
+def select_sections(markdown: str, wanted: Sequence[str]) -> str:
+    """
+    Keep only the requested sections. Each entry is a 1-based section number
+    or a case-insensitive substring of the section heading.
+    """
+    sections = [s for s in split_sections(markdown) if s[0]]
+    selected = []
+    for i, (heading, text) in enumerate(sections, 1):
+        for item in wanted:
+            item = item.strip()
+            if (item.isdigit() and int(item) == i) or (item and item.lower() in heading.lower()):
+                selected.append(text)
+                break
+    return "".join(selected)
+
+
+def truncate(text: str, max_chars: int) -> Tuple[str, bool]:
+    """Cut text to at most max_chars, preferring a paragraph or line break"""
+    if max_chars <= 0 or len(text) <= max_chars:
+        return text, False
+    cut = text[:max_chars]
+    for separator in ("\n\n", "\n"):
+        position = cut.rfind(separator)
+        if position > max_chars // 2:
+            return cut[:position], True
+    return cut, True
+
+
+def shape_content(content: str, args) -> Dict[str, object]:
+    """Apply ?section= and ?max_chars= query parameters to report content"""
+    sections = [s for value in args.getlist("section") for s in value.split(",") if s.strip()]
+    if sections:
+        content = select_sections(content, sections)
+    max_chars = args.get("max_chars", type=int) or 0
+    content, truncated = truncate(content, max_chars)
+    return {"content": content, "truncated": truncated, "sections": sections}
+
+
+def _negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick br or gzip from an Accept-Encoding header (q=0 means refused)"""
+    offered = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        offered[name.strip().lower()] = quality
+    if brotli is not None and offered.get("br", 0) > 0:
+        return "br"
+    if offered.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class _CompressionCache:
+    """Small LRU of compressed bodies keyed by (etag, encoding)"""
+
+    def __init__(self, max_entries: int = 128):
+        self.max_entries = max_entries
+        self.entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, etag: str, encoding: str, body: bytes) -> bytes:
+        key = (etag, encoding)
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                self.entries.move_to_end(key)
+                return cached
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=5)
+        else:
+            compressed = gzip.compress(body, compresslevel=6, mtime=0)
+        with self.lock:
+            self.entries[key] = compressed
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return compressed
+
+
+_compression_cache = _CompressionCache()
+
+
+def make_etag(*parts: object) -> str:
+    """Stable ETag for a representation built from the given parts"""
+    return hashlib.sha1("\0".join(str(p) for p in parts).encode("utf-8")).hexdigest()[:20]
+
+
+def _variants(etag: str) -> List[str]:
+    return [etag, f"{etag}-gzip", f"{etag}-br"]
+
+
+def not_modified(request, etag: str, last_modified: Optional[float] = None) -> Optional[Response]:
+    """
+    A 304 response if the client's cached copy (any encoding) is current,
+    otherwise None. Lets callers skip building the body altogether.
+    """
+    if request.if_none_match:
+        if request.if_none_match.star_tag:
+            matched = etag
+        else:
+            matched = next((v for v in _variants(etag) if request.if_none_match.contains(v)), None)
+    elif last_modified is not None and request.if_modified_since:
+        fresh = int(last_modified) <= request.if_modified_since.timestamp()
+        matched = etag if fresh else None
+    else:
+        matched = None
+    if matched is None:
+        return None
+
+    response = Response(status=304)
+    response.set_etag(matched)
+    if last_modified is not None:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    response.vary.add("Accept-Encoding")
+    return response
+
+
+def conditional_response(request, body: bytes, mimetype: str, etag: str,
+                         last_modified: Optional[float] = None,
+                         accept_ranges: bool = False,
+                         headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Build a response that honours If-None-Match / If-Modified-Since (304),
+    Range (206, identity encoding only) and gzip/brotli negotiation.
+    """
+    cached = not_modified(request, etag, last_modified)
+    if cached is not None:
+        return cached
+
+    encoding = None
+    if len(body) >= MIN_COMPRESS_BYTES and not request.range:
+        encoding = _negotiate_encoding(request.headers.get("Accept-Encoding", ""))
+    if encoding:
+        body = _compression_cache.get(etag, encoding, body)
+
+    response = Response(body, mimetype=mimetype, headers=headers)
+    response.set_etag(f"{etag}-{encoding}" if encoding else etag)
+    if last_modified is not None:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+    response.vary.add("Accept-Encoding")
+    response.cache_control.no_cache = True  # always revalidate, 304s are cheap
+    if encoding:
+        response.content_encoding = encoding
+    if not accept_ranges:
+        return response
+    return response.make_conditional(request, accept_ranges=True, complete_length=len(body))
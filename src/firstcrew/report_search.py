@@ -0,0 +1,152 @@
+"""
+Report Search
+SQLite FTS5 full-text index over report topics and bodies, updated as runs
+complete, so existing answers can be found before starting a new crew
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from .report_store import REPORT_STORE_DIR
+
+REPORT_INDEX_PATH = os.getenv("REPORT_INDEX_PATH", os.path.join(REPORT_STORE_DIR, "search.db"))
+
+# A topic match counts five times as much as a body match
+TOPIC_WEIGHT = 5.0
+BODY_WEIGHT = 1.0
+
+MAX_PAGE_SIZE = 50
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(text: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query: every word must match, the last one
+    as a prefix (so "kubern" finds "kubernetes"). Operators and quotes in the
+    input are treated as plain words.
+    """
+    tokens = _TOKEN.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+class ReportIndex:
+    """Full-text index of completed reports keyed by task id"""
+
+    def __init__(self, path: str = REPORT_INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                """CREATE VIRTUAL TABLE IF NOT EXISTS reports USING fts5(
+                    task_id UNINDEXED,
+                    created_at UNINDEXED,
+                    topic,
+                    body,
+                    tokenize = 'porter unicode61'
+                )"""
+            )
+
+    def add(self, task_id: str, topic: str, body: str, created_at: str):
+        """Index (or re-index) one report"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM reports WHERE task_id = ?", (task_id,))
+            self.conn.execute(
+                "INSERT INTO reports (task_id, created_at, topic, body) VALUES (?, ?, ?, ?)",
+                (task_id, created_at, topic or "", body),
+            )
+
+    def remove(self, task_ids: Iterable[str]):
+        """Drop reports from the index"""
+        with self.lock, self.conn:
+            self.conn.executemany("DELETE FROM reports WHERE task_id = ?", [(t,) for t in task_ids])
+
+    def task_ids(self) -> set:
+        with self.lock:
+            return {row[0] for row in self.conn.execute("SELECT task_id FROM reports")}
+
+    def search(self, text: str, limit: int = 10, offset: int = 0) -> Dict[str, Any]:
+        """Best matching reports first, with a highlighted snippet of the body"""
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+        query = build_match_query(text)
+        if query is None:
+            return {"query": text, "total": 0, "results": [], "next_offset": None}
+
+        with self.lock:
+            total = self.conn.execute(
+                "SELECT count(*) FROM reports WHERE reports MATCH ?", (query,)
+            ).fetchone()[0]
+            rows = self.conn.execute(
+                f"""SELECT task_id, created_at, topic,
+                        snippet(reports, 3, '**', '**', ' … ', 24),
+                        bm25(reports, 0, 0, {TOPIC_WEIGHT}, {BODY_WEIGHT}) AS score
+                    FROM reports WHERE reports MATCH ?
+                    ORDER BY score LIMIT ? OFFSET ?""",
+                (query, limit, offset),
+            ).fetchall()
+
+        results = [
+            {
+                "task_id": task_id,
+                "topic": topic,
+                "created_at": created_at,
+                "snippet": snippet,
+                # bm25 is lower-is-better, flip it so clients sort descending
+                "score": round(-score, 4),
+            }
+            for task_id, created_at, topic, snippet, score in rows
+        ]
+        next_offset = offset + len(results) if offset + len(results) < total else None
+        return {"query": text, "total": total, "results": results, "next_offset": next_offset}
+
+
+def sync_index(index: ReportIndex, store) -> Dict[str, int]:
+    """
+    Bring the index in line with the report store: index reports it is
+    missing and drop the ones the store no longer has.
+    """
+    entries = store.entries()
+    indexed = index.task_ids()
+
+    stale = indexed - set(entries)
+    if stale:
+        index.remove(stale)
+
+    added = 0
+    for task_id in set(entries) - indexed:
+        body = store.get(task_id)
+        if body is None:
+            continue
+        entry = entries[task_id]
+        created_at = datetime.fromtimestamp(entry["created_at"]).isoformat()
+        index.add(task_id, entry.get("topic") or "", body, created_at)
+        added += 1
+    return {"added": added, "removed": len(stale)}
+
+
+# Global index, opened on first use
+_index: Optional[ReportIndex] = None
+_index_lock = threading.Lock()
+
+def get_report_index() -> ReportIndex:
+    """Get the shared report search index"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = ReportIndex()
+        return _index
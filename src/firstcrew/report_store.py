@@ -0,0 +1,341 @@
+"""
+Report Store
+Content-addressed, compressed storage for research reports:
+
+    <REPORT_STORE_DIR>/objects/<ab>/<sha256>.zst   report bodies (and findings JSON), stored once per content
+    <REPORT_STORE_DIR>/index.json                  task id -> digest, size, topic, created_at, findings_digest
+
+Bodies are zstd compressed when the zstandard package is installed and gzip
+compressed otherwise (both are readable either way). Hot reports are served
+from a bounded cache of decompressed bodies, and a background thread drops
+reports past their retention period and deletes unreferenced objects.
+"""
+
+import gzip
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+REPORT_STORE_DIR = os.getenv("REPORT_STORE_DIR", "reports")
+
+# Days to keep reports (0 keeps them forever) and how often to compact
+REPORT_RETENTION_DAYS = float(os.getenv("REPORT_RETENTION_DAYS", 0))
+REPORT_COMPACT_INTERVAL = float(os.getenv("REPORT_COMPACT_INTERVAL", 3600))
+
+# Decompressed bytes kept in memory for hot reports
+REPORT_CACHE_BYTES = int(os.getenv("REPORT_CACHE_MB", 64)) * 1024 * 1024
+
+INDEX_FILE = "index.json"
+
+
+def _compress(body: bytes) -> Tuple[bytes, str]:
+    if zstandard is not None:
+        return zstandard.ZstdCompressor(level=10).compress(body), ".zst"
+    return gzip.compress(body, compresslevel=9, mtime=0), ".gz"
+
+
+def _decompress(data, suffix: str) -> bytes:
+    if suffix == ".zst":
+        if zstandard is None:
+            raise RuntimeError("Report is zstd compressed, install zstandard to read it")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class _BodyCache:
+    """LRU of decompressed report bodies, bounded by total size"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, digest: str) -> Optional[bytes]:
+        with self.lock:
+            body = self.entries.get(digest)
+            if body is not None:
+                self.entries.move_to_end(digest)
+            return body
+
+    def put(self, digest: str, body: bytes):
+        if len(body) > self.max_bytes:
+            return
+        with self.lock:
+            if digest in self.entries:
+                return
+            self.entries[digest] = body
+            self.size += len(body)
+            while self.size > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def discard(self, digest: str):
+        with self.lock:
+            body = self.entries.pop(digest, None)
+            if body is not None:
+                self.size -= len(body)
+
+
+class ReportStore:
+    """
+    Stores report bodies by SHA-256 of their content, so identical reports
+    share one compressed object, with a JSON index mapping task ids to them.
+    """
+
+    def __init__(self, root: str = REPORT_STORE_DIR, cache_bytes: int = REPORT_CACHE_BYTES):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_path = os.path.join(root, INDEX_FILE)
+        self.lock = threading.Lock()
+        self.cache = _BodyCache(cache_bytes)
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self.index: Dict[str, Dict[str, Any]] = self._load_index()
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def _save_index(self):
+        """Write the index atomically (caller holds the lock)"""
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, separators=(",", ":"))
+        os.replace(tmp_path, self.index_path)
+
+    def _object_path(self, digest: str, suffix: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}{suffix}")
+
+    def _find_object(self, digest: str) -> Optional[str]:
+        for suffix in (".zst", ".gz"):
+            path = self._object_path(digest, suffix)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def _prepare_object(self, body: bytes) -> Tuple[str, Optional[Tuple[bytes, str]]]:
+        """Digest of a body and, unless it is already stored, its compressed form"""
+        digest = hashlib.sha256(body).hexdigest()
+        return digest, (_compress(body) if self._find_object(digest) is None else None)
+
+    def _write_object(self, digest: str, body: bytes, compressed: Optional[Tuple[bytes, str]]):
+        """
+        Make sure the object for a body exists (caller holds the lock, so
+        compaction can't delete it before the index refers to it)
+        """
+        if self._find_object(digest) is not None:
+            return
+        # Compaction removed the object since _prepare_object saw it
+        data, suffix = compressed or _compress(body)
+        path = self._object_path(digest, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _read_object(self, digest: str) -> Optional[bytes]:
+        body = self.cache.get(digest)
+        if body is None:
+            path = self._find_object(digest)
+            if path is None:
+                return None
+            # Decompress straight from the mapped file instead of copying it first
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                body = _decompress(mapped, os.path.splitext(path)[1])
+            self.cache.put(digest, body)
+        return body
+
+    def _referenced(self) -> Set[str]:
+        """Digests of every stored object an index entry uses (caller holds the lock)"""
+        digests = {entry["digest"] for entry in self.index.values()}
+        digests.update(entry["findings_digest"] for entry in self.index.values() if entry.get("findings_digest"))
+        return digests
+
+    def put(self, task_id: str, content: str, findings: Optional[List[Dict[str, Any]]] = None,
+            **metadata) -> Dict[str, Any]:
+        """Store a report, and optionally its structured findings, for a task and return its index entry"""
+        # Compress outside the lock; only the writes and the index update hold it
+        body = content.encode("utf-8")
+        digest, compressed = self._prepare_object(body)
+        objects = [(body, digest, compressed)]
+
+        entry = {
+            "digest": digest,
+            "size": len(body),
+            "created_at": time.time(),
+            **metadata,
+        }
+        if findings is not None:
+            findings_body = json.dumps(findings, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+            findings_digest, findings_compressed = self._prepare_object(findings_body)
+            objects.append((findings_body, findings_digest, findings_compressed))
+            entry["findings_digest"] = findings_digest
+            entry["findings"] = len(findings)
+        with self.lock:
+            for object_body, object_digest, compressed in objects:
+                self._write_object(object_digest, object_body, compressed)
+            self.index[task_id] = entry
+            self._save_index()
+        self.cache.put(digest, body)
+        return dict(entry)
+
+    def entry(self, task_id: str) -> Optional[Dict[str, Any]]:
+        """Index entry of a task's report, or None"""
+        with self.lock:
+            entry = self.index.get(task_id)
+        return dict(entry) if entry else None
+
+    def entries(self) -> Dict[str, Dict[str, Any]]:
+        """All index entries by task id"""
+        with self.lock:
+            return {task_id: dict(entry) for task_id, entry in self.index.items()}
+
+    def latest_for_topic(self, topic: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Task id and index entry of the newest report on a topic (case-insensitive)"""
+        wanted = topic.strip().casefold()
+        with self.lock:
+            matches = [
+                (task_id, dict(entry)) for task_id, entry in self.index.items()
+                if (entry.get("topic") or "").strip().casefold() == wanted
+            ]
+        return max(matches, key=lambda match: match[1]["created_at"], default=None)
+
+    def get_bytes(self, task_id: str) -> Optional[Tuple[bytes, Dict[str, Any]]]:
+        """Decompressed report body and index entry, or None if unknown"""
+        entry = self.entry(task_id)
+        if entry is None:
+            return None
+        body = self._read_object(entry["digest"])
+        return (body, entry) if body is not None else None
+
+    def get(self, task_id: str) -> Optional[str]:
+        """Report text of a task, or None"""
+        found = self.get_bytes(task_id)
+        return found[0].decode("utf-8") if found else None
+
+    def get_findings(self, task_id: str) -> Optional[List[Dict[str, Any]]]:
+        """Structured research findings stored with a task's report, or None"""
+        entry = self.entry(task_id)
+        if entry is None or not entry.get("findings_digest"):
+            return None
+        body = self._read_object(entry["findings_digest"])
+        return json.loads(body) if body is not None else None
+
+    def delete(self, task_id: str):
+        """Forget a task's report (its object goes at the next compaction)"""
+        with self.lock:
+            if self.index.pop(task_id, None) is not None:
+                self._save_index()
+
+    def compact(self, retention_days: float = REPORT_RETENTION_DAYS,
+                on_expired: Optional[Callable[[List[str]], None]] = None) -> Dict[str, int]:
+        """
+        Drop expired index entries and delete objects no entry refers to.
+        on_expired is called with the task ids whose reports expired.
+        """
+        expired: List[str] = []
+        with self.lock:
+            if retention_days > 0:
+                cutoff = time.time() - retention_days * 86400
+                expired = [t for t, e in self.index.items() if e["created_at"] < cutoff]
+                for task_id in expired:
+                    del self.index[task_id]
+                if expired:
+                    self._save_index()
+        if expired and on_expired is not None:
+            on_expired(expired)
+        with self.lock:
+            referenced = self._referenced()
+
+        removed = 0
+        for directory, _, files in os.walk(self.objects_dir):
+            for name in files:
+                digest = name.split(".", 1)[0]
+                path = os.path.join(directory, name)
+                stale_tmp = name.endswith(".tmp") and time.time() - os.path.getmtime(path) > 3600
+                if stale_tmp or (not name.endswith(".tmp") and digest not in referenced):
+                    # Re-check under the lock: a put may have just referenced it
+                    with self.lock:
+                        if not stale_tmp and digest in self._referenced():
+                            continue
+                        os.remove(path)
+                    self.cache.discard(digest)
+                    removed += 1
+        return {"expired": len(expired), "removed_objects": removed}
+
+    def start_compaction(self, interval: float = REPORT_COMPACT_INTERVAL,
+                         on_expired: Optional[Callable[[List[str]], None]] = None) -> threading.Thread:
+        """Run compact() every `interval` seconds on a daemon thread"""
+
+        def loop():
+            while True:
+                time.sleep(interval)
+                try:
+                    result = self.compact(on_expired=on_expired)
+                    if any(result.values()):
+                        print(f"🧹 Report store compacted: {result}")
+                except Exception as e:
+                    print(f"⚠️ Report store compaction failed: {e}")
+
+        thread = threading.Thread(target=loop, name="report-compaction", daemon=True)
+        thread.start()
+        return thread
+
+    def stats(self) -> Dict[str, Any]:
+        """Index and object sizes for status endpoints"""
+        with self.lock:
+            reports = len(self.index)
+            digests = self._referenced()
+            logical = sum(entry["size"] for entry in self.index.values())
+        stored = 0
+        for directory, _, files in os.walk(self.objects_dir):
+            stored += sum(os.path.getsize(os.path.join(directory, f)) for f in files)
+        return {
+            "reports": reports,
+            "objects": len(digests),
+            "logical_bytes": logical,
+            "stored_bytes": stored,
+            "codec": "zstd" if zstandard is not None else "gzip",
+            "cached_bytes": self.cache.size,
+        }
+
+
+def import_report_files(store: ReportStore, tasks: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Move loose report_<task_id>.md files of older runs into the store"""
+    imported = []
+    for task_id, task in tasks.items():
+        path = task.get("report_file")
+        if not path or store.entry(task_id) or not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8") as f:
+            store.put(task_id, f.read(), topic=task.get("topic"))
+        os.remove(path)
+        imported.append(task_id)
+    return imported
+
+
+# Global store, opened on first use
+_store: Optional[ReportStore] = None
+_store_lock = threading.Lock()
+
+def get_report_store() -> ReportStore:
+    """Get the shared report store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ReportStore()
+        return _store
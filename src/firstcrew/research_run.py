@@ -0,0 +1,97 @@
+"""
+Research Run
+Executes one research crew run. Shared by the web app's in-process worker
+pool and by standalone research workers pulling jobs from the job queue
+"""
+
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .crew_factory import get_crew_factory
+from .findings import research_findings
+from .llm_batch import batch_llm_calls
+from .metrics import CREW_KICKOFF_SECONDS, observe_crew_tasks
+from .refresh import apply_refresh, merge_sections, refresh_inputs
+from .task_store import apply_checkpoints, checkpoint_callback
+from .token_budget import TokenBudget, token_budget
+from .tool_guard import tool_guard
+from .tracing import trace_run
+
+
+def budget_enforced(crew) -> bool:
+    """Whether the crew's LLM calls go through ManagedLLM, which applies the token budget"""
+    from .managed_llm import ManagedLLM
+    return any(isinstance(getattr(agent, "llm", None), ManagedLLM) for agent in crew.agents)
+
+
+def execute_research(task_id: str, topic: str, crew_class, checkpoints, budget: TokenBudget,
+                     previous: Optional[Dict[str, Any]] = None,
+                     passages: Optional[List[Dict[str, Any]]] = None,
+                     progress: Callable[[str], None] = print,
+                     batch_api: bool = False) -> Tuple[str, Optional[List[Dict[str, Any]]]]:
+    """
+    Run the crew for a topic and return the report content and the
+    structured research findings (None if the run produced none, e.g. a refresh).
+
+    Args:
+        checkpoints: Where finished crew tasks are checkpointed and restored
+            from (the task store, or the job broker on a research worker)
+        previous: Report to refresh (see refresh.find_previous_report)
+        passages: Prior findings already looked up for the topic
+        progress: Called with a short message as the run advances
+        batch_api: Send the LLM calls through provider batch APIs
+    """
+    # crewai is imported by now (through the crew class), so this can't race it
+    from .tools import news_since
+    # Retrieval pulls in numpy, which the web app shouldn't load at startup
+    from .retrieval import add_prior_findings
+
+    inputs = {
+        'topic': topic,
+        'current_year': str(datetime.now().year)
+    }
+    if previous:
+        inputs.update(refresh_inputs(previous))
+        progress(f"Looking for changes since {inputs['last_run_date']}...")
+    else:
+        progress('Conducting web research...')
+
+    since = previous['created_at'].date() if previous else None
+    with trace_run(task_id, topic=topic), token_budget(budget), news_since(since), \
+            batch_llm_calls(batch_api), tool_guard():
+        # Run a crew cloned from the cached template
+        factory = get_crew_factory(crew_class)
+        crew = factory.create()
+        if budget.limited and not budget_enforced(crew):
+            print(f"⚠️  {task_id}: the token budget is only enforced by the enhanced crew, ignoring it")
+        if previous:
+            apply_refresh(crew, factory.tasks_config)
+        elif add_prior_findings(crew, topic, passages=passages):
+            progress('Building on earlier findings...')
+        crew.task_callback = checkpoint_callback(checkpoints, task_id, crew)
+
+        # Skip tasks finished before an interruption
+        restored = apply_checkpoints(crew, checkpoints.load_outputs(task_id))
+        if restored:
+            progress(f'Resuming after {len(restored)} completed task(s)...')
+
+        kickoff_started = time.perf_counter()
+        kickoff_status = 'failed'
+        try:
+            if crew.tasks:
+                result = crew.kickoff(inputs=inputs)
+            else:
+                # Every task was checkpointed, only the bookkeeping is missing
+                result = restored[-1].raw
+            kickoff_status = 'completed'
+        finally:
+            CREW_KICKOFF_SECONDS.observe(time.perf_counter() - kickoff_started, status=kickoff_status)
+            observe_crew_tasks(crew, topic)
+
+    content = getattr(result, 'raw', str(result))
+    if previous:
+        # The analyst only returned the changed sections
+        content = merge_sections(previous['content'], content)
+    findings = research_findings([*(restored or []), *(task.output for task in crew.tasks if task.output)])
+    return content, findings
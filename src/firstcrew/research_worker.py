@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+"""
+Research Worker
+Runs research crews for jobs from the shared job queue, so crew capacity
+scales separately from the web tier:
+
+    web_app.py (JOB_QUEUE_URL set)  ->  job queue  ->  research_worker x N
+
+Each worker claims jobs under a lease it renews while the crew runs, reports
+progress and crew task checkpoints through the queue and hands back the
+report, and with TRACING_ENABLED=1 the run's trace. A job whose worker dies
+is picked up again after its lease expires and resumes after the last
+checkpointed crew task. Crew, LLM and tool metrics are recorded in the
+worker process: pass --metrics-port to serve them at /metrics for scraping.
+
+Usage:
+    research_worker --queue sqlite:///shared/jobs.db --concurrency 2 --metrics-port 9101
+    JOB_QUEUE_URL=sqlite:///shared/jobs.db research_worker --crew basic
+"""
+
+import argparse
+import os
+import signal
+import socket
+import sys
+import threading
+import warnings
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from firstcrew.crew_factory import load_crew_class
+from firstcrew.job_queue import (
+    COMPLETED, FAILED, JOB_LEASE_SECONDS, JOB_QUEUE_URL, JobBroker, open_broker
+)
+from firstcrew.metrics import start_metrics_server
+from firstcrew.research_run import execute_research
+from firstcrew.token_budget import create_budget
+from firstcrew.tracing import TRACING_ENABLED, load_trace
+
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+
+# Port serving this worker's /metrics (0 = off; each worker on a host needs its own)
+WORKER_METRICS_PORT = int(os.getenv("WORKER_METRICS_PORT", 0))
+
+
+def run_result(job_id: str, budget, **fields: Any) -> Dict[str, Any]:
+    """Result handed back to the web app: the fields, token usage and the run's trace"""
+    result = {**fields, "token_usage": budget.summary()}
+    if TRACING_ENABLED:
+        # The trace was exported to this worker's TRACE_DIR; the web app serves it
+        result["trace"] = load_trace(job_id)
+    return result
+
+
+def run_job(broker: JobBroker, worker_id: str, crew_class, job_id: str, payload: Dict[str, Any]):
+    """Run the crew for one claimed job and report the outcome to the broker"""
+    try:
+        budget = create_budget(payload.get("token_budget"), payload.get("budget_mode"))
+    except (TypeError, ValueError):
+        budget = create_budget()
+
+    previous = payload.get("previous")
+    if previous:
+        previous = {**previous, "created_at": datetime.fromisoformat(previous["created_at"])}
+
+    def progress(message: str):
+        broker.update(job_id, worker_id, progress=message)
+
+    try:
+        content, findings = execute_research(
+            job_id, payload["topic"], crew_class, broker, budget,
+            previous=previous, passages=payload.get("passages"), progress=progress,
+            batch_api=payload.get("batch_api", False)
+        )
+    except Exception as e:
+        broker.finish(job_id, worker_id, FAILED, result=run_result(job_id, budget), error=str(e))
+        print(f"❌ {job_id} failed: {e}")
+        return
+    if broker.finish(job_id, worker_id, COMPLETED,
+                     result=run_result(job_id, budget, content=content, findings=findings)):
+        print(f"✅ {job_id} completed ({payload['topic']})")
+    else:
+        print(f"⚠️  {job_id} finished after its lease expired, result discarded")
+
+
+class ResearchWorker:
+    """Claims jobs on `concurrency` threads and keeps their leases alive"""
+
+    def __init__(self, broker: JobBroker, crew_class, concurrency: int = 2,
+                 poll_interval: float = 1.0, worker_id: Optional[str] = None):
+        self.broker = broker
+        self.crew_class = crew_class
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.stopping = threading.Event()
+        # Set once every work thread has returned; leases are renewed until then
+        self.exited = threading.Event()
+        self.lock = threading.Lock()
+        self.running: Set[str] = set()
+
+    def _heartbeat(self):
+        while not self.exited.wait(JOB_LEASE_SECONDS / 3):
+            self._beat()
+
+    def _beat(self):
+        with self.lock:
+            job_ids: List[str] = list(self.running)
+        try:
+            self.broker.heartbeat(self.worker_id, self.concurrency, job_ids)
+        except Exception as e:
+            print(f"⚠️  Heartbeat failed: {e}")
+
+    def _work(self):
+        while not self.stopping.is_set():
+            try:
+                job = self.broker.claim(self.worker_id)
+            except Exception as e:
+                print(f"⚠️  Could not claim a job: {e}")
+                job = None
+            if job is None:
+                self.stopping.wait(self.poll_interval)
+                continue
+
+            job_id, payload = job
+            print(f"🚀 {job_id}: {payload['topic']}")
+            with self.lock:
+                self.running.add(job_id)
+            try:
+                run_job(self.broker, self.worker_id, self.crew_class, job_id, payload)
+            except Exception as e:
+                print(f"⚠️  Research worker error: {e}")
+            finally:
+                with self.lock:
+                    self.running.discard(job_id)
+
+    def run(self):
+        """Work until stop() is called; jobs already claimed are finished first"""
+        self._beat()
+        threading.Thread(target=self._heartbeat, name="research-heartbeat", daemon=True).start()
+        threads = [
+            threading.Thread(target=self._work, name=f"research-worker-{i + 1}", daemon=True)
+            for i in range(self.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            while thread.is_alive():
+                thread.join(timeout=1.0)
+        self.exited.set()
+
+    def stop(self):
+        self.stopping.set()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Run research crews for jobs from the job queue")
+    parser.add_argument("--queue", default=JOB_QUEUE_URL,
+                        help="job queue URL, e.g. sqlite:///shared/jobs.db (default: JOB_QUEUE_URL)")
+    parser.add_argument("--concurrency", "-c", type=int,
+                        default=int(os.getenv("MAX_CONCURRENT_RESEARCH", 2)),
+                        help="crews run at once by this worker")
+    parser.add_argument("--crew", choices=["enhanced", "basic"], default=os.getenv("RESEARCH_CREW", "enhanced"))
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between claims when idle")
+    parser.add_argument("--metrics-port", type=int, default=WORKER_METRICS_PORT,
+                        help="serve Prometheus metrics on this port (default: WORKER_METRICS_PORT, 0 = off)")
+    args = parser.parse_args(argv)
+
+    if not args.queue:
+        parser.error("set JOB_QUEUE_URL or pass --queue")
+
+    worker = ResearchWorker(open_broker(args.queue), load_crew_class(args.crew),
+                            concurrency=args.concurrency, poll_interval=args.poll_interval)
+
+    def shutdown(signum, frame):
+        if worker.stopping.is_set():
+            sys.exit(1)  # second signal: don't wait for running crews
+        print("🛑 Finishing running jobs (send again to exit now)...")
+        worker.stop()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+
+    if args.metrics_port:
+        start_metrics_server(args.metrics_port)
+        print(f"📈 Metrics on http://0.0.0.0:{args.metrics_port}/metrics")
+    print(f"👷 Research worker {worker.worker_id}: {args.concurrency} slot(s) on {args.queue}")
+    worker.run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,355 @@
+"""
+Local Retrieval over Prior Work
+Chunks and embeds completed reports and the files under knowledge/, and
+hands the passages most relevant to a new topic to the researcher, so
+related topics start from earlier findings instead of from zero.
+
+Embeddings are cached by chunk content hash, so re-indexing a changed file
+or report only embeds the chunks that actually changed. With EMBEDDING_MODEL
+set (any litellm embedding model, e.g. "openai/text-embedding-3-small") that
+model is used; otherwise a local hashed bag-of-words embedding keeps
+retrieval working offline. Each source remembers the model it was embedded
+with and is re-embedded when EMBEDDING_MODEL changes.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from .report_store import REPORT_STORE_DIR
+from .tracing import set_attribute, traced
+
+# numpy is imported where vectors are built, so importing this module stays cheap
+if TYPE_CHECKING:
+    import numpy as np
+
+RETRIEVAL_ENABLED = os.getenv("RETRIEVAL_ENABLED", "1") == "1"
+RETRIEVAL_INDEX_PATH = os.getenv("RETRIEVAL_INDEX_PATH", os.path.join(REPORT_STORE_DIR, "retrieval.db"))
+KNOWLEDGE_DIR = os.getenv("KNOWLEDGE_DIR", "knowledge")
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "")
+
+# Passages handed to the researcher and the similarity they need
+RETRIEVAL_TOP_K = int(os.getenv("RETRIEVAL_TOP_K", 5))
+RETRIEVAL_MIN_SCORE = float(os.getenv("RETRIEVAL_MIN_SCORE", 0.25))
+
+CHUNK_CHARS = 1200
+CHUNK_OVERLAP = 200
+HASH_DIMENSIONS = 1024
+
+# Knowledge files are re-checked for changes at most this often
+KNOWLEDGE_SCAN_INTERVAL = 30.0
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+
+def chunk_text(text: str, chunk_chars: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> List[str]:
+    """Split text into overlapping chunks, breaking at paragraphs where possible"""
+    paragraphs = [p.strip() for p in re.split(r"\n\s*\n", text) if p.strip()]
+    chunks, current = [], ""
+    for paragraph in paragraphs:
+        if current and len(current) + len(paragraph) + 2 > chunk_chars:
+            chunks.append(current)
+            current = current[-overlap:] if overlap else ""
+        current = f"{current}\n\n{paragraph}" if current else paragraph
+        while len(current) > chunk_chars:
+            chunks.append(current[:chunk_chars])
+            current = current[chunk_chars - overlap:]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _content_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def hash_embedding(texts: List[str], dimensions: int = HASH_DIMENSIONS) -> "np.ndarray":
+    """Offline embedding: signed feature hashing of words and word pairs"""
+    import numpy as np
+
+    vectors = np.zeros((len(texts), dimensions), dtype=np.float32)
+    for row, text in enumerate(texts):
+        words = _WORD.findall(text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % dimensions
+            vectors[row, bucket] += 1.0 if digest[4] & 1 else -1.0
+    vectors = np.sign(vectors) * np.log1p(np.abs(vectors))
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-9)
+
+
+def model_embedding(texts: List[str], model: str) -> "np.ndarray":
+    """Embed with a litellm embedding model"""
+    import litellm
+    import numpy as np
+
+    response = litellm.embedding(model=model, input=texts)
+    vectors = np.array([item["embedding"] for item in response.data], dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-9)
+
+
+class RetrievalIndex:
+    """
+    SQLite-backed chunk index. A source is a report ("report:<task_id>") or a
+    knowledge file ("knowledge:<path>"); its chunks are replaced when its
+    content hash changes, and embeddings are shared by identical chunks.
+    """
+
+    def __init__(self, path: str = RETRIEVAL_INDEX_PATH, model: str = EMBEDDING_MODEL):
+        self.path = path
+        self.model = model or f"hash-{HASH_DIMENSIONS}"
+        self.lock = threading.Lock()
+        self._matrix: Optional[Tuple["np.ndarray", List[Tuple[str, str, str]]]] = None
+        self._knowledge_scanned = 0.0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS sources (
+                    source TEXT PRIMARY KEY,
+                    content_hash TEXT NOT NULL,
+                    title TEXT,
+                    updated_at REAL NOT NULL,
+                    model TEXT
+                )"""
+            )
+            # Indexes created before sources recorded their embedding model
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(sources)")}
+            if "model" not in columns:
+                self.conn.execute("ALTER TABLE sources ADD COLUMN model TEXT")
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS chunks (
+                    source TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    text TEXT NOT NULL,
+                    PRIMARY KEY (source, position)
+                )"""
+            )
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS embeddings (
+                    content_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    PRIMARY KEY (content_hash, model)
+                )"""
+            )
+
+    def _embed(self, texts: List[str]) -> "np.ndarray":
+        if self.model.startswith("hash-"):
+            return hash_embedding(texts)
+        return model_embedding(texts, self.model)
+
+    def index_source(self, source: str, text: str, title: str = "") -> bool:
+        """(Re-)index a source if its content or the embedding model changed. Returns True if it did."""
+        import numpy as np
+
+        source_hash = _content_hash(text)
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT content_hash, model FROM sources WHERE source = ?", (source,)
+            ).fetchone()
+        if row and row == (source_hash, self.model):
+            return False
+
+        chunks = chunk_text(text)
+        hashes = [_content_hash(chunk) for chunk in chunks]
+        with self.lock:
+            cached = {
+                h for (h,) in self.conn.execute(
+                    f"SELECT content_hash FROM embeddings WHERE model = ? AND content_hash IN "
+                    f"({','.join('?' * len(hashes))})",
+                    (self.model, *hashes),
+                )
+            } if hashes else set()
+
+        # Only chunks never seen before are embedded (each distinct one once)
+        missing = list({h: chunk for h, chunk in zip(hashes, chunks) if h not in cached}.items())
+        vectors = self._embed([chunk for _, chunk in missing]) if missing else []
+
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (content_hash, model, vector) VALUES (?, ?, ?)",
+                [(h, self.model, vector.astype(np.float32).tobytes()) for (h, _), vector in zip(missing, vectors)],
+            )
+            self.conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self.conn.executemany(
+                "INSERT INTO chunks (source, position, content_hash, text) VALUES (?, ?, ?, ?)",
+                [(source, i, h, chunk) for i, (h, chunk) in enumerate(zip(hashes, chunks))],
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (source, content_hash, title, updated_at, model) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (source, source_hash, title, time.time(), self.model),
+            )
+            self._matrix = None
+        return True
+
+    def remove_source(self, source: str):
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM chunks WHERE source = ?", (source,))
+            self.conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+            self._matrix = None
+
+    def sources(self, prefix: str = "", current: bool = False) -> List[str]:
+        """Indexed sources starting with prefix (only those embedded with this index's model if current)"""
+        query = "SELECT source FROM sources WHERE source LIKE ?"
+        params: Tuple[str, ...] = (f"{prefix}%",)
+        if current:
+            query += " AND model = ?"
+            params += (self.model,)
+        with self.lock:
+            return [s for (s,) in self.conn.execute(query, params)]
+
+    def sync_knowledge(self, directory: str = KNOWLEDGE_DIR, force: bool = False) -> int:
+        """Index new or changed text files under knowledge/ and drop deleted ones"""
+        now = time.time()
+        if not force and now - self._knowledge_scanned < KNOWLEDGE_SCAN_INTERVAL:
+            return 0
+        self._knowledge_scanned = now
+
+        seen, changed = set(), 0
+        for root, _, files in os.walk(directory):
+            for name in sorted(files):
+                if not name.endswith((".txt", ".md")):
+                    continue
+                path = os.path.join(root, name)
+                source = f"knowledge:{os.path.relpath(path, directory)}"
+                seen.add(source)
+                with open(path, "r", encoding="utf-8", errors="replace") as f:
+                    changed += self.index_source(source, f.read(), title=name)
+        for source in set(self.sources("knowledge:")) - seen:
+            self.remove_source(source)
+            changed += 1
+        return changed
+
+    def _load_matrix(self) -> Tuple["np.ndarray", List[Tuple[str, str, str]]]:
+        """All chunk vectors of the current model, cached until the index changes"""
+        import numpy as np
+
+        with self.lock:
+            if self._matrix is None:
+                rows = self.conn.execute(
+                    """SELECT c.source, s.title, c.text, e.vector FROM chunks c
+                       JOIN sources s ON s.source = c.source
+                       JOIN embeddings e ON e.content_hash = c.content_hash AND e.model = ?""",
+                    (self.model,),
+                ).fetchall()
+                if rows:
+                    matrix = np.stack([np.frombuffer(row[3], dtype=np.float32) for row in rows])
+                else:
+                    matrix = np.zeros((0, 1), dtype=np.float32)
+                self._matrix = (matrix, [(row[0], row[1], row[2]) for row in rows])
+            return self._matrix
+
+    def search(self, query: str, top_k: int = RETRIEVAL_TOP_K,
+               min_score: float = RETRIEVAL_MIN_SCORE) -> List[Dict[str, Any]]:
+        """Most similar chunks to the query, best first"""
+        import numpy as np
+
+        matrix, meta = self._load_matrix()
+        if not meta:
+            return []
+        scores = matrix @ self._embed([query])[0]
+        results, seen = [], set()
+        for i in np.argsort(-scores):
+            if scores[i] < min_score or len(results) >= top_k:
+                break
+            source, title, text = meta[i]
+            if text in seen:
+                continue  # the same chunk in several reports
+            seen.add(text)
+            results.append({"source": source, "title": title, "text": text, "score": round(float(scores[i]), 4)})
+        return results
+
+
+def index_report(task_id: str, topic: str, content: str):
+    """Index a completed report (no-op when retrieval is disabled)"""
+    if RETRIEVAL_ENABLED:
+        get_retrieval_index().index_source(f"report:{task_id}", content, title=topic)
+
+
+def sync_reports(index: "RetrievalIndex", store) -> int:
+    """
+    Index stored reports the retrieval index is missing or embedded with
+    another model, and drop removed ones
+    """
+    entries = store.entries()
+    indexed = set(index.sources("report:"))
+    current = set(index.sources("report:", current=True))
+    changed = 0
+    for source in indexed - {f"report:{task_id}" for task_id in entries}:
+        index.remove_source(source)
+        changed += 1
+    for task_id, entry in entries.items():
+        if f"report:{task_id}" not in current:
+            content = store.get(task_id)
+            if content is not None:
+                changed += index.index_source(f"report:{task_id}", content, title=entry.get("topic") or "")
+    return changed
+
+
+@traced("retrieval")
+def prior_findings(topic: str) -> List[Dict[str, Any]]:
+    """Passages from earlier reports and knowledge files relevant to a topic"""
+    if not RETRIEVAL_ENABLED:
+        return []
+    index = get_retrieval_index()
+    index.sync_knowledge()
+    passages = index.search(topic)
+    set_attribute("retrieval.passages", len(passages))
+    return passages
+
+
+def add_prior_findings(crew, topic: str, task_name: str = "research_task",
+                       passages: Optional[List[Dict[str, Any]]] = None) -> int:
+    """
+    Append the passages relevant to `topic` to the description of the
+    research task of a cloned crew. Returns the number of passages added.
+
+    `passages` were looked up elsewhere (e.g. by the web app for a job run
+    on a research worker); by default they come from prior_findings().
+    """
+    if passages is None:
+        passages = prior_findings(topic)
+    task = next((t for t in crew.tasks if t.name == task_name), None)
+    if not passages or task is None:
+        return 0
+
+    # Braces would be taken for input placeholders when the task is interpolated
+    def literal(value: str) -> str:
+        return value.replace("{", "(").replace("}", ")")
+
+    blocks = []
+    for passage in passages:
+        origin = passage["title"] or passage["source"]
+        blocks.append(f"[{literal(origin)}]\n{literal(passage['text'])}")
+    task.description = (
+        f"{task.description.rstrip()}\n\n"
+        "Findings from earlier reports and notes that may be relevant (check whether they are "
+        "still current and only search for what they don't cover):\n\n" + "\n\n".join(blocks)
+    )
+    return len(passages)
+
+
+# Global index, opened on first use
+_index: Optional[RetrievalIndex] = None
+_index_lock = threading.Lock()
+
+def get_retrieval_index() -> RetrievalIndex:
+    """Get the shared retrieval index"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = RetrievalIndex()
+        return _index
@@ -0,0 +1,161 @@
+"""
+Persistent Task Store
+Keeps research task records and per-task crew outputs in SQLite so runs
+interrupted by a crash or restart can resume from the last completed task
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+TASK_STORE_PATH = os.getenv("TASK_STORE_PATH", "research_tasks.db")
+
+# Statuses of runs that were cut short and should be resumed on startup
+UNFINISHED_STATUSES = ("queued", "running")
+
+
+class TaskStore:
+    """
+    SQLite store for research task records and crew task checkpoints.
+
+    A checkpoint is written each time a crew task finishes, keyed by the
+    research task id and the crew task name (e.g. "research_task").
+    """
+
+    def __init__(self, path: str = TASK_STORE_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS tasks (
+                    task_id TEXT PRIMARY KEY,
+                    status TEXT NOT NULL,
+                    record TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                )"""
+            )
+            self.conn.execute(
+                """CREATE TABLE IF NOT EXISTS task_outputs (
+                    task_id TEXT NOT NULL,
+                    task_name TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    output TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (task_id, task_name)
+                )"""
+            )
+
+    def save_task(self, task_id: str, record: Dict[str, Any]):
+        """Insert or replace a task record"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO tasks (task_id, status, record, updated_at) VALUES (?, ?, ?, ?)",
+                (task_id, record.get("status", "queued"), json.dumps(record, default=str), time.time()),
+            )
+
+    def load_tasks(self) -> Dict[str, Dict[str, Any]]:
+        """Load every task record, oldest first"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT task_id, record FROM tasks ORDER BY rowid"
+            ).fetchall()
+        return {task_id: json.loads(record) for task_id, record in rows}
+
+    def save_output(self, task_id: str, task_name: str, position: int, output: Dict[str, Any]):
+        """Checkpoint the output of a finished crew task"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO task_outputs (task_id, task_name, position, output, created_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (task_id, task_name, position, json.dumps(output, default=str), time.time()),
+            )
+
+    def load_outputs(self, task_id: str) -> Dict[str, Dict[str, Any]]:
+        """Get the checkpointed crew task outputs of a run by task name"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT task_name, output FROM task_outputs WHERE task_id = ? ORDER BY position",
+                (task_id,),
+            ).fetchall()
+        return {task_name: json.loads(output) for task_name, output in rows}
+
+    def delete_outputs(self, task_id: str):
+        """Drop the checkpoints of a run once it has finished"""
+        with self.lock, self.conn:
+            self.conn.execute("DELETE FROM task_outputs WHERE task_id = ?", (task_id,))
+
+
+def checkpoint_callback(store: TaskStore, task_id: str, crew):
+    """Build a crew task_callback that checkpoints every finished task"""
+    positions = {task.name: i for i, task in enumerate(crew.tasks)}
+
+    def on_task_done(output):
+        name = output.name or f"task_{len(positions)}"
+        store.save_output(task_id, name, positions.get(name, len(positions)), {
+            "name": name,
+            "description": output.description,
+            "agent": output.agent,
+            "raw": output.raw,
+            "json_dict": output.json_dict,
+        })
+        print(f"💾 Checkpointed {name} for {task_id}")
+
+    return on_task_done
+
+
+def apply_checkpoints(crew, checkpoints: Dict[str, Dict[str, Any]]) -> Optional[List[Any]]:
+    """
+    Skip the leading crew tasks that already have a checkpoint.
+
+    Restores their outputs, removes them from the crew and hands the last
+    restored output to the next task as context, which is what the
+    sequential process would have passed. Returns the restored outputs (or
+    None if nothing could be skipped).
+    """
+    from crewai.tasks.task_output import TaskOutput
+    from crewai.utilities.constants import NOT_SPECIFIED
+
+    restored = []
+    for task in crew.tasks:
+        checkpoint = checkpoints.get(task.name)
+        if checkpoint is None:
+            break
+        task.output = TaskOutput(
+            name=checkpoint["name"],
+            description=checkpoint["description"],
+            agent=checkpoint["agent"],
+            raw=checkpoint["raw"],
+            json_dict=checkpoint.get("json_dict"),
+        )
+        restored.append(task)
+
+    if not restored:
+        return None
+
+    remaining = crew.tasks[len(restored):]
+    if remaining and remaining[0].context is NOT_SPECIFIED:
+        remaining[0].context = [restored[-1]]
+    crew.tasks = remaining
+    return [task.output for task in restored]
+
+
+# Global store, opened on first use
+_store: Optional[TaskStore] = None
+_store_lock = threading.Lock()
+
+def get_task_store() -> TaskStore:
+    """Get the shared task store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = TaskStore()
+        return _store
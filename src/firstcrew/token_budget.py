@@ -0,0 +1,182 @@
+"""
+Per-Run Token Budget and Prompt-Size Controller
+Tracks tokens consumed across all tasks of a crew run, compresses prompts
+once a threshold is reached and aborts or downgrades when the budget is spent
+"""
+
+import contextvars
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .metrics import RUN_TOKENS, TOKEN_BUDGET_ACTIONS
+
+# Defaults for runs that don't specify their own budget (0 = unlimited)
+DEFAULT_RUN_TOKEN_BUDGET = int(os.getenv("RUN_TOKEN_BUDGET", 0))
+DEFAULT_BUDGET_MODE = os.getenv("TOKEN_BUDGET_MODE", "downgrade")
+DEFAULT_DOWNGRADE_MODEL = os.getenv("TOKEN_BUDGET_DOWNGRADE_MODEL", "groq/llama-3.1-8b-instant")
+
+_current_budget: contextvars.ContextVar[Optional["TokenBudget"]] = contextvars.ContextVar(
+    "firstcrew_token_budget", default=None
+)
+
+
+class TokenBudgetExceeded(Exception):
+    """Raised when a run has used up its token budget in abort mode"""
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token)"""
+    return len(text) // 4 + 1
+
+
+def _shorten(text: str, max_chars: int) -> str:
+    """Keep the head and tail of a long text and drop the middle"""
+    if len(text) <= max_chars:
+        return text
+    head = max_chars * 2 // 3
+    tail = max_chars - head
+    trimmed = len(text) - head - tail
+    return f"{text[:head]}\n[... {trimmed} characters trimmed to fit the token budget ...]\n{text[-tail:]}"
+
+
+class TokenBudget:
+    """
+    Token budget for one crew run.
+
+    Args:
+        max_tokens: Total prompt + completion tokens allowed for the run
+            (0 only tracks usage)
+        compress_at: Fraction of the budget after which prompts are compressed
+        mode: "abort" to stop the run or "downgrade" to continue on a cheaper
+            model once the budget is spent
+        downgrade_model: Model used after downgrading
+        max_message_chars: Size each earlier message is cut to when compressing
+    """
+
+    def __init__(self, max_tokens: int, compress_at: float = 0.6, mode: str = "downgrade",
+                 downgrade_model: str = DEFAULT_DOWNGRADE_MODEL, max_message_chars: int = 2000):
+        if mode not in ("abort", "downgrade"):
+            raise ValueError(f"Unknown token budget mode: {mode}")
+        self.max_tokens = max_tokens
+        self.compress_at = compress_at
+        self.mode = mode
+        self.downgrade_model = downgrade_model
+        self.max_message_chars = max_message_chars
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_prompt_tokens = 0
+        self.calls = 0
+        self.compressed_calls = 0
+        self.downgraded = False
+        self.aborted = False
+        self._downgrade_config: Optional[Dict[str, Any]] = None
+        self.lock = threading.Lock()
+
+    @property
+    def used(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @property
+    def limited(self) -> bool:
+        return self.max_tokens > 0
+
+    @property
+    def exhausted(self) -> bool:
+        return self.limited and self.used >= self.max_tokens
+
+    def record(self, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0):
+        """Account for a finished LLM call (cached prompt tokens still count as used)"""
+        with self.lock:
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.cached_prompt_tokens += cached_tokens
+            self.calls += 1
+
+    def check(self):
+        """Raise if the budget is spent and the run should stop"""
+        if not self.exhausted:
+            return
+        # Downgraded runs may overshoot, but never beyond twice the budget
+        if self.mode == "abort" or self.used >= self.max_tokens * 2:
+            if not self.aborted:
+                self.aborted = True
+                TOKEN_BUDGET_ACTIONS.inc(action="abort")
+            raise TokenBudgetExceeded(
+                f"Token budget exceeded: {self.used} of {self.max_tokens} tokens used"
+            )
+
+    def downgrade_config(self, resolve: Callable[[str], Optional[Dict[str, Any]]]) -> Optional[Dict[str, Any]]:
+        """
+        LLM config every agent of the run should switch to once the budget is
+        spent in downgrade mode. Resolved once per run via resolve(model).
+        """
+        if self.mode != "downgrade" or not self.exhausted:
+            return None
+        with self.lock:
+            if not self.downgraded:
+                self.downgraded = True
+                self._downgrade_config = resolve(self.downgrade_model)
+                TOKEN_BUDGET_ACTIONS.inc(action="downgrade")
+        return self._downgrade_config
+
+    def prepare_messages(self, messages: Any) -> Any:
+        """Compress the prompt once the compression threshold is reached"""
+        if not self.limited or isinstance(messages, str):
+            return messages
+        if self.used < self.max_tokens * self.compress_at:
+            return messages
+
+        compressed: List[Dict[str, Any]] = []
+        last = len(messages) - 1
+        for i, message in enumerate(messages):
+            content = message.get("content")
+            if (i == 0 and message.get("role") == "system") or not isinstance(content, str):
+                compressed.append(message)
+                continue
+            # The newest message carries the current instruction, so it keeps more room
+            limit = self.max_message_chars * (3 if i == last else 1)
+            compressed.append({**message, "content": _shorten(content, limit)})
+
+        if compressed != messages:
+            self.compressed_calls += 1
+            TOKEN_BUDGET_ACTIONS.inc(action="compress")
+        return compressed
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "max_tokens": self.max_tokens,
+            "used_tokens": self.used,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_prompt_tokens": self.cached_prompt_tokens,
+            "llm_calls": self.calls,
+            "compressed_calls": self.compressed_calls,
+            "downgraded": self.downgraded,
+            "aborted": self.aborted,
+            "mode": self.mode,
+        }
+
+
+def create_budget(max_tokens: Optional[int] = None, mode: Optional[str] = None) -> TokenBudget:
+    """Build a budget from request values, falling back to the environment defaults"""
+    max_tokens = DEFAULT_RUN_TOKEN_BUDGET if max_tokens is None else int(max_tokens)
+    return TokenBudget(max(0, max_tokens), mode=mode or DEFAULT_BUDGET_MODE)
+
+
+def current_budget() -> Optional[TokenBudget]:
+    """Get the budget of the run executing in this context"""
+    return _current_budget.get()
+
+
+@contextmanager
+def token_budget(budget: Optional[TokenBudget]) -> Iterator[Optional[TokenBudget]]:
+    """Apply a budget to every managed LLM call made inside the block"""
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+        if budget is not None:
+            RUN_TOKENS.observe(budget.used)
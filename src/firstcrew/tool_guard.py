@@ -0,0 +1,133 @@
+"""
+Tool Call Guard
+Remembers the search tool calls of a research run. A repeated query is
+answered from the run's own results instead of SerpAPI, and once the agent
+keeps re-issuing the same or a trivially reworded query it gets everything
+collected so far with the instruction to write its final answer, instead of
+looping until max_iter.
+
+A rewording differs only in case, word order, plurals and filler words
+("latest", "news", ...); queries with any other word in difference are
+different questions and always run.
+"""
+
+import functools
+import os
+import re
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Set, Tuple
+
+from .metrics import TOOL_GUARD_ACTIONS
+from .tracing import set_attribute
+
+TOOL_GUARD_ENABLED = os.getenv("TOOL_GUARD", "1") == "1"
+
+# Repeats of one query (exact or reworded) answered from memory before the agent is told to stop searching
+TOOL_GUARD_MAX_REPEATS = int(os.getenv("TOOL_GUARD_MAX_REPEATS", 2))
+
+# Characters of each earlier result included in the stop message
+STOP_RESULT_CHARS = 1500
+
+# Filler words that don't change what a search query is about
+_STOPWORDS = {
+    "a", "an", "and", "about", "for", "in", "of", "on", "the", "to", "with",
+    "latest", "recent", "new", "news", "current", "development", "developments",
+    "trend", "trends", "update", "updates",
+}
+
+_current_guard: ContextVar[Optional["ToolGuard"]] = ContextVar("firstcrew_tool_guard", default=None)
+
+
+def query_terms(query: str) -> Set[str]:
+    """Lowercase words of a query without stopwords or a plural s"""
+    words = re.findall(r"[a-z0-9]+", query.lower())
+    words = [word for word in words if word not in _STOPWORDS] or words
+    return {word[:-1] if len(word) > 3 and word.endswith("s") else word for word in words}
+
+
+def query_key(query: str) -> str:
+    """Queries with the same key ask the same question"""
+    return " ".join(sorted(query_terms(query)))
+
+
+class ToolGuard:
+    """Search calls and results of one research run"""
+
+    def __init__(self, max_repeats: int = TOOL_GUARD_MAX_REPEATS):
+        self.max_repeats = max_repeats
+        self.results: Dict[Tuple[str, str], str] = {}
+        self.queries: Dict[Tuple[str, str], Set[str]] = defaultdict(set)  # exact queries run per key
+        self.repeats: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.lock = threading.Lock()
+
+    def lookup(self, tool: str, query: str) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Action and answer for a call: (None, None) runs the tool,
+        ("memoized"/"similar", answer) repeats the earlier result of the
+        same or a reworded query and ("stopped", answer) tells the agent
+        to finish once that query was repeated more than max_repeats times.
+        """
+        key = (tool, query_key(query))
+        with self.lock:
+            earlier = self.results.get(key)
+            if earlier is None:
+                return None, None
+            action = "memoized" if " ".join(query.lower().split()) in self.queries[key] else "similar"
+
+            self.repeats[key] += 1
+            if self.repeats[key] > self.max_repeats:
+                collected = list(self.results.values())
+                action = "stopped"
+
+        TOOL_GUARD_ACTIONS.inc(tool=tool, action=action)
+        set_attribute("tool.guard", action)
+        if action == "stopped":
+            return action, (
+                "You have already searched for this. Stop searching: these are all the results "
+                "collected so far, use them to write your Final Answer now.\n\n"
+                + "\n\n".join(result[:STOP_RESULT_CHARS] for result in collected)
+            )
+        return action, (
+            "You already ran this search (or one very much like it); its results are repeated below. "
+            "Search for a different aspect or give your Final Answer.\n\n" + earlier
+        )
+
+    def record(self, tool: str, query: str, result: str):
+        key = (tool, query_key(query))
+        with self.lock:
+            self.queries[key].add(" ".join(query.lower().split()))
+            self.results[key] = result
+
+
+@contextmanager
+def tool_guard(enabled: bool = TOOL_GUARD_ENABLED) -> Iterator[Optional[ToolGuard]]:
+    """Guard the search tool calls made inside the block (one research run)"""
+    guard = ToolGuard() if enabled else None
+    token = _current_guard.set(guard)
+    try:
+        yield guard
+    finally:
+        _current_guard.reset(token)
+
+
+def guarded(tool: str):
+    """Decorator for a search tool's _run(query) that consults the run's guard"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(self, query: str, *args, **kwargs):
+            guard = _current_guard.get()
+            if guard is None:
+                return fn(self, query, *args, **kwargs)
+            _, answer = guard.lookup(tool, query)
+            if answer is not None:
+                return answer
+            result = fn(self, query, *args, **kwargs)
+            # Errors are worth retrying, so only real results are remembered
+            if not result.startswith(("Error", "Unexpected error")):
+                guard.record(tool, query, result)
+            return result
+        return wrapper
+    return decorator
@@ -1,4 +1,4 @@
 from .custom_tool import MyCustomTool
-from .search_tool import SearchTool, NewsSearchTool
+from .search_tool import SearchTool, NewsSearchTool, news_since
 
-__all__ = ['MyCustomTool', 'SearchTool', 'NewsSearchTool']
\ No newline at end of file
+__all__ = ['MyCustomTool', 'SearchTool', 'NewsSearchTool', 'news_since']
@@ -4,6 +4,83 @@ from pydantic import BaseModel, Field
 import requests
 import os
 import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import date
+from typing import Optional
+
+from ..metrics import SERP_CACHE_REQUESTS, SERP_REQUEST_SECONDS
+from ..tool_guard import guarded
+from ..tracing import set_attribute, traced
+
+# SERP API endpoint (overridable for local fakes)
+SERP_API_URL = os.getenv("SERP_API_URL", "https://serpapi.com/search")
+
+# Seconds identical queries are answered from memory. Off by default: the
+# cache is shared by every run and crew in the process, so enabling it means
+# runs may see results up to this old
+SERP_CACHE_TTL = float(os.getenv("SERP_CACHE_TTL", 0))
+SERP_CACHE_SIZE = int(os.getenv("SERP_CACHE_SIZE", 256))
+
+_serp_cache: "OrderedDict[str, tuple]" = OrderedDict()
+_serp_cache_lock = threading.Lock()
+
+# Oldest publication date for news results of the current run (refresh mode)
+_news_since: ContextVar[Optional[date]] = ContextVar("news_since", default=None)
+
+
+@contextmanager
+def news_since(since: Optional[date]):
+    """Restrict News Search to articles published on or after `since` within the block"""
+    token = _news_since.set(since)
+    try:
+        yield
+    finally:
+        _news_since.reset(token)
+
+
+def serp_search(params: dict, engine: str) -> dict:
+    """
+    Call SERP API with latency metrics and, when SERP_CACHE_TTL is set,
+    a small TTL cache with hit/miss metrics.
+
+    The cache key excludes the API key so rotating keys keeps cached results.
+    """
+    cache_key = json.dumps(
+        {k: v for k, v in params.items() if k != "api_key"}, sort_keys=True
+    )
+    now = time.time()
+
+    if SERP_CACHE_TTL > 0:
+        with _serp_cache_lock:
+            cached = _serp_cache.get(cache_key)
+            if cached and now - cached[0] < SERP_CACHE_TTL:
+                _serp_cache.move_to_end(cache_key)
+                SERP_CACHE_REQUESTS.inc(engine=engine, result="hit")
+                set_attribute("serp.cache_hit", True)
+                return cached[1]
+        SERP_CACHE_REQUESTS.inc(engine=engine, result="miss")
+        set_attribute("serp.cache_hit", False)
+
+    started = time.perf_counter()
+    try:
+        response = requests.get(SERP_API_URL, params=params)
+        response.raise_for_status()
+        data = response.json()
+    finally:
+        SERP_REQUEST_SECONDS.observe(time.perf_counter() - started, engine=engine)
+
+    if SERP_CACHE_TTL > 0:
+        with _serp_cache_lock:
+            _serp_cache[cache_key] = (now, data)
+            _serp_cache.move_to_end(cache_key)
+            while len(_serp_cache) > SERP_CACHE_SIZE:
+                _serp_cache.popitem(last=False)
+
+    return data
 
 
 class SearchToolInput(BaseModel):
@@ -20,6 +97,8 @@ class SearchTool(BaseTool):
     )
     args_schema: Type[BaseModel] = SearchToolInput
 
+    @traced("tool:Web Search")
+    @guarded("Web Search")
     def _run(self, query: str) -> str:
         """
         Perform a web search using SERP API.
@@ -29,9 +108,6 @@ class SearchTool(BaseTool):
             if not serp_api_key:
                 return "Error: SERP_API_KEY not found in environment variables."
             
-            # SERP API endpoint
-            url = "https://serpapi.com/search"
-            
             params = {
                 "q": query,
                 "api_key": serp_api_key,
@@ -41,10 +117,7 @@ class SearchTool(BaseTool):
                 "gl": "us"   # Country
             }
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = serp_search(params, engine="web")
             
             # Extract organic results
             results = []
@@ -89,6 +162,8 @@ class NewsSearchTool(BaseTool):
     )
     args_schema: Type[BaseModel] = SearchToolInput
 
+    @traced("tool:News Search")
+    @guarded("News Search")
     def _run(self, query: str) -> str:
         """
         Perform a news search using SERP API.
@@ -98,9 +173,6 @@ class NewsSearchTool(BaseTool):
             if not serp_api_key:
                 return "Error: SERP_API_KEY not found in environment variables."
             
-            # SERP API endpoint for news
-            url = "https://serpapi.com/search"
-            
             params = {
                 "q": query,
                 "api_key": serp_api_key,
@@ -110,11 +182,13 @@ class NewsSearchTool(BaseTool):
                 "hl": "en",
                 "gl": "us"
             }
+            since = _news_since.get()
+            if since is not None:
+                # Google custom date range, e.g. only news since the last report
+                params["tbs"] = f"cdr:1,cd_min:{since.strftime('%m/%d/%Y')}"
+                set_attribute("serp.news_since", since.isoformat())
             
-            response = requests.get(url, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
+            data = serp_search(params, engine="news")
             
             # Extract news results
             results = []
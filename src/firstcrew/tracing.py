@@ -0,0 +1,319 @@
+"""
+Opt-in Per-Run Tracing
+Records spans for crew tasks, tool calls and LLM calls and exports each run
+as an OpenTelemetry (OTLP/JSON) file that can be loaded back for profiling
+"""
+
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+TRACING_ENABLED = os.getenv("TRACING_ENABLED", "0") == "1"
+TRACE_DIR = os.getenv("TRACE_DIR", "traces")
+
+_current_trace: contextvars.ContextVar[Optional["Trace"]] = contextvars.ContextVar(
+    "firstcrew_trace", default=None
+)
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar(
+    "firstcrew_span", default=None
+)
+
+
+def _attribute_value(value: Any) -> Dict[str, Any]:
+    """Encode a value as an OTLP AnyValue"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _decode_value(value: Dict[str, Any]) -> Any:
+    """Decode an OTLP AnyValue back into a Python value"""
+    if "intValue" in value:
+        return int(value["intValue"])
+    return next(iter(value.values()), None)
+
+
+class Span:
+    """A timed operation within a trace"""
+
+    def __init__(self, trace: "Trace", name: str, parent: Optional["Span"] = None,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace = trace
+        self.name = name
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def end(self, error: Optional[str] = None):
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.error = error
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": "SPAN_KIND_INTERNAL",
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns or time.time_ns()),
+            "attributes": [
+                {"key": key, "value": _attribute_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": "STATUS_CODE_ERROR", "message": self.error}
+                if self.error else {"code": "STATUS_CODE_OK"}
+            ),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+class Trace:
+    """All spans recorded for one research run"""
+
+    def __init__(self, run_id: str):
+        self.run_id = run_id
+        self.trace_id = uuid.uuid4().hex
+        self.spans: List[Span] = []
+        self.lock = threading.Lock()
+        self.open_task_spans: Dict[str, tuple] = {}
+
+    def start_span(self, name: str, parent: Optional[Span],
+                   attributes: Optional[Dict[str, Any]] = None) -> Span:
+        span = Span(self, name, parent, attributes)
+        with self.lock:
+            self.spans.append(span)
+        return span
+
+    def to_otlp(self) -> Dict[str, Any]:
+        with self.lock:
+            spans = [span.to_otlp() for span in self.spans]
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": "firstcrew"}},
+                    {"key": "firstcrew.run_id", "value": {"stringValue": self.run_id}},
+                ]},
+                "scopeSpans": [{
+                    "scope": {"name": "firstcrew.tracing"},
+                    "spans": spans,
+                }],
+            }]
+        }
+
+
+def _trace_path(run_id: str) -> str:
+    safe_id = "".join(c for c in run_id if c.isalnum() or c in "-_")
+    return os.path.join(TRACE_DIR, f"{safe_id}.json")
+
+
+def save_trace(run_id: str, otlp: Dict[str, Any]) -> str:
+    """Write an OTLP/JSON trace to TRACE_DIR (e.g. one sent back by a research worker)"""
+    os.makedirs(TRACE_DIR, exist_ok=True)
+    path = _trace_path(run_id)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(otlp, f)
+    os.replace(tmp_path, path)
+    return path
+
+
+def export_trace(trace: Trace) -> str:
+    """Write a trace to TRACE_DIR as OTLP/JSON and return the file path"""
+    return save_trace(trace.run_id, trace.to_otlp())
+
+
+def load_trace(run_id: str) -> Optional[Dict[str, Any]]:
+    """Load an exported trace, or None if the run was not traced"""
+    path = _trace_path(run_id)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_timeline(otlp: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Flatten an OTLP trace into a start-ordered timeline with nesting depth"""
+    spans = [
+        span
+        for resource in otlp.get("resourceSpans", [])
+        for scope in resource.get("scopeSpans", [])
+        for span in scope.get("spans", [])
+    ]
+    if not spans:
+        return []
+
+    by_id = {span["spanId"]: span for span in spans}
+    trace_start = min(int(span["startTimeUnixNano"]) for span in spans)
+
+    def depth(span):
+        level = 0
+        while span.get("parentSpanId") in by_id:
+            span = by_id[span["parentSpanId"]]
+            level += 1
+        return level
+
+    timeline = []
+    for span in sorted(spans, key=lambda s: int(s["startTimeUnixNano"])):
+        start = int(span["startTimeUnixNano"])
+        end = int(span["endTimeUnixNano"])
+        timeline.append({
+            "name": span["name"],
+            "depth": depth(span),
+            "start_ms": round((start - trace_start) / 1e6, 3),
+            "duration_ms": round((end - start) / 1e6, 3),
+            "status": span["status"]["code"],
+            "attributes": {
+                attr["key"]: _decode_value(attr["value"])
+                for attr in span.get("attributes", [])
+            },
+        })
+    return timeline
+
+
+@contextmanager
+def trace_run(run_id: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """
+    Trace everything executed inside the block as one run.
+
+    Does nothing unless TRACING_ENABLED=1. The trace is exported when the
+    block exits, whether it succeeded or raised.
+    """
+    if not TRACING_ENABLED:
+        yield None
+        return
+
+    install_crew_hooks()
+    trace = Trace(run_id)
+    root = trace.start_span("research_run", None, attributes)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(root)
+    try:
+        yield root
+    except Exception as e:
+        root.end(error=str(e))
+        raise
+    finally:
+        root.end()
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        try:
+            export_trace(trace)
+        except OSError as e:
+            print(f"⚠️  Could not export trace for {run_id}: {e}")
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Optional[Span]]:
+    """Record a child span of the current span (no-op outside a traced run)"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield None
+        return
+
+    child = trace.start_span(name, _current_span.get(), attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except Exception as e:
+        child.end(error=str(e))
+        raise
+    finally:
+        child.end()
+        _current_span.reset(token)
+
+
+def set_attribute(key: str, value: Any):
+    """Set an attribute on the current span, if any"""
+    current = _current_span.get()
+    if current is not None:
+        current.set_attribute(key, value)
+
+
+def traced(name: str):
+    """Decorator recording each call as a span, with scalar kwargs as attributes"""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_trace.get() is None:
+                return fn(*args, **kwargs)
+            attributes = {
+                key: value for key, value in kwargs.items()
+                if isinstance(value, (str, int, float, bool))
+            }
+            with span(name, **attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+_hooks_installed = False
+_hooks_lock = threading.Lock()
+
+def install_crew_hooks():
+    """Open and close a span for every crew task via the crewai event bus"""
+    global _hooks_installed
+    with _hooks_lock:
+        if _hooks_installed:
+            return
+        _hooks_installed = True
+
+    try:
+        from crewai.utilities.events import (
+            TaskCompletedEvent, TaskFailedEvent, TaskStartedEvent, crewai_event_bus
+        )
+    except ImportError:
+        return
+
+    @crewai_event_bus.on(TaskStartedEvent)
+    def on_task_started(source, event):
+        trace = _current_trace.get()
+        if trace is None or event.task is None:
+            return
+        task = event.task
+        agent = getattr(task.agent, "role", "") if task.agent else ""
+        task_span = trace.start_span(
+            f"task:{task.name or 'task'}", _current_span.get(),
+            {"task.name": task.name or "", "agent.role": " ".join(agent.split())}
+        )
+        token = _current_span.set(task_span)
+        with trace.lock:
+            trace.open_task_spans[str(task.id)] = (task_span, token)
+
+    def on_task_finished(event, error=None):
+        trace = _current_trace.get()
+        if trace is None or event.task is None:
+            return
+        with trace.lock:
+            entry = trace.open_task_spans.pop(str(event.task.id), None)
+        if entry:
+            task_span, token = entry
+            task_span.end(error=error)
+            _current_span.reset(token)
+
+    @crewai_event_bus.on(TaskCompletedEvent)
+    def on_task_completed(source, event):
+        on_task_finished(event)
+
+    @crewai_event_bus.on(TaskFailedEvent)
+    def on_task_failed(source, event):
+        on_task_finished(event, error=event.error)
@@ -0,0 +1,181 @@
+"""
+Bounded Worker Pool for Research Runs
+Runs crews on a fixed number of threads, schedules queued runs fairly across
+users and priority classes and exposes queue statistics
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .metrics import ACTIVE_WORKERS, QUEUE_DEPTH, QUEUE_WAIT_SECONDS
+
+# Priority classes and their share of dispatches relative to each other
+PRIORITY_WEIGHTS = {"interactive": 4, "normal": 2, "batch": 1}
+DEFAULT_PRIORITY = "normal"
+
+
+class _Flow:
+    """Queued jobs of one principal in one priority class"""
+
+    def __init__(self, principal: str, weight: int):
+        self.principal = principal
+        self.weight = weight
+        self.deficit = 0
+        self.jobs: Deque[tuple] = deque()
+
+
+class FairQueue:
+    """
+    Deficit round robin queue over (priority class, principal) flows.
+
+    Every principal (a user on a channel, e.g. "slack:U123") gets its own
+    flow, and flows take turns. On each turn a flow earns its priority class
+    weight in credit and may dispatch one job per credit, so an interactive
+    user is served four times as often as a batch submitter but nobody
+    starves. A principal already running `max_active_per_principal` jobs is
+    skipped until one of them finishes.
+    """
+
+    def __init__(self, max_active_per_principal: int,
+                 weights: Optional[Dict[str, int]] = None):
+        self.max_active_per_principal = max_active_per_principal
+        self.weights = dict(weights or PRIORITY_WEIGHTS)
+        self.flows: "OrderedDict[Tuple[str, str], _Flow]" = OrderedDict()
+        self.active: Dict[str, int] = defaultdict(int)
+        self.queued = 0
+        self.cond = threading.Condition()
+
+    def put(self, job: tuple, principal: str, priority: str):
+        if priority not in self.weights:
+            raise ValueError(f"Unknown priority class: {priority}")
+        with self.cond:
+            key = (priority, principal)
+            flow = self.flows.get(key)
+            if flow is None:
+                flow = self.flows[key] = _Flow(principal, self.weights[priority])
+            flow.jobs.append(job)
+            self.queued += 1
+            self.cond.notify()
+
+    def _next_job(self) -> Optional[tuple]:
+        for _ in range(len(self.flows)):
+            key, flow = next(iter(self.flows.items()))
+            if self.active[flow.principal] >= self.max_active_per_principal:
+                self.flows.move_to_end(key)
+                continue
+            if flow.deficit < 1:
+                flow.deficit += flow.weight
+            flow.deficit -= 1
+            job = flow.jobs.popleft()
+            if not flow.jobs:
+                del self.flows[key]
+            elif flow.deficit < 1:
+                self.flows.move_to_end(key)
+            self.active[flow.principal] += 1
+            self.queued -= 1
+            return job
+        return None
+
+    def get(self) -> tuple:
+        """Block until a job can be dispatched and return it"""
+        with self.cond:
+            while True:
+                job = self._next_job()
+                if job is not None:
+                    return job
+                self.cond.wait()
+
+    def done(self, principal: str):
+        """Mark a job of `principal` as finished, freeing one of its slots"""
+        with self.cond:
+            self.active[principal] -= 1
+            if self.active[principal] <= 0:
+                del self.active[principal]
+            self.cond.notify_all()
+
+    def queued_for(self, principal: str) -> int:
+        with self.cond:
+            return sum(
+                len(flow.jobs) for (_, flow_principal), flow in self.flows.items()
+                if flow_principal == principal
+            )
+
+    def queued_by_priority(self) -> Dict[str, int]:
+        with self.cond:
+            counts = {priority: 0 for priority in self.weights}
+            for (priority, _), flow in self.flows.items():
+                counts[priority] += len(flow.jobs)
+        return counts
+
+
+class WorkerPool:
+    """
+    Fixed-size pool of daemon threads fed from a FairQueue.
+
+    Unlike a thread per request, the pool caps how many crews run at once and
+    keeps cheap counters (queued, active) that health checks can read without
+    taking locks or doing any I/O.
+    """
+
+    def __init__(self, max_workers: int = 4, max_active_per_principal: Optional[int] = None):
+        self.max_workers = max_workers
+        # By default one principal can occupy at most half of the workers
+        self.jobs = FairQueue(max_active_per_principal or max(1, max_workers // 2))
+        self.lock = threading.Lock()
+        self.threads: List[threading.Thread] = []
+        self.active = 0
+
+    def _start_workers(self):
+        """Start the worker threads on first use"""
+        with self.lock:
+            while len(self.threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"research-worker-{len(self.threads) + 1}"
+                )
+                thread.daemon = True
+                thread.start()
+                self.threads.append(thread)
+
+    def _work(self):
+        while True:
+            fn, args, principal, enqueued_at = self.jobs.get()
+            QUEUE_DEPTH.dec()
+            QUEUE_WAIT_SECONDS.observe(time.time() - enqueued_at)
+            with self.lock:
+                self.active += 1
+            ACTIVE_WORKERS.inc()
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"⚠️  Research worker error: {e}")
+            finally:
+                with self.lock:
+                    self.active -= 1
+                ACTIVE_WORKERS.dec()
+                self.jobs.done(principal)
+
+    def submit(self, fn: Callable[..., Any], *args: Any,
+               principal: str = "anonymous", priority: str = DEFAULT_PRIORITY):
+        """Queue fn(*args) for `principal` in the given priority class"""
+        if len(self.threads) < self.max_workers:
+            self._start_workers()
+        QUEUE_DEPTH.inc()
+        try:
+            self.jobs.put((fn, args, principal, time.time()), principal, priority)
+        except ValueError:
+            QUEUE_DEPTH.dec()
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Get queue depth and worker availability"""
+        active = self.active
+        return {
+            "workers": self.max_workers,
+            "active": active,
+            "idle": self.max_workers - active,
+            "queued": self.jobs.queued,
+            "queued_by_priority": self.jobs.queued_by_priority(),
+        }
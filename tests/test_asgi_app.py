@@ -0,0 +1,70 @@
+"""ASGI entry point streaming Flask responses (user-045)"""
+
+import asyncio
+
+from flask import Flask, Response
+
+import asgi_app
+
+
+def run_request(app, path, events):
+    """Send one GET through the ASGI app and return the messages it sent"""
+    sent = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        sent.append(message)
+        if message['type'] == 'http.response.body' and message['body']:
+            events.append(('sent', message['body']))
+
+    scope = {'type': 'http', 'method': 'POST', 'path': path, 'query_string': b'', 'headers': [],
+             'http_version': '1.1', 'scheme': 'http'}
+    asyncio.run(app(scope, receive, send))
+    return sent
+
+
+def test_flask_response_is_streamed_lazily(monkeypatch):
+    events = []
+    flask_app = Flask(__name__)
+
+    @flask_app.route('/stream', methods=['POST'])
+    def stream():
+        def generate():
+            for part in (b'one', b'two', b'three'):
+                events.append(('produced', part))
+                yield part
+        return Response(generate(), content_type='text/plain')
+
+    monkeypatch.setattr(asgi_app.web_app, 'app', flask_app)
+    sent = run_request(asgi_app.app, '/stream', events)
+
+    assert sent[0]['type'] == 'http.response.start' and sent[0]['status'] == 200
+    assert b''.join(m.get('body', b'') for m in sent[1:]) == b'onetwothree'
+    assert not sent[-1].get('more_body')
+    # Each chunk goes out before the next one is produced
+    assert events == [('produced', b'one'), ('sent', b'one'), ('produced', b'two'), ('sent', b'two'),
+                      ('produced', b'three'), ('sent', b'three')]
+
+
+def test_large_body_split_into_chunks(monkeypatch):
+    flask_app = Flask(__name__)
+    body = b'x' * (asgi_app.STREAM_CHUNK_BYTES * 2 + 10)
+    flask_app.add_url_rule('/big', 'big', lambda: body, methods=['POST'])
+    monkeypatch.setattr(asgi_app.web_app, 'app', flask_app)
+
+    sent = run_request(asgi_app.app, '/big', [])
+    parts = [m['body'] for m in sent[1:] if m['body']]
+    assert b''.join(parts) == body
+    assert max(len(part) for part in parts) == asgi_app.STREAM_CHUNK_BYTES
+
+
+def test_empty_response(monkeypatch):
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule('/empty', 'empty', lambda: ('', 204), methods=['POST'])
+    monkeypatch.setattr(asgi_app.web_app, 'app', flask_app)
+
+    sent = run_request(asgi_app.app, '/empty', [])
+    assert sent[0]['status'] == 204
+    assert sent[-1]['body'] == b'' and not sent[-1].get('more_body')
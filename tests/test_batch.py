@@ -0,0 +1,116 @@
+"""batch_research topic handling, resuming and result records (user-038)"""
+
+import io
+import json
+import os
+from types import SimpleNamespace
+
+import pytest
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+
+from firstcrew import batch, llm_manager, metrics, research_run, retrieval
+from firstcrew.task_store import TaskStore
+
+
+def test_read_topics_skips_comments_blanks_and_duplicates():
+    lines = io.StringIO("AI agents\n\n# nightly\n  Fusion  \nAI agents\n")
+    assert batch.read_topics(lines) == ["AI agents", "Fusion"]
+
+
+def test_topic_slug_is_readable_and_unique():
+    slug = batch.topic_slug("AI Agents: 2025!")
+    assert slug.startswith("ai-agents-2025-")
+    assert batch.topic_slug("AI agents 2025") != slug
+    assert batch.topic_slug("???").startswith("topic-")
+
+
+def test_default_parallelism_for_basic_crew():
+    assert batch.default_parallelism("basic") == 1
+
+
+FAILING = {}  # topic -> crew task that raises
+EXECUTED = []  # (topic, task name, preferred LLM config)
+
+
+class FakeCrew:
+    def __init__(self):
+        self.tasks = [SimpleNamespace(name=name, context=NOT_SPECIFIED, output=None, agent=None,
+                                      execution_duration=1.0)
+                      for name in ("research_task", "reporting_task")]
+        self.task_callback = None
+
+    def kickoff(self, inputs):
+        topic = inputs["topic"]
+        for task in self.tasks:
+            if FAILING.get(topic) == task.name:
+                raise RuntimeError("provider down")
+            EXECUTED.append((topic, task.name, llm_manager._preferred_config.get()))
+            task.output = TaskOutput(name=task.name, description="d", agent="a", raw=f"# {topic}")
+            self.task_callback(task.output)
+        return SimpleNamespace(raw=self.tasks[-1].output.raw)
+
+
+@pytest.fixture
+def fake_crews(monkeypatch):
+    FAILING.clear()
+    EXECUTED.clear()
+    factory = SimpleNamespace(create=FakeCrew, tasks_config={})
+    monkeypatch.setattr(research_run, "get_crew_factory", lambda crew_class: factory)
+    monkeypatch.setattr(retrieval, "add_prior_findings", lambda crew, topic, passages=None: False)
+    monkeypatch.setattr(batch, "load_crew_class", lambda name: name)
+    monkeypatch.setattr(batch, "get_llm_config_names", lambda: ["Groq-1", "OpenAI-1"])
+    return EXECUTED
+
+
+def read_results(output_dir):
+    with open(os.path.join(output_dir, batch.RESULTS_FILE)) as f:
+        return [json.loads(line) for line in f]
+
+
+def test_main_writes_reports_and_resumes(tmp_path, fake_crews):
+    topics = tmp_path / "topics.txt"
+    topics.write_text("AI agents\nBroken\nFusion\n")
+    output_dir = str(tmp_path / "out")
+
+    FAILING["Broken"] = "reporting_task"
+    assert batch.main([str(topics), "-o", output_dir, "--crew", "basic", "-p", "2"]) == 1
+    records = {record["topic"]: record for record in read_results(output_dir)}
+    assert records["Broken"]["status"] == "failed"
+    assert records["Broken"]["error"] == "provider down"
+    with open(os.path.join(output_dir, records["Fusion"]["report_file"])) as f:
+        assert f.read() == "# Fusion"
+    assert "token_usage" in records["AI agents"]
+    assert batch.completed_topics(output_dir) == {"AI agents", "Fusion"}
+
+    # A second run only retries the failed topic, from its last checkpoint
+    fake_crews.clear()
+    FAILING.clear()
+    assert batch.main([str(topics), "-o", output_dir, "--crew", "basic"]) == 0
+    assert [(topic, task) for topic, task, _ in fake_crews] == [("Broken", "reporting_task")]
+    assert batch.completed_topics(output_dir) == {"AI agents", "Broken", "Fusion"}
+
+
+def test_enhanced_crew_topics_are_pinned_round_robin(tmp_path, fake_crews):
+    topics = tmp_path / "topics.txt"
+    topics.write_text("A\nB\nC\n")
+    assert batch.main([str(topics), "-o", str(tmp_path / "out"), "--crew", "enhanced", "-p", "1"]) == 0
+    pins = {topic: config for topic, _, config in fake_crews}
+    assert pins == {"A": "Groq-1", "B": "OpenAI-1", "C": "Groq-1"}
+    assert batch.assign_llm_configs("basic", 2) == [None, None]
+
+
+def test_batch_runs_are_measured(tmp_path, fake_crews):
+    before = metrics.CREW_KICKOFF_SECONDS.counts.get(("completed",), [0])[-1]
+    writer = batch.ResultWriter(str(tmp_path))
+    record = batch.research_topic("basic", "AI", writer, TaskStore(str(tmp_path / "c.db")))
+    assert record["status"] == "completed"
+    assert metrics.CREW_KICKOFF_SECONDS.counts[("completed",)][-1] == before + 1
+
+
+def test_completed_topics_ignores_broken_lines_and_missing_reports(tmp_path):
+    (tmp_path / batch.RESULTS_FILE).write_text(
+        json.dumps({"topic": "Gone", "status": "completed", "report_file": "gone.md"}) + "\n"
+        + '{"topic": "Half'
+    )
+    assert batch.completed_topics(str(tmp_path)) == set()
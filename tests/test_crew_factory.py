@@ -0,0 +1,73 @@
+"""Crew template caching (user-026)"""
+
+import threading
+
+from firstcrew.crew_factory import CrewFactory, get_crew_factory
+
+
+class FakeCrew:
+    def __init__(self, tasks):
+        self.tasks = tasks
+
+    def copy(self):
+        return FakeCrew([dict(task) for task in self.tasks])
+
+
+class FakeCrewClass:
+    built = 0
+
+    def __init__(self):
+        type(self).built += 1
+        self.tasks_config = {"research_task": {"description": "Research {topic}"}}
+        self.prepared = []
+
+    def crew(self):
+        return FakeCrew([{"name": "research_task"}])
+
+    def prepare_crew(self, crew):
+        self.prepared.append(crew)
+
+
+def test_template_built_once_and_cloned_per_run(monkeypatch):
+    monkeypatch.setattr(FakeCrewClass, "built", 0)
+    factory = CrewFactory(FakeCrewClass)
+    first, second = factory.create(), factory.create()
+
+    assert FakeCrewClass.built == 1
+    assert first is not second and first.tasks[0] is not second.tasks[0]
+    assert factory._instance.prepared == [first, second]
+    assert factory.tasks_config["research_task"]["description"] == "Research {topic}"
+
+
+def test_concurrent_first_use_builds_once(monkeypatch):
+    monkeypatch.setattr(FakeCrewClass, "built", 0)
+    factory = CrewFactory(FakeCrewClass)
+    threads = [threading.Thread(target=factory.create) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert FakeCrewClass.built == 1
+
+
+def test_reset_rebuilds(monkeypatch):
+    monkeypatch.setattr(FakeCrewClass, "built", 0)
+    factory = CrewFactory(FakeCrewClass)
+    factory.create()
+    factory.reset()
+    factory.create()
+    assert FakeCrewClass.built == 2
+
+
+def test_one_factory_per_class():
+    assert get_crew_factory(FakeCrewClass) is get_crew_factory(FakeCrewClass)
+
+
+def test_basic_crew_copies_are_independent():
+    from firstcrew.crew import Firstcrew
+
+    factory = CrewFactory(Firstcrew)
+    first, second = factory.create(), factory.create()
+    assert [task.name for task in first.tasks] == ["research_task", "reporting_task"]
+    assert first.tasks[0] is not second.tasks[0]
+    assert first.agents[0] is not second.agents[0]
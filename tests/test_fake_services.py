@@ -0,0 +1,85 @@
+"""Fake LLM and SerpAPI services used by the offline benchmarks (user-032)"""
+
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from fake_services import ServiceProfile, start_fake_llm, start_fake_serp  # noqa: E402
+from pipeline_benchmark import fake_service_env, percentile  # noqa: E402
+
+
+def base_url(server):
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def post_json(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {"Content-Type": "application/json"})
+    with urllib.request.urlopen(request, timeout=10) as response:
+        return json.load(response)
+
+
+@pytest.fixture
+def llm():
+    server = start_fake_llm()
+    yield server
+    server.shutdown()
+
+
+def test_researcher_searches_then_answers(llm):
+    system = {"role": "system", "content": "You are Senior Data Researcher. Tools: Web Search. Action Input"}
+    task = {"role": "user", "content": "Conduct a thorough research about Quantum computing using the tools"}
+    url = base_url(llm) + "/v1/chat/completions"
+
+    first = post_json(url, {"model": "gpt-4o-mini", "messages": [system, task]})
+    assert "Action: Web Search" in first["choices"][0]["message"]["content"]
+    assert "Quantum computing" in first["choices"][0]["message"]["content"]
+
+    observed = {"role": "user", "content": "Observation: results"}
+    second = post_json(url, {"model": "gpt-4o-mini", "messages": [system, task, observed]})
+    assert "Final Answer:" in second["choices"][0]["message"]["content"]
+    assert second["usage"]["total_tokens"] == second["usage"]["prompt_tokens"] + second["usage"]["completion_tokens"]
+
+
+def test_reporter_writes_report(llm):
+    messages = [{"role": "system", "content": "You are Reporting Analyst"},
+                {"role": "user", "content": "Review the context you got about Fusion and expand"}]
+    content = post_json(base_url(llm) + "/v1/chat/completions", {"messages": messages})["choices"][0]["message"]["content"]
+    assert "# Report on Fusion" in content
+
+
+def test_serp_results_and_injected_errors():
+    profile = ServiceProfile()
+    serp = start_fake_serp(profile)
+    try:
+        with urllib.request.urlopen(base_url(serp) + "/search?q=fusion&tbm=nws", timeout=10) as response:
+            results = json.load(response)["news_results"]
+        assert len(results) == 10 and results[0]["title"] == "fusion result 1"
+
+        profile.error_rate, profile.error_status = 1.0, 429
+        with pytest.raises(urllib.error.HTTPError) as excinfo:
+            urllib.request.urlopen(base_url(serp) + "/search?q=fusion", timeout=10)
+        assert excinfo.value.code == 429
+        assert (profile.requests, profile.errors) == (2, 1)
+    finally:
+        serp.shutdown()
+
+
+def test_fake_service_env_hides_real_keys(monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "real-key")
+    monkeypatch.setenv("OPENAI_API_KEY", "real-key")
+    env = fake_service_env("http://llm/v1", "http://serp/search")
+    assert env["GROQ_API_KEY"] == ""
+    assert env["OPENAI_API_KEY"] == "fake-key"
+    assert env["OPENAI_BASE_URL"] == "http://llm/v1"
+
+
+def test_percentile():
+    assert percentile([], 0.5) == 0.0
+    assert percentile([3, 1, 2, 4], 0.5) == 2
+    assert percentile([3, 1, 2, 4], 0.95) == 4
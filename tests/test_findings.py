@@ -0,0 +1,53 @@
+"""Structured research findings (user-049)"""
+
+import json
+from types import SimpleNamespace
+
+from firstcrew import findings
+from firstcrew.findings import (
+    Finding, ResearchFindings, compact_findings, findings_guardrail, parse_findings, research_findings
+)
+
+FINDINGS = ResearchFindings(findings=[
+    Finding(claim="  Chip  exports   tightened ", source_url="https://example.com/1", confidence=0.9),
+    Finding(claim="chip exports tightened"),
+    Finding(claim=""),
+    Finding(claim="Fusion record set", date="2025-01-15"),
+])
+
+
+def test_compact_findings_dedupes_and_drops_empty_fields():
+    assert compact_findings(FINDINGS) == [
+        {"claim": "Chip exports tightened", "source_url": "https://example.com/1", "confidence": 0.9},
+        {"claim": "Fusion record set", "date": "2025-01-15", "confidence": 0.5},
+    ]
+
+
+def test_long_claims_are_cut_at_a_word(monkeypatch):
+    monkeypatch.setattr(findings, "FINDING_MAX_CHARS", 12)
+    compact = compact_findings(ResearchFindings(findings=[Finding(claim="one two three four")]))
+    assert compact[0]["claim"] == "one two…"
+
+
+def test_guardrail_rewrites_findings_as_compact_json():
+    ok, output = findings_guardrail(SimpleNamespace(pydantic=FINDINGS, raw="..."))
+    assert ok
+    assert json.loads(output) == {"findings": compact_findings(FINDINGS)}
+
+    passthrough = SimpleNamespace(pydantic=None, raw="NO CHANGES")
+    assert findings_guardrail(passthrough) == (True, passthrough)
+
+
+def test_parse_findings_from_live_and_restored_outputs():
+    assert parse_findings(SimpleNamespace(pydantic=FINDINGS)) == compact_findings(FINDINGS)
+    restored = SimpleNamespace(pydantic=None, raw=FINDINGS.model_dump_json())
+    assert parse_findings(restored) == compact_findings(FINDINGS)
+    assert parse_findings(SimpleNamespace(raw="# A markdown report")) is None
+    assert parse_findings(SimpleNamespace(raw=None)) is None
+
+
+def test_research_findings_takes_the_first_output_with_findings():
+    outputs = [SimpleNamespace(raw="not json"), SimpleNamespace(pydantic=FINDINGS),
+               SimpleNamespace(raw="# Report")]
+    assert research_findings(outputs)[1]["claim"] == "Fusion record set"
+    assert research_findings([SimpleNamespace(raw="# Report")]) is None
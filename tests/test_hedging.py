@@ -0,0 +1,70 @@
+"""Hedged LLM requests (user-035)"""
+
+import time
+
+import pytest
+from litellm import Usage
+
+from firstcrew import managed_llm
+from firstcrew.hedging import hedge_allowed
+from firstcrew.metrics import LLM_TOKENS
+from firstcrew.token_budget import TokenBudget
+
+# Seconds each fake model takes to answer
+LATENCY = {"slow-primary": 0.3, "fast-hedge": 0.05}
+
+
+def fake_call(self, messages, callbacks=None, **kwargs):
+    time.sleep(LATENCY[self.model])
+    usage = Usage(prompt_tokens=100, completion_tokens=10, total_tokens=110)
+    for callback in callbacks or []:
+        callback.log_success_event({}, {"usage": usage}, 0, 0)
+    return f"answer from {self.model}"
+
+
+@pytest.fixture
+def hedged_llm(monkeypatch):
+    monkeypatch.setattr(managed_llm.LLM, "call", fake_call)
+    monkeypatch.setattr(managed_llm, "hedge_delay", lambda model: 0.05)
+    monkeypatch.setattr(managed_llm, "get_hedge_llm_config", lambda name, tier: {
+        "name": "hedge-config", "model": "fast-hedge", "api_key": "k2",
+    })
+    return managed_llm.ManagedLLM(config_name="primary-config", model="slow-primary", api_key="k1")
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.time() + timeout
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_hedge_allowed_by_budget():
+    assert hedge_allowed(None)
+    assert hedge_allowed(TokenBudget(0))
+    budget = TokenBudget(1000)
+    budget.record(500, 100)
+    assert hedge_allowed(budget)
+    budget.record(200, 0)
+    assert not hedge_allowed(budget)
+
+
+def test_losing_request_counted_separately(hedged_llm):
+    before_won = LLM_TOKENS.get(config="hedge-config", type="prompt")
+    before_lost = LLM_TOKENS.get(config="primary-config", type="hedge_lost_prompt")
+    budget = TokenBudget(100_000)
+
+    assert hedged_llm._hedged_call([{"role": "user", "content": "hi"}], budget) == "answer from fast-hedge"
+    assert LLM_TOKENS.get(config="hedge-config", type="prompt") == before_won + 100
+
+    # The abandoned primary still finishes, is paid for and shows up as lost
+    assert wait_for(lambda: LLM_TOKENS.get(config="primary-config", type="hedge_lost_prompt") == before_lost + 100)
+    assert budget.prompt_tokens == 200
+
+
+def test_no_hedge_near_budget_limit(hedged_llm):
+    budget = TokenBudget(1000)
+    budget.record(900, 0)
+    assert hedged_llm._hedged_call([{"role": "user", "content": "hi"}], budget) == "answer from slow-primary"
+    # Only the primary request was sent
+    assert budget.calls == 2
@@ -0,0 +1,163 @@
+"""SQLite job broker: claims, leases and checkpoints (user-046)"""
+
+import threading
+import time
+import urllib.request
+
+import pytest
+
+from firstcrew import job_queue
+from firstcrew.job_queue import COMPLETED, JobBroker, SQLiteBroker, open_broker
+from firstcrew.metrics import Counter, Metric, start_metrics_server
+
+
+@pytest.fixture
+def broker(tmp_path):
+    return SQLiteBroker(str(tmp_path / "jobs.db"))
+
+
+def test_interfaces_are_abstract():
+    with pytest.raises(TypeError):
+        JobBroker()
+    with pytest.raises(TypeError):
+        Metric("x", "doc")
+
+
+def test_submit_is_idempotent(broker):
+    assert broker.submit("j1", {"topic": "a"})
+    assert not broker.submit("j1", {"topic": "b"})
+    with pytest.raises(ValueError):
+        broker.submit("j2", {}, priority="urgent")
+
+
+def test_claim_order_priority_then_fairness(broker):
+    broker.submit("busy-1", {"n": 1}, principal="busy")
+    broker.submit("busy-2", {"n": 2}, principal="busy")
+    broker.submit("quiet-1", {"n": 3}, principal="quiet")
+    broker.submit("urgent", {"n": 4}, principal="busy", priority="interactive")
+
+    assert broker.claim("w1")[0] == "urgent"
+    # busy already has a running job, so quiet goes next despite submitting later
+    assert broker.claim("w1")[0] == "quiet-1"
+    assert broker.claim("w1")[0] == "busy-1"
+    assert broker.claim("w1")[0] == "busy-2"
+    assert broker.claim("w1") is None
+
+
+def test_expired_lease_is_reclaimed_and_old_worker_loses_it(broker):
+    broker.submit("j1", {"topic": "a"})
+    assert broker.claim("w1", lease_seconds=0.01)[0] == "j1"
+    time.sleep(0.05)
+    assert broker.claim("w2")[0] == "j1"
+    assert not broker.update("j1", "w1", progress="stale")
+    assert not broker.finish("j1", "w1", COMPLETED, result={"content": "late"})
+    assert broker.finish("j1", "w2", COMPLETED, result={"content": "ok"})
+    change = broker.changes(0)[-1]
+    assert (change["status"], change["result"], change["attempts"]) == (COMPLETED, {"content": "ok"}, 2)
+
+
+def test_job_fails_after_max_attempts(broker, monkeypatch):
+    monkeypatch.setattr(job_queue, "JOB_MAX_ATTEMPTS", 1)
+    broker.submit("j1", {})
+    broker.claim("w1", lease_seconds=0.01)
+    time.sleep(0.05)
+    assert broker.claim("w2") is None
+    assert broker.changes(0)[-1]["status"] == job_queue.FAILED
+
+
+def test_heartbeat_extends_lease(broker):
+    broker.submit("j1", {})
+    broker.claim("w1", lease_seconds=0.05)
+    broker.heartbeat("w1", 2, ["j1"], lease_seconds=60)
+    time.sleep(0.1)
+    assert broker.claim("w2") is None
+    stats = broker.stats()
+    assert (stats["workers"], stats["active"], stats["idle"], stats["queued"]) == (2, 1, 1, 0)
+
+
+def test_progress_and_checkpoints(broker):
+    broker.submit("j1", {})
+    broker.claim("w1")
+    assert broker.update("j1", "w1", progress="half way")
+    assert broker.changes(0)[-1]["fields"] == {"progress": "half way"}
+    broker.save_output("j1", "reporting_task", 1, {"raw": "b"})
+    broker.save_output("j1", "research_task", 0, {"raw": "a"})
+    assert list(broker.load_outputs("j1")) == ["research_task", "reporting_task"]
+    broker.remove("j1")
+    assert broker.load_outputs("j1") == {} and broker.changes(0) == []
+
+
+def test_queued_for_counts_only_waiting_jobs(broker):
+    broker.submit("j1", {}, principal="web:1")
+    broker.submit("j2", {}, principal="web:1")
+    broker.claim("w1")
+    assert broker.queued_for("web:1") == 1
+    assert broker.stats()["queued_by_priority"]["normal"] == 1
+
+
+def test_open_broker_urls(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert isinstance(open_broker("sqlite:///jobs.db"), SQLiteBroker)
+    assert (tmp_path / "jobs.db").exists()
+    with pytest.raises(ValueError):
+        open_broker("redis://localhost")
+
+
+def test_metrics_server_serves_registry():
+    counter = Counter("firstcrew_test_total", "Test counter")
+    from firstcrew.metrics import REGISTRY
+    REGISTRY.register(counter)
+    counter.inc(3)
+    try:
+        server = start_metrics_server(0, host="127.0.0.1")
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            assert "firstcrew_test_total 3" in response.read().decode()
+        server.shutdown()
+    finally:
+        REGISTRY.metrics.remove(counter)
+
+
+def test_worker_sends_trace_with_result(monkeypatch):
+    from firstcrew import research_worker
+    from firstcrew.token_budget import TokenBudget
+    trace = {"resourceSpans": []}
+    monkeypatch.setattr(research_worker, "TRACING_ENABLED", True)
+    monkeypatch.setattr(research_worker, "load_trace", lambda job_id: trace if job_id == "j1" else None)
+
+    result = research_worker.run_result("j1", TokenBudget(0), content="report")
+    assert result["content"] == "report"
+    assert result["trace"] is trace
+    assert result["token_usage"]["used_tokens"] == 0
+
+
+def test_stopped_worker_keeps_renewing_leases_until_jobs_finish(broker, monkeypatch):
+    from firstcrew import research_worker
+
+    started, release = threading.Event(), threading.Event()
+    beats = []
+
+    def slow_job(broker, worker_id, crew_class, job_id, payload):
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(research_worker, "run_job", slow_job)
+    monkeypatch.setattr(research_worker, "JOB_LEASE_SECONDS", 0.15)
+    monkeypatch.setattr(broker, "heartbeat", lambda worker_id, slots, job_ids: beats.append(list(job_ids)))
+    broker.submit("j1", {"topic": "AI"})
+
+    worker = research_worker.ResearchWorker(broker, crew_class=None, concurrency=1, poll_interval=0.01)
+    runner = threading.Thread(target=worker.run)
+    runner.start()
+    assert started.wait(5)
+
+    worker.stop()
+    stopped_at = len(beats)
+    time.sleep(0.3)
+    assert [job_ids for job_ids in beats[stopped_at:]].count(["j1"]) >= 2
+
+    release.set()
+    runner.join(5)
+    assert not runner.is_alive()
+    ended_at = len(beats)
+    time.sleep(0.2)
+    assert len(beats) == ended_at  # heartbeats end with the worker
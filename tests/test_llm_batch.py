@@ -0,0 +1,126 @@
+"""Provider batch-API collector against the fake OpenAI and Anthropic batch endpoints (user-047)"""
+
+import os
+import sys
+import time
+
+import pytest
+
+from firstcrew import llm_batch
+from firstcrew.llm_batch import BatchCollector, BatchRequestError, batch_llm_calls, batch_target, batching_enabled
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "benchmarks"))
+
+from fake_services import start_fake_llm  # noqa: E402
+
+MESSAGES = [
+    {"role": "system", "content": "You are Reporting Analyst"},
+    {"role": "user", "content": "Review the context you got about Fusion and expand"},
+]
+
+
+@pytest.fixture
+def llm():
+    server = start_fake_llm(report_chars=200, batch_turnaround=0.1)
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+
+
+def test_batch_target():
+    assert batch_target("gpt-4o-mini") == ("openai", "https://api.openai.com/v1", "gpt-4o-mini")
+    assert batch_target("groq/llama-3.1-8b-instant")[:2] == ("openai", "https://api.groq.com/openai/v1")
+    assert batch_target("claude-3-haiku-20240307")[0] == "anthropic"
+    assert batch_target("openai/gpt-4o", "http://proxy/v1/") == ("openai", "http://proxy/v1", "gpt-4o")
+    assert batch_target("gemini/gemini-1.5-flash") is None
+
+
+def test_batching_context():
+    assert not batching_enabled()
+    with batch_llm_calls():
+        assert batching_enabled()
+    assert not batching_enabled()
+
+
+def test_openai_calls_share_one_batch(llm):
+    collector = BatchCollector(max_requests=2, max_wait=5, poll_interval=0.05)
+    futures = [collector.submit("openai", f"{llm}/v1", "key", "gpt-4o-mini", MESSAGES, max_tokens=100)
+               for _ in range(2)]
+    results = [future.result(timeout=10) for future in futures]
+    assert all("# Report on Fusion" in result["content"] for result in results)
+    assert all(result["prompt_tokens"] > 0 for result in results)
+    # Futures resolve just before the finished batch leaves the in-flight list
+    deadline = time.time() + 5
+    while collector.stats()["batches_in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert collector.stats() == {"waiting_calls": 0, "batches_in_flight": 0, "calls_in_flight": 0}
+
+
+def test_anthropic_batch_after_max_wait(llm):
+    collector = BatchCollector(max_requests=100, max_wait=0.05, poll_interval=0.05)
+    future = collector.submit("anthropic", llm, "key", "claude-3-haiku-20240307", MESSAGES, temperature=0.1)
+    result = future.result(timeout=10)
+    assert "# Report on Fusion" in result["content"]
+    assert result["completion_tokens"] > 0
+
+
+def test_anthropic_request_keeps_system_blocks():
+    client = llm_batch.AnthropicBatchClient("http://x", "key")
+    system = [{"type": "text", "text": "sys", "cache_control": {"type": "ephemeral"}}]
+    params = client.build_request("claude", [{"role": "system", "content": system}, MESSAGES[1]],
+                                  None, None, ["Observation:"])
+    assert params["system"] == system
+    assert params["messages"] == [MESSAGES[1]]
+    assert params["max_tokens"] == 4096 and params["stop_sequences"] == ["Observation:"]
+
+
+def test_submit_failure_fails_every_call(monkeypatch):
+    def refuse(self, requests_by_id):
+        raise ConnectionError("refused")
+
+    monkeypatch.setattr(llm_batch.OpenAIBatchClient, "submit", refuse)
+    collector = BatchCollector(max_requests=1, max_wait=5, poll_interval=0.05)
+    future = collector.submit("openai", "http://unused/v1", "key", "gpt-4o-mini", MESSAGES)
+    with pytest.raises(BatchRequestError, match="refused"):
+        future.result(timeout=10)
+
+
+def test_missing_result_uses_batch_error():
+    class FailedBatch:
+        def poll(self, batch_id):
+            return {"*": BatchRequestError("Batch b1 expired")}
+
+    collector = BatchCollector()
+    future = llm_batch.Future()
+    assert collector._check(FailedBatch(), "b1", {"call": future}, time.time())
+    with pytest.raises(BatchRequestError, match="expired"):
+        future.result(timeout=1)
+
+
+def test_unpollable_batch_expires():
+    class GoneBatch:
+        def poll(self, batch_id):
+            raise ConnectionError("404 Not Found")
+
+    collector = BatchCollector(timeout=60)
+    future = llm_batch.Future()
+    assert not collector._check(GoneBatch(), "b1", {"call": future}, time.time())
+    assert not future.done()
+
+    before = llm_batch.LLM_BATCHES.get(status="expired")
+    assert collector._check(GoneBatch(), "b1", {"call": future}, time.time() - 61)
+    with pytest.raises(BatchRequestError, match="no results within 60 seconds"):
+        future.result(timeout=1)
+    assert llm_batch.LLM_BATCHES.get(status="expired") == before + 1
+
+
+def test_expired_batch_leaves_in_flight(monkeypatch):
+    collector = BatchCollector(max_requests=1, max_wait=5, poll_interval=0.05, timeout=0.2)
+    monkeypatch.setattr(llm_batch.OpenAIBatchClient, "submit", lambda self, requests_by_id: "b1")
+    monkeypatch.setattr(llm_batch.OpenAIBatchClient, "poll", lambda self, batch_id: None)
+    future = collector.submit("openai", "http://unused/v1", "key", "gpt-4o-mini", MESSAGES)
+    with pytest.raises(BatchRequestError):
+        future.result(timeout=5)
+    deadline = time.time() + 5
+    while collector.stats()["batches_in_flight"] and time.time() < deadline:
+        time.sleep(0.01)
+    assert collector.stats()["batches_in_flight"] == 0
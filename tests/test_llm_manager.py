@@ -0,0 +1,124 @@
+"""LLMManager initialization and hot reload (user-027), model tiers (user-034) and prompt cache stats (user-048)"""
+
+import pytest
+
+from firstcrew import llm_manager
+from firstcrew.llm_manager import LLMManager
+
+
+@pytest.fixture
+def manager():
+    manager = LLMManager()
+    for config in manager._read_env_configs({"GROQ_API_KEY": "g1", "OPENAI_API_KEY": "o1"}):
+        manager.add_config(config)
+    return manager
+
+
+def test_reload_diff(manager):
+    manager._record_usage(manager.configs[0])  # Groq-1
+    manager._record_usage(manager.configs[1])  # OpenAI-1
+
+    diff = manager.reload({"GROQ_API_KEY": "g1", "OPENAI_API_KEY": "o1-rotated", "GEMINI_API_KEY": "m1"})
+
+    assert diff == {"added": ["Gemini-1"], "removed": [], "changed": ["OpenAI-1"], "unchanged": ["Groq-1"]}
+    assert [config.name for config in manager.configs] == ["Groq-1", "OpenAI-1", "Gemini-1"]
+    # Usage is kept for the unchanged key and dropped for the rotated one
+    assert len(manager.usage_tracker["Groq-1"]) == 1
+    assert len(manager.usage_tracker["OpenAI-1"]) == 0
+
+
+def test_reload_removes_keys(manager):
+    diff = manager.reload({"OPENAI_API_KEY": "o1"})
+    assert diff["removed"] == ["Groq-1"] and diff["unchanged"] == ["OpenAI-1"]
+    assert manager.get_best_config().name == "OpenAI-1"
+
+
+@pytest.fixture
+def fresh_globals(monkeypatch, tmp_path):
+    env_file = tmp_path / ".env"
+    monkeypatch.setattr(llm_manager, "llm_manager", LLMManager())
+    monkeypatch.setattr(llm_manager, "_initialized", False)
+    monkeypatch.setattr(llm_manager, "_base_environ", {})
+    monkeypatch.setattr(llm_manager, "_env_file", str(env_file))
+    for name in ("GROQ_API_KEY", "OPENAI_API_KEY", "GEMINI_API_KEY", "ANTHROPIC_API_KEY", "KIMI_API_KEY"):
+        monkeypatch.delenv(name, raising=False)
+    return env_file
+
+
+def test_initialize_runs_once(fresh_globals, monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "g1")
+    assert llm_manager.initialize_llm_manager()
+    monkeypatch.setenv("OPENAI_API_KEY", "o1")
+    assert llm_manager.initialize_llm_manager()
+    assert [config.name for config in llm_manager.llm_manager.configs] == ["Groq-1"]
+
+
+@pytest.mark.skipif(llm_manager.dotenv_values is None, reason="python-dotenv not installed")
+def test_reload_reads_env_file_changes(fresh_globals, monkeypatch):
+    monkeypatch.setenv("GROQ_API_KEY", "g1")
+    fresh_globals.write_text("OPENAI_API_KEY=o1\n")
+    monkeypatch.setenv("OPENAI_API_KEY", "o1")  # what load_dotenv put in the environment
+    llm_manager.initialize_llm_manager()
+
+    fresh_globals.write_text("GEMINI_API_KEY=m1\n")
+    diff = llm_manager.reload_llm_manager()
+    assert diff["added"] == ["Gemini-1"]
+    assert diff["removed"] == ["OpenAI-1"]
+    assert diff["unchanged"] == ["Groq-1"]
+
+
+@pytest.fixture
+def tiered(monkeypatch):
+    # get_litellm_config exports the chosen key; keep the test environment untouched
+    for name in ("GROQ_API_KEY", "OPENAI_API_KEY", "ANTHROPIC_API_KEY"):
+        monkeypatch.setenv(name, "")
+    manager = LLMManager()
+    manager.reload({"GROQ_API_KEY": "g1", "OPENAI_API_KEY": "o1", "ANTHROPIC_API_KEY": "a1",
+                    "OPENAI_QUALITY_MODEL": "gpt-4.1"})
+    return manager
+
+
+def test_tier_models(tiered):
+    groq, openai, anthropic = tiered.configs
+    assert groq.tier_models == {"fast": "groq/llama-3.1-8b-instant", "quality": "groq/llama-3.3-70b-versatile"}
+    assert openai.model_for("quality") == "gpt-4.1"
+    assert openai.model_for("fast") == openai.model_for(None) == "gpt-4o-mini"
+    assert anthropic.model_for("unknown") == anthropic.model
+
+
+def test_tiers_prefer_their_providers(tiered):
+    assert tiered.get_best_config(tier="fast").name == "Groq-1"
+    assert tiered.get_best_config(tier="quality").name == "OpenAI-1"
+    assert tiered.get_best_config().name == "OpenAI-1"
+    assert tiered.get_best_config(tier="quality", exclude=["OpenAI-1"]).name == "Anthropic-1"
+    # A tier model selects the config that serves it
+    assert tiered.get_best_config(model="groq/llama-3.3-70b-versatile").name == "Groq-1"
+
+
+def test_litellm_config_uses_tier_model(tiered):
+    config = tiered.get_litellm_config(tier="quality")
+    assert (config["name"], config["model"], config["tier"]) == ("OpenAI-1", "gpt-4.1", "quality")
+    assert tiered.get_litellm_config(tier="fast")["model"] == "groq/llama-3.1-8b-instant"
+
+
+def test_rate_limited_tier_provider_falls_back(tiered):
+    groq = tiered.configs[0]
+    for _ in range(int(groq.rate_limit_per_minute * 0.8)):
+        tiered._record_usage(groq)
+    assert tiered.get_best_config(tier="fast").name == "OpenAI-1"
+
+
+def test_cache_breakpoints_only_for_explicit_cache_providers(tiered, monkeypatch):
+    monkeypatch.setattr(llm_manager, "PROMPT_CACHING", True)
+    assert not tiered.get_litellm_config(tier="fast")["cache_breakpoints"]
+    assert tiered.get_litellm_config(model="claude-3-haiku-20240307")["cache_breakpoints"]
+
+
+def test_status_reports_prompt_cache_hit_rate(tiered):
+    tiered.record_prompt_tokens("OpenAI-1", 1000, 250)
+    tiered.record_prompt_tokens("OpenAI-1", 1000, 750)
+    status = {config["name"]: config for config in tiered.get_status()["configs"]}
+    assert status["OpenAI-1"]["prompt_tokens"] == 2000
+    assert status["OpenAI-1"]["cached_prompt_tokens"] == 1000
+    assert status["OpenAI-1"]["prompt_cache_hit_rate"] == "50.0%"
+    assert status["Groq-1"]["prompt_cache_hit_rate"] == "0.0%"
@@ -0,0 +1,88 @@
+"""ManagedLLM config switching (user-034) and prompt caching (user-048)"""
+
+from types import SimpleNamespace
+
+from firstcrew import managed_llm
+from litellm import Usage
+
+from firstcrew.managed_llm import ManagedLLM, add_cache_breakpoints, cached_prompt_tokens
+
+
+def test_use_config_recomputes_provider_state():
+    llm = ManagedLLM(config_name="openai", model="gpt-4o-mini", api_key="sk-test")
+    assert not llm.is_anthropic
+    assert llm.get_context_window_size() > 0
+
+    llm._use_config({"name": "anthropic", "model": "anthropic/claude-3-5-haiku-latest",
+                     "api_key": "sk-ant-test", "cache_breakpoints": True})
+
+    assert llm.config_name == "anthropic"
+    assert llm.is_anthropic
+    assert llm.cache_breakpoints
+    assert llm.context_window_size == 0
+
+
+def test_use_config_back_to_openai():
+    llm = ManagedLLM(config_name="anthropic", model="anthropic/claude-3-5-haiku-latest", api_key="k")
+    assert llm.is_anthropic
+    llm._use_config({"name": "openai", "model": "gpt-4o-mini", "api_key": "k", "base_url": None})
+    assert not llm.is_anthropic
+    assert not llm.cache_breakpoints
+
+
+def test_switch_tier_follows_the_task(monkeypatch):
+    requested = []
+
+    def fake_config(model=None, tier=None):
+        requested.append(tier)
+        return {"name": f"{tier}-config", "model": f"{tier}-model", "api_key": "k"}
+
+    monkeypatch.setattr(managed_llm, "get_dynamic_llm_config", fake_config)
+    llm = ManagedLLM(config_name="fast-config", tier="fast", task_tiers={"reporting_task": "quality"},
+                     model="gpt-4o-mini", api_key="k")
+
+    llm._switch_tier(SimpleNamespace(name="research_task"))
+    assert requested == []  # already on the agent's tier
+
+    llm._switch_tier(SimpleNamespace(name="reporting_task"))
+    assert (llm.active_tier, llm.config_name, llm.model) == ("quality", "quality-config", "quality-model")
+
+    llm._switch_tier(None)
+    assert llm.active_tier == "fast"
+    assert requested == ["quality", "fast"]
+
+
+def test_switch_tier_keeps_config_when_none_available(monkeypatch):
+    def no_config(model=None, tier=None):
+        raise Exception("No LLM configurations available")
+
+    monkeypatch.setattr(managed_llm, "get_dynamic_llm_config", no_config)
+    llm = ManagedLLM(config_name="openai", tier="fast", task_tiers={"reporting_task": "quality"},
+                     model="gpt-4o-mini", api_key="k")
+    llm._switch_tier(SimpleNamespace(name="reporting_task"))
+    assert (llm.active_tier, llm.config_name) == ("fast", "openai")
+
+
+def test_cache_breakpoints_mark_system_prompt_and_newest_message():
+    messages = [
+        {"role": "system", "content": "You are a researcher"},
+        {"role": "user", "content": "Task"},
+        {"role": "assistant", "content": "Thought"},
+        {"role": "user", "content": "Observation"},
+    ]
+    marked = add_cache_breakpoints(messages)
+    breakpoint = {"type": "ephemeral"}
+    assert marked[0]["content"] == [{"type": "text", "text": "You are a researcher", "cache_control": breakpoint}]
+    assert marked[1] is messages[1] and marked[2] is messages[2]
+    assert marked[3]["content"][0]["cache_control"] == breakpoint
+    assert messages[0]["content"] == "You are a researcher"  # input left untouched
+    assert add_cache_breakpoints("plain prompt") == "plain prompt"
+
+
+def test_cached_prompt_tokens_from_openai_and_anthropic_usage():
+    openai_usage = Usage(prompt_tokens=100, completion_tokens=5,
+                         prompt_tokens_details={"cached_tokens": 64})
+    assert cached_prompt_tokens(openai_usage) == 64
+    anthropic_usage = SimpleNamespace(prompt_tokens_details=None, cache_read_input_tokens=32)
+    assert cached_prompt_tokens(anthropic_usage) == 32
+    assert cached_prompt_tokens(SimpleNamespace()) == 0
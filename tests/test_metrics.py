@@ -0,0 +1,88 @@
+"""Prometheus text rendering of the pipeline metrics (user-030)"""
+
+from types import SimpleNamespace
+
+import web_app
+from firstcrew import metrics
+from firstcrew.metrics import Counter, Gauge, Histogram, MetricsRegistry
+
+
+def test_counter_labels_and_escaping():
+    counter = Counter("calls_total", "Calls", ["config"])
+    counter.inc(config='Groq "1"\n')
+    counter.inc(2.5, config="OpenAI-1")
+    assert counter.render().splitlines() == [
+        "# HELP calls_total Calls",
+        "# TYPE calls_total counter",
+        'calls_total{config="Groq \\"1\\"\\n"} 1',
+        'calls_total{config="OpenAI-1"} 2.5',
+    ]
+    assert counter.get(config="OpenAI-1") == 2.5
+    assert counter.get(config="missing") == 0
+
+
+def test_gauge_set_and_function():
+    gauge = Gauge("depth", "Depth")
+    assert gauge.samples() == ["depth 0"]
+    gauge.inc(3)
+    gauge.dec()
+    assert gauge.samples() == ["depth 2"]
+    gauge.set_function(lambda: 7)
+    assert gauge.samples() == ["depth 7"]
+
+
+def test_histogram_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ["engine"], buckets=(1, 5))
+    for value in (0.5, 3, 10):
+        histogram.observe(value, engine="google")
+    assert histogram.samples() == [
+        'latency_seconds_bucket{engine="google",le="1"} 1',
+        'latency_seconds_bucket{engine="google",le="5"} 2',
+        'latency_seconds_bucket{engine="google",le="+Inf"} 3',
+        'latency_seconds_sum{engine="google"} 13.5',
+        'latency_seconds_count{engine="google"} 3',
+    ]
+
+
+def test_registry_renders_all_metrics():
+    registry = MetricsRegistry()
+    registry.register(Counter("a_total", "A"))
+    registry.register(Gauge("b", "B"))
+    text = registry.render()
+    assert text.endswith("\n")
+    assert "# TYPE a_total counter" in text and "# TYPE b gauge" in text
+
+
+def test_observe_crew_tasks_strips_topic_from_agent():
+    agent = SimpleNamespace(role="Quantum computing Senior Data Researcher")
+    crew = SimpleNamespace(tasks=[
+        SimpleNamespace(name="research_task", agent=agent, execution_duration=4.0),
+        SimpleNamespace(name="reporting_task", agent=agent, execution_duration=None),
+    ])
+    before = metrics.AGENT_SECONDS.sums.get(("Senior Data Researcher",), 0.0)
+    metrics.observe_crew_tasks(crew, "Quantum computing")
+    assert metrics.AGENT_SECONDS.sums[("Senior Data Researcher",)] == before + 4.0
+    assert metrics.TASK_SECONDS.counts[("research_task", "Senior Data Researcher")][-1] >= 1
+
+
+def test_metrics_endpoint():
+    response = web_app.app.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == metrics.CONTENT_TYPE
+    assert "# TYPE research_queue_depth gauge" in response.get_data(as_text=True)
+
+
+def test_broker_mode_reports_queue_gauges(tmp_path, monkeypatch):
+    from firstcrew.job_queue import SQLiteBroker
+
+    monkeypatch.setattr(metrics.QUEUE_DEPTH, "function", None)
+    monkeypatch.setattr(metrics.ACTIVE_WORKERS, "function", None)
+    broker = SQLiteBroker(str(tmp_path / "jobs.db"))
+    for job_id in ("j1", "j2", "j3"):
+        broker.submit(job_id, {"topic": job_id})
+    broker.claim("w1")
+
+    web_app.export_queue_metrics(broker)
+    body = web_app.app.test_client().get("/metrics").get_data(as_text=True)
+    assert "research_queue_depth 2" in body
+    assert "research_active_workers 1" in body
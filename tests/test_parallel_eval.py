@@ -0,0 +1,57 @@
+"""Parallel crew test/train helpers (user-039)"""
+
+import contextvars
+import inspect
+from types import SimpleNamespace
+
+import pytest
+
+from firstcrew import parallel_eval
+
+
+def test_defaults_match_sequential_crew():
+    for fn in (parallel_eval.parallel_test, parallel_eval.parallel_train):
+        assert inspect.signature(fn).parameters["crew_name"].default == "basic"
+
+
+def test_installed_crewai_has_required_internals():
+    parallel_eval.check_crewai_internals()
+
+
+def test_missing_internals_fail_loudly(monkeypatch):
+    from crewai import Crew
+    monkeypatch.delitem(Crew.__private_attributes__, "_train_iteration")
+    with pytest.raises(RuntimeError, match="Crew._train_iteration"):
+        parallel_eval.check_crewai_internals()
+
+
+def test_llm_configs_assigned_round_robin(monkeypatch):
+    from firstcrew import llm_manager
+    monkeypatch.setattr(llm_manager, "get_llm_config_names", lambda: ["a", "b"])
+    assert parallel_eval._assign_llm_configs(5) == ["a", "b", "a", "b", "a"]
+    monkeypatch.setattr(llm_manager, "get_llm_config_names", lambda: [])
+    assert parallel_eval._assign_llm_configs(2) == [None, None]
+
+
+def test_basic_crew_iterations_get_different_keys(monkeypatch):
+    from crewai import LLM
+    from firstcrew import llm_manager
+    from firstcrew.llm_manager import LLMManager
+
+    for name in ("GROQ_API_KEY", "OPENAI_API_KEY"):
+        monkeypatch.setenv(name, "")  # get_litellm_config exports the chosen key
+    manager = LLMManager()
+    manager.reload({"GROQ_API_KEY": "g1", "GROQ_API_KEY_2": "g2", "OPENAI_API_KEY": "o1"})
+    monkeypatch.setattr(llm_manager, "llm_manager", manager)
+    monkeypatch.setattr(llm_manager, "_initialized", True)
+
+    factory = SimpleNamespace(create=lambda: SimpleNamespace(
+        agents=[SimpleNamespace(llm=LLM(model="gpt-4o-mini")), SimpleNamespace(llm=None)]
+    ))
+    configs = parallel_eval._assign_llm_configs(3)
+    crews = [contextvars.copy_context().run(parallel_eval._pinned_crew, factory, name) for name in configs]
+
+    assert configs == ["Groq-1", "Groq-2", "OpenAI-1"]
+    assert [[agent.llm.api_key for agent in crew.agents] for crew in crews] == \
+        [["g1", "g1"], ["g2", "g2"], ["o1", "o1"]]
+    assert crews[2].agents[0].llm.model == "gpt-4o-mini"
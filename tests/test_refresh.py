@@ -0,0 +1,70 @@
+"""Incremental refresh: previous report lookup and section merging (user-043)"""
+
+from types import SimpleNamespace
+
+from firstcrew.refresh import apply_refresh, find_previous_report, merge_sections, refresh_inputs
+from firstcrew.report_store import ReportStore
+
+PREVIOUS = (
+    "# Report on AI\n\nIntro.\n\n"
+    "## Agents\n\nOld agents text.\n\n"
+    "## Chips\n\nOld chips text.\n"
+)
+
+
+def test_changed_section_replaces_existing_one():
+    merged = merge_sections(PREVIOUS, "Here are the updates.\n\n## agents\n\nNew agents text.\n")
+    assert "New agents text." in merged and "Old agents text." not in merged
+    assert "Old chips text." in merged
+    assert "Here are the updates." not in merged
+    assert merged.index("## agents") < merged.index("## Chips")
+
+
+def test_new_section_is_appended():
+    merged = merge_sections(PREVIOUS, "## Robotics\n\nHumanoids.\n")
+    assert merged.endswith("## Robotics\n\nHumanoids.\n")
+    assert merged.startswith(PREVIOUS.rstrip())
+
+
+def test_patch_at_another_heading_level():
+    merged = merge_sections(PREVIOUS, "### Chips\n\nNew chips text.\n")
+    assert "New chips text." in merged and "Old chips text." not in merged
+
+
+def test_patch_without_headings_becomes_latest_updates():
+    merged = merge_sections(PREVIOUS, "Two new models shipped.")
+    assert merged.endswith("## Latest updates\n\nTwo new models shipped.\n")
+
+
+def test_no_changes_keeps_previous_report():
+    assert merge_sections(PREVIOUS, "NO CHANGES since the last report") == PREVIOUS
+    assert merge_sections(PREVIOUS, "  ") == PREVIOUS
+
+
+def test_find_previous_report_and_inputs(tmp_path):
+    store = ReportStore(str(tmp_path / "reports"))
+    assert find_previous_report(store, "AI") is None
+    store.put("t1", "# Old", topic="AI")
+    store.index["t1"]["created_at"] -= 86400
+    store.put("t2", PREVIOUS, topic="AI")
+    store.put("t3", "# Other", topic="Fusion")
+
+    previous = find_previous_report(store, "AI")
+    assert previous["task_id"] == "t2"
+    inputs = refresh_inputs(previous)
+    assert inputs["previous_outline"] == "- Agents\n- Chips"
+    assert inputs["last_run_date"] == previous["created_at"].date().isoformat()
+    assert inputs["previous_report"] == PREVIOUS
+
+
+def test_apply_refresh_switches_task_prompts():
+    task = SimpleNamespace(name="research_task", description="full", expected_output="findings",
+                           output_pydantic=object())
+    other = SimpleNamespace(name="custom_task", description="keep", expected_output="keep",
+                            output_pydantic=None)
+    crew = SimpleNamespace(tasks=[task, other])
+    apply_refresh(crew, {"research_task": {"refresh_description": "since {last_run_date}",
+                                           "refresh_expected_output": "changes or NO CHANGES"}})
+    assert (task.description, task.expected_output, task.output_pydantic) == \
+        ("since {last_run_date}", "changes or NO CHANGES", None)
+    assert other.description == "keep"
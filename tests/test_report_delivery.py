@@ -0,0 +1,88 @@
+"""Report shaping and conditional, compressed and ranged responses (user-040)"""
+
+import gzip
+
+import pytest
+from flask import Flask, request
+from werkzeug.datastructures import MultiDict
+
+from firstcrew.report_delivery import (
+    conditional_response, make_etag, select_sections, shape_content, split_sections, truncate
+)
+
+REPORT = (
+    "# Report on AI\n\nIntro.\n\n"
+    "## Agents\n\nAgents text.\n\n"
+    "### Detail\n\nNested.\n\n"
+    "## Chips\n\nChips text.\n"
+)
+BODY = ("line of report text\n" * 100).encode()
+ETAG = make_etag("task-1", "report")
+
+
+@pytest.fixture
+def client():
+    app = Flask(__name__)
+
+    @app.route("/report")
+    def report():
+        return conditional_response(request, BODY, "text/markdown", ETAG,
+                                    last_modified=1_700_000_000, accept_ranges=True)
+
+    return app.test_client()
+
+
+def test_split_and_select_sections():
+    assert [heading for heading, _ in split_sections(REPORT)] == ["", "Agents", "Chips"]
+    assert select_sections(REPORT, ["2"]) == "## Chips\n\nChips text.\n"
+    assert select_sections(REPORT, ["agents"]).startswith("## Agents") and "Nested." in select_sections(REPORT, ["agents"])
+    assert select_sections(REPORT, ["missing"]) == ""
+
+
+def test_truncate_prefers_paragraph_breaks():
+    text = "a" * 60 + "\n\n" + "b" * 60
+    assert truncate(text, 100) == ("a" * 60, True)
+    assert truncate(text, 0) == (text, False)
+    assert truncate("x" * 50, 10) == ("x" * 10, True)
+
+
+def test_shape_content():
+    shaped = shape_content(REPORT, MultiDict([("section", "agents,chips"), ("max_chars", "20")]))
+    assert shaped["sections"] == ["agents", "chips"]
+    assert shaped["truncated"]
+    assert len(shaped["content"]) <= 20
+
+
+def test_make_etag_is_stable():
+    assert make_etag("a", 1) == make_etag("a", 1) != make_etag("a", 2)
+
+
+def test_etag_and_not_modified(client):
+    response = client.get("/report")
+    assert response.status_code == 200
+    assert response.get_data() == BODY
+    assert response.headers["ETag"] == f'"{ETAG}"'
+    assert "no-cache" in response.headers["Cache-Control"]
+
+    assert client.get("/report", headers={"If-None-Match": f'"{ETAG}"'}).status_code == 304
+    assert client.get("/report", headers={"If-None-Match": '"stale"'}).status_code == 200
+    cached = client.get("/report", headers={"If-Modified-Since": response.headers["Last-Modified"]})
+    assert cached.status_code == 304
+
+
+def test_gzip_negotiation(client):
+    response = client.get("/report", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["ETag"] == f'"{ETAG}-gzip"'
+    assert gzip.decompress(response.get_data()) == BODY
+    # The compressed variant revalidates too
+    assert client.get("/report", headers={"If-None-Match": f'"{ETAG}-gzip"'}).status_code == 304
+    assert "Content-Encoding" not in client.get("/report", headers={"Accept-Encoding": "gzip;q=0"}).headers
+
+
+def test_range_requests_are_served_uncompressed(client):
+    response = client.get("/report", headers={"Range": "bytes=0-9", "Accept-Encoding": "gzip"})
+    assert response.status_code == 206
+    assert response.get_data() == BODY[:10]
+    assert response.headers["Content-Range"] == f"bytes 0-9/{len(BODY)}"
+    assert "Content-Encoding" not in response.headers
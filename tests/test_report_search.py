@@ -0,0 +1,65 @@
+"""Full-text search over past reports (user-042)"""
+
+import pytest
+
+from firstcrew.report_search import ReportIndex, build_match_query, sync_index
+from firstcrew.report_store import ReportStore
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = ReportIndex(str(tmp_path / "search.db"))
+    index.add("t1", "Kubernetes autoscaling", "Cluster autoscalers resize node pools.", "2025-01-01T00:00:00")
+    index.add("t2", "Serverless platforms", "Some teams run Kubernetes under serverless platforms.",
+              "2025-01-02T00:00:00")
+    index.add("t3", "Quantum computing", "Error correction milestones.", "2025-01-03T00:00:00")
+    return index
+
+
+def test_build_match_query_quotes_words_and_prefixes_the_last():
+    assert build_match_query("kubern") == '"kubern"*'
+    assert build_match_query('AI OR "chips" NEAR(') == '"AI" "OR" "chips" "NEAR"*'
+    assert build_match_query("  ?! ") is None
+
+
+def test_topic_matches_rank_above_body_matches(index):
+    # bm25 needs the term to be rare in the corpus to score it
+    for n in range(4):
+        index.add(f"other{n}", f"Other topic {n}", "Unrelated text.", "2025-01-04T00:00:00")
+    result = index.search("kubernetes")
+    assert [r["task_id"] for r in result["results"]] == ["t1", "t2"]
+    assert result["results"][0]["score"] > result["results"][1]["score"]
+    assert "**Kubernetes**" in result["results"][1]["snippet"]
+
+
+def test_prefix_stemming_and_all_words(index):
+    assert [r["task_id"] for r in index.search("autoscal")["results"]] == ["t1"]
+    assert index.search("kubernetes quantum")["total"] == 0
+    assert index.search("")["results"] == []
+
+
+def test_paging(index):
+    index.add("t4", "Kubernetes costs", "Kubernetes spend.", "2025-01-04T00:00:00")
+    first = index.search("kubernetes", limit=2)
+    assert first["total"] == 3 and len(first["results"]) == 2 and first["next_offset"] == 2
+    last = index.search("kubernetes", limit=2, offset=2)
+    assert len(last["results"]) == 1 and last["next_offset"] is None
+
+
+def test_reindex_replaces_and_remove_drops(index):
+    index.add("t3", "Quantum networking", "Entanglement distribution.", "2025-01-05T00:00:00")
+    assert index.search("error correction")["total"] == 0
+    assert index.search("entanglement")["results"][0]["task_id"] == "t3"
+    index.remove(["t3"])
+    assert index.task_ids() == {"t1", "t2"}
+
+
+def test_sync_index_follows_the_store(tmp_path):
+    store = ReportStore(str(tmp_path / "reports"))
+    index = ReportIndex(str(tmp_path / "search.db"))
+    store.put("t1", "# Fusion\nTokamak records.", topic="Fusion")
+    index.add("gone", "Old", "Deleted report.", "2024-01-01T00:00:00")
+
+    assert sync_index(index, store) == {"added": 1, "removed": 1}
+    assert index.search("tokamak")["results"][0]["topic"] == "Fusion"
+    assert sync_index(index, store) == {"added": 0, "removed": 0}
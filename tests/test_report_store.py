@@ -0,0 +1,119 @@
+"""Content-addressed report store (user-041)"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from firstcrew import report_store
+from firstcrew.report_store import ReportStore, _BodyCache
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ReportStore(str(tmp_path / "reports"))
+
+
+def object_files(store):
+    return [path for path in Path(store.objects_dir).rglob("*") if path.is_file()]
+
+
+def test_identical_reports_share_one_object(store):
+    first = store.put("t1", "# Report\nsame", topic="AI")
+    second = store.put("t2", "# Report\nsame", topic="AI")
+    assert first["digest"] == second["digest"]
+    assert len(object_files(store)) == 1
+    assert store.get("t2") == "# Report\nsame"
+
+
+def test_findings_stored_with_report(store):
+    store.put("t1", "body", findings=[{"claim": "x"}])
+    assert store.get_findings("t1") == [{"claim": "x"}]
+    assert store.entry("t1")["findings"] == 1
+    assert store.get_findings("missing") is None
+
+
+def test_index_survives_reopen(store):
+    store.put("t1", "body", topic="AI")
+    reopened = ReportStore(store.root)
+    assert reopened.get("t1") == "body"
+    assert reopened.latest_for_topic(" ai ")[0] == "t1"
+
+
+def test_compact_removes_unreferenced_objects(store):
+    store.put("t1", "keep")
+    store.put("t2", "drop", findings=[{"claim": "y"}])
+    store.delete("t2")
+    assert store.compact() == {"expired": 0, "removed_objects": 2}
+    assert store.get("t1") == "keep"
+    assert len(object_files(store)) == 1
+
+
+def test_compact_expires_old_reports(store):
+    store.put("old", "old body")
+    store.index["old"]["created_at"] = time.time() - 3 * 86400
+    store.put("new", "new body")
+    expired = []
+    result = store.compact(retention_days=1, on_expired=expired.extend)
+    assert result == {"expired": 1, "removed_objects": 1}
+    assert expired == ["old"]
+    assert store.get("old") is None and store.get("new") == "new body"
+
+
+def test_put_keeps_object_compaction_removes_meanwhile(store, monkeypatch):
+    # t1's object is unreferenced once it is deleted; t2 stores the same content
+    store.put("t1", "shared body")
+    store.delete("t1")
+
+    original_prepare = store._prepare_object
+    def prepare_then_compact(body):
+        prepared = original_prepare(body)
+        # The object exists now, but a compaction finishes before put takes the lock
+        store.compact()
+        return prepared
+    monkeypatch.setattr(store, "_prepare_object", prepare_then_compact)
+
+    store.put("t2", "shared body")
+    store.cache = _BodyCache(1024)
+    assert store.get("t2") == "shared body"
+
+
+def test_compaction_waits_for_put_in_progress(store, monkeypatch):
+    store.put("t1", "shared body")
+    store.delete("t1")
+    compaction = threading.Thread(target=store.compact)
+
+    original_write = store._write_object
+    def write_while_compacting(*args):
+        compaction.start()
+        # compact() blocks on the lock put holds
+        compaction.join(timeout=0.2)
+        return original_write(*args)
+    monkeypatch.setattr(store, "_write_object", write_while_compacting)
+
+    store.put("t2", "shared body")
+    compaction.join()
+    store.cache = _BodyCache(1024)
+    assert store.get("t2") == "shared body"
+
+
+def test_body_cache_evicts_least_recently_used():
+    cache = _BodyCache(10)
+    cache.put("a", b"aaaa")
+    cache.put("b", b"bbbb")
+    assert cache.get("a") == b"aaaa"
+    cache.put("c", b"cccc")
+    assert cache.get("b") is None
+    assert cache.get("a") == b"aaaa" and cache.get("c") == b"cccc"
+    assert cache.size == 8
+    cache.put("huge", b"x" * 11)
+    assert cache.get("huge") is None
+
+
+def test_gzip_fallback_reads_back(store, monkeypatch):
+    monkeypatch.setattr(report_store, "zstandard", None)
+    store.put("t1", "gzip body")
+    assert all(path.suffix == ".gz" for path in object_files(store))
+    store.cache = _BodyCache(1024)
+    assert store.get("t1") == "gzip body"
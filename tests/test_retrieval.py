@@ -0,0 +1,119 @@
+"""Retrieval index over prior reports (user-044)"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from firstcrew import retrieval
+from firstcrew.retrieval import RetrievalIndex, chunk_text, hash_embedding, sync_reports
+
+
+class FakeStore:
+    def __init__(self, reports):
+        self.reports = reports
+
+    def entries(self):
+        return {task_id: {"topic": topic} for task_id, (topic, _) in self.reports.items()}
+
+    def get(self, task_id):
+        return self.reports[task_id][1]
+
+
+@pytest.fixture
+def index_path(tmp_path):
+    return str(tmp_path / "retrieval.db")
+
+
+def test_import_does_not_load_numpy():
+    code = "import sys, firstcrew.retrieval; print('numpy' in sys.modules)"
+    src = os.path.join(os.path.dirname(__file__), "..", "src")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60,
+                            env={**os.environ, "PYTHONPATH": src})
+    assert result.stdout.strip() == "False", result.stderr
+
+
+def test_chunks_overlap_and_respect_size():
+    text = "\n\n".join(f"Paragraph {i} " + "word " * 60 for i in range(10))
+    chunks = chunk_text(text, chunk_chars=500, overlap=100)
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 500 for chunk in chunks)
+    assert chunks[0][-100:] in chunks[1]
+
+
+def test_hash_embedding_is_normalized_and_deterministic():
+    vectors = hash_embedding(["vector databases", "vector databases", ""])
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1.0, atol=1e-5)
+    assert np.array_equal(vectors[0], vectors[1])
+    assert not vectors[2].any()
+
+
+def test_unchanged_source_is_not_reindexed(index_path):
+    index = RetrievalIndex(index_path)
+    assert index.index_source("report:t1", "Vector databases grow fast", title="Vectors")
+    assert not index.index_source("report:t1", "Vector databases grow fast", title="Vectors")
+    assert index.search("vector databases", min_score=0.1)[0]["source"] == "report:t1"
+
+
+def test_model_change_reembeds_sources(index_path, monkeypatch):
+    RetrievalIndex(index_path).index_source("report:t1", "Vector databases grow fast")
+
+    index = RetrievalIndex(index_path, model="openai/text-embedding-3-small")
+    embedded = []
+    def fake_embedding(texts, model):
+        embedded.extend(texts)
+        return hash_embedding(texts)
+    monkeypatch.setattr(retrieval, "model_embedding", fake_embedding)
+
+    assert index.sources("report:", current=True) == []
+    assert index.index_source("report:t1", "Vector databases grow fast")
+    assert embedded == ["Vector databases grow fast"]
+    assert index.sources("report:", current=True) == ["report:t1"]
+
+
+def test_sync_reports_reindexes_stale_and_drops_removed(index_path, monkeypatch):
+    old = RetrievalIndex(index_path)
+    old.index_source("report:t1", "first report")
+    old.index_source("report:gone", "removed report")
+
+    index = RetrievalIndex(index_path, model="other-model")
+    monkeypatch.setattr(retrieval, "model_embedding", lambda texts, model: hash_embedding(texts))
+    store = FakeStore({"t1": ("First", "first report"), "t2": ("Second", "second report")})
+
+    assert sync_reports(index, store) == 3
+    assert sorted(index.sources("report:", current=True)) == ["report:t1", "report:t2"]
+    assert sync_reports(index, store) == 0
+
+
+def test_opens_index_without_model_column(index_path):
+    conn = sqlite3.connect(index_path)
+    conn.execute("CREATE TABLE sources (source TEXT PRIMARY KEY, content_hash TEXT NOT NULL, "
+                 "title TEXT, updated_at REAL NOT NULL)")
+    conn.execute("INSERT INTO sources VALUES ('report:t1', 'abc', 'T', 0)")
+    conn.commit()
+    conn.close()
+
+    index = RetrievalIndex(index_path)
+    assert index.sources("report:") == ["report:t1"]
+    assert index.sources("report:", current=True) == []
+
+
+def test_prior_findings_with_braced_topic_survive_interpolation():
+    from crewai import Task
+
+    task = Task(name="research_task", description="Research {topic}", expected_output="Findings")
+    passages = [
+        {"title": "Report on {quantum} computing", "source": "report:t1", "text": "Qubits {doubled}."},
+        {"title": "", "source": "notes/{draft}.md", "text": "Error rates fell."},
+    ]
+    assert retrieval.add_prior_findings(SimpleNamespace(tasks=[task]), "{quantum} computing",
+                                        passages=passages) == 2
+
+    task.interpolate_inputs_and_add_conversation_history({"topic": "{quantum} computing"})
+    assert task.description.startswith("Research {quantum} computing")
+    assert "[Report on (quantum) computing]\nQubits (doubled)." in task.description
+    assert "[notes/(draft).md]" in task.description
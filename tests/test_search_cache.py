@@ -0,0 +1,65 @@
+"""SerpAPI result cache of the search tools (user-030)"""
+
+import pytest
+
+from firstcrew.tools import search_tool
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+@pytest.fixture
+def serp_calls(monkeypatch):
+    calls = []
+
+    def fake_get(url, params):
+        calls.append(params)
+        return FakeResponse({"n": len(calls)})
+
+    monkeypatch.setattr(search_tool.requests, "get", fake_get)
+    monkeypatch.setattr(search_tool, "_serp_cache", search_tool.OrderedDict())
+    return calls
+
+
+def test_cache_is_off_by_default(serp_calls, monkeypatch):
+    monkeypatch.setattr(search_tool, "SERP_CACHE_TTL", 0)
+    params = {"q": "ai agents", "api_key": "k"}
+    assert search_tool.serp_search(params, "google") == {"n": 1}
+    assert search_tool.serp_search(params, "google") == {"n": 2}
+    assert not search_tool._serp_cache
+
+
+def test_cache_hit_ignores_api_key(serp_calls, monkeypatch):
+    monkeypatch.setattr(search_tool, "SERP_CACHE_TTL", 60)
+    first = search_tool.serp_search({"q": "ai agents", "api_key": "old"}, "google")
+    second = search_tool.serp_search({"q": "ai agents", "api_key": "new"}, "google")
+    assert first == second == {"n": 1}
+    assert len(serp_calls) == 1
+
+
+def test_cache_entries_expire(serp_calls, monkeypatch):
+    monkeypatch.setattr(search_tool, "SERP_CACHE_TTL", 60)
+    now = [1000.0]
+    monkeypatch.setattr(search_tool.time, "time", lambda: now[0])
+    search_tool.serp_search({"q": "ai agents"}, "google")
+    now[0] += 61
+    assert search_tool.serp_search({"q": "ai agents"}, "google") == {"n": 2}
+
+
+def test_cache_evicts_least_recently_used(serp_calls, monkeypatch):
+    monkeypatch.setattr(search_tool, "SERP_CACHE_TTL", 60)
+    monkeypatch.setattr(search_tool, "SERP_CACHE_SIZE", 2)
+    for query in ("a", "b", "a", "c"):
+        search_tool.serp_search({"q": query}, "google")
+    assert len(serp_calls) == 3
+    search_tool.serp_search({"q": "a"}, "google")
+    search_tool.serp_search({"q": "b"}, "google")
+    assert [params["q"] for params in serp_calls] == ["a", "b", "c", "b"]
@@ -0,0 +1,50 @@
+"""Channel, principal and priority of /start_research come from the caller (user-036)"""
+
+import pytest
+
+import web_app
+
+
+class MemoryTaskStore:
+    def save_task(self, task_id, task):
+        pass
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(web_app, "TRUSTED_CALLERS", {"slack": "slack-secret"})
+    monkeypatch.setattr(web_app, "get_task_store", MemoryTaskStore)
+    monkeypatch.setattr(web_app, "dispatch_research", lambda task_id, budget: None)
+    monkeypatch.setattr(web_app, "queued_for", lambda principal: 0)
+    return web_app.app.test_client()
+
+
+def submitted(response):
+    assert response.status_code == 200, response.get_json()
+    return web_app.research_tasks[response.get_json()["task_id"]]
+
+
+def test_untrusted_request_ignores_channel_and_user(client):
+    task = submitted(client.post("/start_research", json={
+        "topic": "x", "channel": "slack", "user_id": "someone-else",
+    }, environ_base={"REMOTE_ADDR": "10.0.0.7"}))
+    assert task["principal"] == "api:10.0.0.7"
+    assert task["priority"] == "normal"
+
+
+def test_untrusted_request_cannot_raise_priority(client):
+    response = client.post("/start_research", json={"topic": "x", "priority": "interactive"})
+    assert response.status_code == 403
+    assert submitted(client.post("/start_research", json={"topic": "x", "priority": "batch"}))["priority"] == "batch"
+
+
+def test_trusted_caller_sets_user_and_priority(client):
+    headers = {"Authorization": "Bearer slack-secret"}
+    task = submitted(client.post("/start_research", json={"topic": "x", "user_id": "U1"}, headers=headers))
+    assert task["principal"] == "slack:U1"
+    assert task["priority"] == "interactive"
+
+
+def test_wrong_token_is_rejected(client):
+    response = client.post("/start_research", json={"topic": "x"}, headers={"Authorization": "Bearer nope"})
+    assert response.status_code == 401
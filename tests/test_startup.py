@@ -0,0 +1,33 @@
+"""Cold start regression checks for web_app (user-028)"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Median seconds until /healthz answers; generous for slow CI machines
+STARTUP_MAX_SECONDS = os.getenv("STARTUP_MAX_SECONDS", "5")
+
+
+def test_web_app_import_skips_heavy_modules():
+    code = (
+        "import sys, web_app; "
+        "print('loaded:', [m for m in ('crewai', 'litellm', 'numpy', 'firstcrew.retrieval') if m in sys.modules])"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=PROJECT_DIR, capture_output=True,
+                            text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert "loaded: []" in result.stdout.splitlines()
+
+
+@pytest.mark.skipif(os.getenv("SKIP_STARTUP_BENCHMARK") == "1", reason="SKIP_STARTUP_BENCHMARK=1")
+def test_startup_within_budget(tmp_path):
+    result = subprocess.run(
+        [sys.executable, os.path.join(PROJECT_DIR, "benchmarks", "startup_benchmark.py"),
+         "--runs", "3", "--max-seconds", STARTUP_MAX_SECONDS, "--workdir", str(tmp_path)],
+        capture_output=True, text=True, timeout=600,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
@@ -0,0 +1,73 @@
+"""Task records, crew task checkpoints and resuming from them (user-037)"""
+
+from types import SimpleNamespace
+
+from crewai.tasks.task_output import TaskOutput
+from crewai.utilities.constants import NOT_SPECIFIED
+
+from firstcrew.task_store import TaskStore, apply_checkpoints, checkpoint_callback
+
+
+def fake_crew(*names):
+    return SimpleNamespace(tasks=[SimpleNamespace(name=name, context=NOT_SPECIFIED, output=None)
+                                  for name in names])
+
+
+def checkpoint(name, raw):
+    return {"name": name, "description": f"{name} description", "agent": "Researcher", "raw": raw}
+
+
+def test_records_and_outputs_round_trip(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    store = TaskStore(path)
+    store.save_task("t1", {"status": "running", "topic": "AI"})
+    store.save_task("t2", {"status": "queued", "topic": "Fusion"})
+    store.save_task("t1", {"status": "completed", "topic": "AI"})
+    store.save_output("t2", "reporting_task", 1, checkpoint("reporting_task", "report"))
+    store.save_output("t2", "research_task", 0, checkpoint("research_task", "findings"))
+
+    reopened = TaskStore(path)
+    assert reopened.load_tasks() == {"t1": {"status": "completed", "topic": "AI"},
+                                     "t2": {"status": "queued", "topic": "Fusion"}}
+    assert list(reopened.load_outputs("t2")) == ["research_task", "reporting_task"]
+    reopened.delete_outputs("t2")
+    assert reopened.load_outputs("t2") == {}
+
+
+def test_checkpoint_callback_saves_each_finished_task(tmp_path):
+    store = TaskStore(str(tmp_path / "tasks.db"))
+    crew = fake_crew("research_task", "reporting_task")
+    callback = checkpoint_callback(store, "t1", crew)
+    callback(TaskOutput(name="reporting_task", description="d", agent="Analyst", raw="report"))
+    callback(TaskOutput(name="research_task", description="d", agent="Researcher", raw="findings"))
+
+    outputs = store.load_outputs("t1")
+    assert list(outputs) == ["research_task", "reporting_task"]
+    assert outputs["research_task"]["raw"] == "findings"
+
+
+def test_apply_checkpoints_skips_finished_tasks():
+    crew = fake_crew("research_task", "reporting_task")
+    research, reporting = crew.tasks
+
+    restored = apply_checkpoints(crew, {"research_task": checkpoint("research_task", "findings")})
+
+    assert [output.raw for output in restored] == ["findings"]
+    assert research.output.raw == "findings"
+    assert crew.tasks == [reporting]
+    assert reporting.context == [research]
+
+
+def test_apply_checkpoints_keeps_explicit_context():
+    crew = fake_crew("research_task", "reporting_task", "review_task")
+    crew.tasks[2].context = []
+    apply_checkpoints(crew, {"research_task": checkpoint("research_task", "a"),
+                             "reporting_task": checkpoint("reporting_task", "b")})
+    assert [task.name for task in crew.tasks] == ["review_task"]
+    assert crew.tasks[0].context == []
+
+
+def test_apply_checkpoints_only_skips_leading_tasks():
+    crew = fake_crew("research_task", "reporting_task")
+    assert apply_checkpoints(crew, {"reporting_task": checkpoint("reporting_task", "report")}) is None
+    assert len(crew.tasks) == 2
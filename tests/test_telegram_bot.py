@@ -0,0 +1,23 @@
+"""Markdown escaping of Telegram search results (user-042)"""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("telegram")
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "bots"))
+
+from telegram_bot import markdown_snippet  # noqa: E402
+
+
+def test_snippet_keeps_highlights_bold():
+    assert markdown_snippet("uses **vector** search") == "uses *vector* search"
+
+
+def test_snippet_escapes_report_markdown():
+    assert markdown_snippet("gpt_4 [beta] *new*") == r"gpt\_4 \[beta] \*new\*"
+
+
+def test_unbalanced_highlight_stays_valid():
+    assert markdown_snippet("trailing **") == "trailing "
@@ -0,0 +1,116 @@
+"""Per-run token budget: compression, downgrade and abort (user-033)"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from firstcrew.metrics import TOKEN_BUDGET_ACTIONS
+from firstcrew.token_budget import (
+    TokenBudget, TokenBudgetExceeded, create_budget, current_budget, token_budget
+)
+
+
+def conversation(chars):
+    return [
+        {"role": "system", "content": "s" * chars},
+        {"role": "user", "content": "u" * chars},
+        {"role": "assistant", "content": "a" * chars},
+        {"role": "user", "content": "n" * chars},
+    ]
+
+
+def test_no_compression_below_threshold():
+    budget = TokenBudget(1000, compress_at=0.5, max_message_chars=100)
+    budget.record(400, 99)
+    messages = conversation(1000)
+    assert budget.prepare_messages(messages) is messages
+    assert budget.compressed_calls == 0
+
+
+def test_compression_keeps_system_prompt_and_more_of_the_newest_message():
+    budget = TokenBudget(1000, compress_at=0.5, max_message_chars=100)
+    budget.record(400, 100)
+    before = TOKEN_BUDGET_ACTIONS.get(action="compress")
+
+    compressed = budget.prepare_messages(conversation(1000))
+
+    assert compressed[0]["content"] == "s" * 1000
+    assert compressed[1]["content"].startswith("u" * 66) and compressed[1]["content"].endswith("u" * 34)
+    assert "trimmed to fit the token budget" in compressed[1]["content"]
+    assert len(compressed[1]["content"]) < len(compressed[3]["content"]) < 1000
+    assert budget.compressed_calls == 1
+    assert TOKEN_BUDGET_ACTIONS.get(action="compress") == before + 1
+
+
+def test_unlimited_budget_only_tracks_usage():
+    budget = TokenBudget(0)
+    budget.record(10**6, 10**6, cached_tokens=500)
+    messages = conversation(10_000)
+    assert budget.prepare_messages(messages) is messages
+    budget.check()
+    assert budget.downgrade_config(lambda model: {"model": model}) is None
+    assert budget.summary()["cached_prompt_tokens"] == 500
+
+
+def test_abort_mode_raises_once_spent():
+    budget = TokenBudget(100, mode="abort")
+    budget.record(60, 30)
+    budget.check()
+    budget.record(10, 0)
+    with pytest.raises(TokenBudgetExceeded):
+        budget.check()
+    assert budget.aborted
+
+
+def test_downgrade_resolves_once_and_aborts_at_twice_the_budget():
+    budget = TokenBudget(100, mode="downgrade", downgrade_model="cheap-model")
+    resolved = []
+
+    def resolve(model):
+        resolved.append(model)
+        return {"model": model}
+
+    assert budget.downgrade_config(resolve) is None
+    budget.record(80, 30)
+    budget.check()  # overshooting is fine after downgrading
+    assert budget.downgrade_config(resolve) == {"model": "cheap-model"}
+    assert budget.downgrade_config(resolve) == {"model": "cheap-model"}
+    assert resolved == ["cheap-model"]
+    assert budget.downgraded
+
+    budget.record(90, 0)
+    with pytest.raises(TokenBudgetExceeded):
+        budget.check()
+
+
+def test_create_budget_and_context():
+    with pytest.raises(ValueError):
+        TokenBudget(100, mode="ignore")
+    assert create_budget(-5, "abort").max_tokens == 0
+
+    budget = create_budget(500, "abort")
+    assert current_budget() is None
+    with token_budget(budget):
+        assert current_budget() is budget
+    assert current_budget() is None
+
+
+def test_budget_is_ignored_with_a_warning_for_crews_without_managed_llms(monkeypatch, capsys):
+    from crewai import LLM
+
+    from firstcrew import research_run, retrieval
+    from firstcrew.managed_llm import ManagedLLM
+
+    basic = SimpleNamespace(agents=[SimpleNamespace(llm=LLM(model="gpt-4o-mini"))], tasks=[])
+    enhanced = SimpleNamespace(agents=[SimpleNamespace(llm=ManagedLLM(model="gpt-4o-mini", api_key="k"))])
+    assert not research_run.budget_enforced(basic)
+    assert research_run.budget_enforced(enhanced)
+
+    store = SimpleNamespace(load_outputs=lambda task_id: {})
+    monkeypatch.setattr(research_run, "get_crew_factory", lambda crew_class: SimpleNamespace(create=lambda: basic))
+    monkeypatch.setattr(retrieval, "add_prior_findings", lambda crew, topic, passages=None: False)
+    monkeypatch.setattr(research_run, "apply_checkpoints", lambda crew, outputs: [SimpleNamespace(raw="# Done")])
+    content, _ = research_run.execute_research("t1", "AI", None, store, TokenBudget(1000),
+                                               progress=lambda message: None)
+    assert content == "# Done"
+    assert "token budget is only enforced by the enhanced crew" in capsys.readouterr().out
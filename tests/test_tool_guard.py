@@ -0,0 +1,88 @@
+"""Run-scoped search tool guard (user-050)"""
+
+import pytest
+
+from firstcrew.tool_guard import ToolGuard, guarded, query_key, tool_guard
+
+RESULT = "1. OpenAI ships GPT-5"
+
+
+@pytest.fixture
+def guard():
+    guard = ToolGuard(max_repeats=2)
+    guard.record("Web Search", "OpenAI GPT-5 release date", RESULT)
+    return guard
+
+
+def test_rewordings_share_a_key():
+    assert query_key("AI agents latest developments") == query_key("recent news about AI Agent")
+    assert query_key("AI agents") != query_key("AI agents pricing")
+
+
+def test_exact_repeat_is_memoized(guard):
+    action, answer = guard.lookup("Web Search", "openai  gpt-5 release DATE")
+    assert action == "memoized" and answer.endswith(RESULT)
+
+
+def test_rewording_is_similar(guard):
+    action, answer = guard.lookup("Web Search", "latest news on OpenAI GPT-5 release dates")
+    assert action == "similar" and answer.endswith(RESULT)
+
+
+@pytest.mark.parametrize("query", [
+    "OpenAI GPT-5 pricing date",
+    "OpenAI GPT-5 release",
+    "OpenAI GPT-4 release date",
+    "Anthropic GPT-5 release date",
+])
+def test_different_questions_run(guard, query):
+    assert guard.lookup("Web Search", query) == (None, None)
+
+
+def test_other_tool_is_not_matched(guard):
+    assert guard.lookup("News Search", "OpenAI GPT-5 release date") == (None, None)
+
+
+def test_repeats_are_counted_per_query(guard):
+    guard.record("Web Search", "Gemini 3 benchmarks", "gemini results")
+    assert guard.lookup("Web Search", "OpenAI GPT-5 release date")[0] == "memoized"
+    assert guard.lookup("Web Search", "OpenAI GPT-5 release date")[0] == "memoized"
+    # Another query's first repeat doesn't inherit the count
+    assert guard.lookup("Web Search", "Gemini 3 benchmarks")[0] == "memoized"
+    action, answer = guard.lookup("Web Search", "latest OpenAI GPT-5 release date")
+    assert action == "stopped"
+    assert "Final Answer" in answer and RESULT in answer and "gemini results" in answer
+
+
+def test_guarded_tool_runs_once_per_question():
+    calls = []
+
+    class Tool:
+        @guarded("Web Search")
+        def _run(self, query):
+            calls.append(query)
+            return f"results for {query}"
+
+    tool = Tool()
+    with tool_guard(enabled=True):
+        tool._run("AI agents")
+        tool._run("latest AI agents news")
+        tool._run("AI agents pricing")
+    assert calls == ["AI agents", "AI agents pricing"]
+
+    # Outside a guarded run every call goes through
+    tool._run("AI agents")
+    assert calls[-1] == "AI agents" and len(calls) == 3
+
+
+def test_errors_are_not_remembered():
+    outcomes = iter(["Error: rate limited", "real results"])
+
+    class Tool:
+        @guarded("Web Search")
+        def _run(self, query):
+            return next(outcomes)
+
+    with tool_guard(enabled=True):
+        assert Tool()._run("AI agents") == "Error: rate limited"
+        assert Tool()._run("AI agents") == "real results"
@@ -0,0 +1,71 @@
+"""Per-run tracing, OTLP export and the /api/trace timeline (user-031)"""
+
+import pytest
+
+import web_app
+from firstcrew import tracing
+
+
+@pytest.fixture
+def enabled(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", True)
+    monkeypatch.setattr(tracing, "TRACE_DIR", str(tmp_path))
+    monkeypatch.setattr(tracing, "_hooks_installed", True)  # no crewai event bus needed
+
+
+@tracing.traced("tool:search")
+def search(query, limit=3):
+    tracing.set_attribute("results", limit)
+    return query
+
+
+def test_disabled_records_nothing(monkeypatch, tmp_path):
+    monkeypatch.setattr(tracing, "TRACING_ENABLED", False)
+    monkeypatch.setattr(tracing, "TRACE_DIR", str(tmp_path))
+    with tracing.trace_run("run-1") as root:
+        assert root is None
+        with tracing.span("llm") as child:
+            assert child is None
+        assert search("q") == "q"
+    assert tracing.load_trace("run-1") is None
+
+
+def test_run_is_exported_with_nested_spans(enabled):
+    with tracing.trace_run("run-1", topic="AI"):
+        with tracing.span("llm:call", model="gpt-4o-mini"):
+            search("q", limit=5)
+
+    timeline = tracing.build_timeline(tracing.load_trace("run-1"))
+    assert [(entry["name"], entry["depth"]) for entry in timeline] == [
+        ("research_run", 0), ("llm:call", 1), ("tool:search", 2),
+    ]
+    assert timeline[0]["attributes"] == {"topic": "AI"}
+    assert timeline[2]["attributes"] == {"limit": 5, "results": 5}
+    assert timeline[0]["start_ms"] == 0
+    assert all(entry["status"] == "STATUS_CODE_OK" for entry in timeline)
+
+
+def test_errors_are_recorded_and_trace_still_exported(enabled):
+    with pytest.raises(ValueError):
+        with tracing.trace_run("run-2"):
+            with tracing.span("llm:call"):
+                raise ValueError("rate limited")
+
+    statuses = [entry["status"] for entry in tracing.build_timeline(tracing.load_trace("run-2"))]
+    assert statuses == ["STATUS_CODE_ERROR", "STATUS_CODE_ERROR"]
+
+
+def test_trace_path_is_sanitized(enabled, tmp_path):
+    path = tracing.save_trace("../../etc/passwd", {"resourceSpans": []})
+    assert path == str(tmp_path / "etcpasswd.json")
+    assert tracing.build_timeline(tracing.load_trace("../../etc/passwd")) == []
+
+
+def test_trace_endpoint(enabled):
+    client = web_app.app.test_client()
+    assert client.get("/api/trace/missing").status_code == 404
+    with tracing.trace_run("task-1"):
+        pass
+    body = client.get("/api/trace/task-1").get_json()
+    assert body["task_id"] == "task-1"
+    assert body["timeline"][0]["name"] == "research_run"
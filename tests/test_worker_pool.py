@@ -0,0 +1,147 @@
+"""Bounded worker pool and the /healthz and /readyz probes (user-029), fair queuing (user-036)"""
+
+import threading
+import time
+
+import pytest
+
+import web_app
+from firstcrew.worker_pool import FairQueue, WorkerPool
+
+
+def wait_for(condition, timeout=5):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_pool_caps_concurrent_jobs():
+    pool = WorkerPool(max_workers=2, max_active_per_principal=2)
+    release = threading.Event()
+    started = []
+
+    def job(n):
+        started.append(n)
+        release.wait(5)
+
+    for n in range(4):
+        pool.submit(job, n, principal="u1")
+    wait_for(lambda: len(started) == 2)
+    assert pool.stats()["active"] == 2
+    assert pool.stats()["idle"] == 0
+    assert pool.stats()["queued"] == 2
+
+    release.set()
+    wait_for(lambda: len(started) == 4 and pool.stats()["active"] == 0)
+    assert pool.stats()["queued"] == 0
+    assert len(pool.threads) == 2
+
+
+def test_failing_job_frees_its_worker():
+    pool = WorkerPool(max_workers=1)
+    done = threading.Event()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    pool.submit(fail)
+    pool.submit(done.set)
+    assert done.wait(5)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(web_app, "get_job_broker", lambda: None)
+    monkeypatch.setattr(web_app, "get_available_llm_count", lambda: 2)
+    return web_app.app.test_client()
+
+
+def test_healthz(client):
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+
+def test_readyz_ready(client, monkeypatch):
+    monkeypatch.setattr(web_app, "worker_pool", WorkerPool(max_workers=2))
+    response = client.get("/readyz")
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body["status"] == "ready"
+    assert body["idle_workers"] == 2
+    assert body["available_llm_configs"] == 2
+
+
+def test_readyz_unavailable_without_llm_keys(client, monkeypatch):
+    monkeypatch.setattr(web_app, "worker_pool", WorkerPool(max_workers=2))
+    monkeypatch.setattr(web_app, "get_available_llm_count", lambda: 0)
+    response = client.get("/readyz")
+    assert response.status_code == 503
+    assert response.get_json()["status"] == "unavailable"
+
+
+def test_readyz_unavailable_when_saturated(client, monkeypatch):
+    pool = WorkerPool(max_workers=1)
+    pool.jobs.queued = web_app.READY_MAX_QUEUED  # waiting interactive/normal runs
+    pool.jobs.queued_by_priority = lambda: {"interactive": 0, "normal": pool.jobs.queued, "batch": 0}
+    monkeypatch.setattr(web_app, "worker_pool", pool)
+    assert client.get("/readyz").status_code == 503
+
+
+def drain(queue, finish=True):
+    """Dispatch every job that can run now, in order"""
+    order = []
+    while True:
+        job = queue._next_job()
+        if job is None:
+            return order
+        order.append(job)
+        if finish:
+            queue.done(job[0])
+
+
+def test_principals_take_turns():
+    queue = FairQueue(max_active_per_principal=10)
+    for n in range(3):
+        queue.put(("heavy", n), "heavy", "normal")
+    queue.put(("light", 0), "light", "normal")
+    assert drain(queue) == [("heavy", 0), ("heavy", 1), ("light", 0), ("heavy", 2)]
+
+
+def test_priority_weights_share_dispatches():
+    queue = FairQueue(max_active_per_principal=100)
+    for n in range(12):
+        queue.put(("interactive", n), "u1", "interactive")
+        queue.put(("batch", n), "u2", "batch")
+    first = [kind for kind, _ in drain(queue)[:10]]
+    assert first.count("interactive") == 8
+    assert first.count("batch") == 2
+
+
+def test_active_limit_skips_principal_until_done():
+    queue = FairQueue(max_active_per_principal=1)
+    queue.put(("a", 0), "a", "interactive")
+    queue.put(("a", 1), "a", "interactive")
+    queue.put(("b", 0), "b", "batch")
+
+    assert drain(queue, finish=False) == [("a", 0), ("b", 0)]
+    assert queue.queued_for("a") == 1
+    queue.done("a")
+    assert queue.get() == ("a", 1)
+    assert queue.queued == 0
+
+
+def test_unknown_priority_is_rejected():
+    pool = WorkerPool(max_workers=1)
+    with pytest.raises(ValueError):
+        pool.submit(print, priority="urgent")
+    assert pool.stats()["queued"] == 0
+
+
+def test_queued_by_priority():
+    queue = FairQueue(max_active_per_principal=1)
+    queue.put(("x",), "a", "batch")
+    queue.put(("y",), "b", "batch")
+    queue.put(("z",), "a", "normal")
+    assert queue.queued_by_priority() == {"interactive": 0, "normal": 1, "batch": 2}
@@ -1,145 +1,547 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, Response, render_template, request, jsonify
+import hmac
 import os
 import sys
 import json
 from datetime import datetime
 import threading
 import time
+import uuid
 
 # Add the src directory to Python path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
+from firstcrew.job_queue import COMPLETED, QUEUED, RUNNING, get_job_broker
+from firstcrew.llm_batch import LLM_BATCH_API, LLM_BATCH_CONCURRENCY
+from firstcrew.report_delivery import (
+    conditional_response, make_etag, not_modified, shape_content
+)
+from firstcrew.refresh import find_previous_report
+from firstcrew.report_search import get_report_index, sync_index
+from firstcrew.research_run import execute_research
+from firstcrew.report_store import get_report_store, import_report_files
+from firstcrew.metrics import ACTIVE_WORKERS, CONTENT_TYPE, QUEUE_DEPTH, render_metrics
+from firstcrew.tracing import build_timeline, load_trace, save_trace
+from firstcrew.task_store import UNFINISHED_STATUSES, get_task_store
+from firstcrew.token_budget import create_budget
+from firstcrew.worker_pool import DEFAULT_PRIORITY, PRIORITY_WEIGHTS, WorkerPool
+
 try:
-    from firstcrew.enhanced_crew import EnhancedFirstcrew
-    from firstcrew.llm_manager import get_llm_status
-    Firstcrew = EnhancedFirstcrew
+    from firstcrew.llm_manager import (
+        get_llm_status, get_available_llm_count, reload_llm_manager, watch_llm_config
+    )
 except ImportError:
-    try:
-        from firstcrew.crew import Firstcrew
-        get_llm_status = lambda: {"error": "Enhanced LLM manager not available"}
-    except ImportError:
-        print("Warning: Could not import Firstcrew. Make sure you're in the correct directory.")
-        Firstcrew = None
-        get_llm_status = lambda: {"error": "No LLM manager available"}
+    get_llm_status = lambda: {"error": "Enhanced LLM manager not available"}
+    get_available_llm_count = None
+    reload_llm_manager = None
+    watch_llm_config = None
+
+# The crew classes pull in crewai and litellm, which dominate cold start, so
+# they are imported on first use by a research worker instead of at load time
+_crew_class = None
+_crew_class_lock = threading.Lock()
+
+def get_crew_class():
+    """Import and return the crew class used for research runs"""
+    global _crew_class
+    with _crew_class_lock:
+        if _crew_class is None:
+            if os.getenv('RESEARCH_CREW', 'enhanced') == 'basic':
+                from firstcrew.crew import Firstcrew as crew_class
+            else:
+                try:
+                    from firstcrew.enhanced_crew import EnhancedFirstcrew as crew_class
+                except ImportError:
+                    from firstcrew.crew import Firstcrew as crew_class
+            _crew_class = crew_class
+    return _crew_class
 
 app = Flask(__name__)
 
 # Store for ongoing research tasks
 research_tasks = {}
 
+# Research runs execute on a bounded pool instead of a thread per request
+worker_pool = WorkerPool(
+    max_workers=int(os.getenv('MAX_CONCURRENT_RESEARCH', 4)),
+    max_active_per_principal=int(os.getenv('MAX_RESEARCH_PER_USER', 0)) or None
+)
+
+# With LLM_BATCH_API=1 bulk runs wait on provider batches, mostly idle, so they
+# get a pool of their own instead of holding the interactive workers
+batch_pool = WorkerPool(max_workers=LLM_BATCH_CONCURRENCY, max_active_per_principal=LLM_BATCH_CONCURRENCY)
+
+# Chat users wait on the answer, API clients may be bulk jobs
+INTERACTIVE_CHANNELS = {'slack', 'telegram'}
+
+# Callers trusted to submit on behalf of their users, as name=token pairs
+# (e.g. "slack=...,telegram=..."). They authenticate with "Authorization:
+# Bearer <token>", the name becomes the channel and they may pass user_id and
+# any priority. Other requests are queued per client address on the api
+# channel and may only lower their priority.
+TRUSTED_CALLERS = dict(
+    pair.strip().split('=', 1) for pair in os.getenv('TRUSTED_CALLERS', '').split(',') if '=' in pair
+)
+
+# Queue depth above which /readyz reports the instance as saturated
+# (batch jobs are expected to wait and don't count)
+READY_MAX_QUEUED = int(os.getenv('READY_MAX_QUEUED', worker_pool.max_workers))
+
+# Queued runs a single user may have before new submissions are rejected
+MAX_QUEUED_PER_USER = int(os.getenv('MAX_QUEUED_PER_USER', 100))
+
+# Long polling of /task_status (?wait=N): upper bound and check interval
+MAX_STATUS_WAIT = float(os.getenv('MAX_STATUS_WAIT', 30))
+STATUS_POLL_INTERVAL = 0.25
+FINISHED_STATUSES = ('completed', 'failed')
+
+# Seconds between reads of the job queue when research workers run the crews
+JOB_POLL_INTERVAL = float(os.getenv('JOB_POLL_INTERVAL', 1))
+
 @app.route('/')
 def index():
     return render_template('index.html')
 
+@app.route('/healthz')
+def healthz():
+    """Liveness probe: the process is up and serving requests"""
+    return jsonify({'status': 'ok'})
+
+def readiness():
+    """Readiness payload and whether workers and LLM keys are available for new research"""
+    broker = get_job_broker()
+    if broker is not None:
+        # LLM keys are configured on the research workers
+        pool = broker.stats()
+        available_llms = None
+    else:
+        pool = worker_pool.stats()
+        available_llms = get_available_llm_count() if get_available_llm_count else None
+
+    waiting = pool['queued'] - pool['queued_by_priority'].get('batch', 0)
+    ready = waiting < READY_MAX_QUEUED and available_llms != 0 and pool['workers'] > 0
+    return {
+        'status': 'ready' if ready else 'unavailable',
+        'queue_depth': pool['queued'],
+        'queued_by_priority': pool['queued_by_priority'],
+        'active_workers': pool['active'],
+        'idle_workers': pool['idle'],
+        'max_workers': pool['workers'],
+        'available_llm_configs': available_llms
+    }, ready
+
+@app.route('/readyz')
+def readyz():
+    """Readiness probe: workers and LLM keys are available for new research"""
+    payload, ready = readiness()
+    return jsonify(payload), 200 if ready else 503
+
+@app.route('/metrics')
+def metrics():
+    """Prometheus scrape endpoint for pipeline metrics"""
+    return Response(render_metrics(), content_type=CONTENT_TYPE)
+
+def queued_for(principal):
+    """Research runs of a user still waiting for a worker"""
+    broker = get_job_broker()
+    if broker is not None:
+        return broker.queued_for(principal)
+    return worker_pool.jobs.queued_for(principal)
+
+def request_caller():
+    """Name of the trusted caller a request authenticates as, '' if it sends no token, None if the token is wrong"""
+    auth = request.headers.get('Authorization', '')
+    if not auth.startswith('Bearer '):
+        return ''
+    token = auth[len('Bearer '):].strip().encode()
+    for name, secret in TRUSTED_CALLERS.items():
+        if hmac.compare_digest(token, secret.strip().encode()):
+            return name.strip()
+    return None
+
 @app.route('/start_research', methods=['POST'])
 def start_research():
     data = request.json
     topic = data.get('topic', 'AI LLMs')
     
-    # Generate unique task ID
-    task_id = f"task_{int(time.time())}"
+    # Optional per-run token budget (defaults come from RUN_TOKEN_BUDGET / TOKEN_BUDGET_MODE)
+    try:
+        budget = create_budget(data.get('token_budget'), data.get('budget_mode'))
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid token budget: {e}'}), 400
+    
+    # Fair queuing key and priority class come from who is calling, not from the body
+    caller = request_caller()
+    if caller is None:
+        return jsonify({'error': 'Unknown API token'}), 401
+    if caller:
+        channel = caller
+        user_id = str(data.get('user_id') or 'anonymous')
+        default_priority = 'interactive' if channel in INTERACTIVE_CHANNELS else DEFAULT_PRIORITY
+    else:
+        channel = 'api'
+        user_id = request.remote_addr or 'anonymous'
+        default_priority = DEFAULT_PRIORITY
+    principal = f"{channel}:{user_id}"
+    priority = data.get('priority') or default_priority
+    if priority not in PRIORITY_WEIGHTS:
+        return jsonify({'error': f"Invalid priority, expected one of: {', '.join(PRIORITY_WEIGHTS)}"}), 400
+    if not caller and PRIORITY_WEIGHTS[priority] > PRIORITY_WEIGHTS[default_priority]:
+        return jsonify({'error': f"Priority {priority} needs an API token"}), 403
+    if queued_for(principal) >= MAX_QUEUED_PER_USER:
+        return jsonify({'error': 'Too many queued research tasks, try again later'}), 429
+    
+    # Refresh mode updates the previous report on the topic instead of starting over
+    refresh = bool(data.get('refresh'))
+    
+    # Generate unique task ID (several requests can arrive within one second)
+    task_id = f"task_{int(time.time())}_{uuid.uuid4().hex[:8]}"
     
     # Initialize task status
     research_tasks[task_id] = {
-        'status': 'starting',
+        'status': 'queued',
         'topic': topic,
+        'principal': principal,
+        'priority': priority,
         'start_time': datetime.now().isoformat(),
-        'progress': 'Initializing research...',
+        'progress': 'Waiting for a free research worker...',
         'result': None,
-        'error': None
+        'error': None,
+        'token_budget': data.get('token_budget'),
+        'budget_mode': data.get('budget_mode'),
+        'refresh': refresh
     }
+    get_task_store().save_task(task_id, research_tasks[task_id])
     
-    # Start research in background thread
-    thread = threading.Thread(target=run_research, args=(task_id, topic))
-    thread.daemon = True
-    thread.start()
+    # Run research on the worker pool (or a research worker)
+    dispatch_research(task_id, budget)
     
     return jsonify({'task_id': task_id, 'status': 'started'})
 
-def run_research(task_id, topic):
+def update_task(task_id, **fields):
+    """Update a task record and persist it to the task store"""
+    research_tasks[task_id].update(fields)
+    get_task_store().save_task(task_id, research_tasks[task_id])
+
+def run_research(task_id, topic, budget=None, refresh=False):
+    store = get_task_store()
+    budget = budget or create_budget()
     try:
-        research_tasks[task_id]['status'] = 'running'
-        research_tasks[task_id]['progress'] = 'Starting AI research crew...'
-        
-        inputs = {
-            'topic': topic,
-            'current_year': str(datetime.now().year)
-        }
+        update_task(task_id, status='running', progress='Starting AI research crew...')
+        crew_class = get_crew_class()
         
-        research_tasks[task_id]['progress'] = 'Conducting web research...'
+        # Refresh mode: build on the newest report for the topic, if there is one
+        previous = find_previous_report(get_report_store(), topic) if refresh else None
+        if previous:
+            update_task(task_id, refreshed_from=previous['task_id'])
         
-        # Run the crew
-        crew = Firstcrew()
-        result = crew.crew().kickoff(inputs=inputs)
+        def progress(message):
+            research_tasks[task_id]['progress'] = message
         
-        research_tasks[task_id]['status'] = 'completed'
-        research_tasks[task_id]['progress'] = 'Research completed successfully!'
-        research_tasks[task_id]['result'] = str(result)
-        research_tasks[task_id]['end_time'] = datetime.now().isoformat()
-        
-        # Save report to file
-        report_filename = f"report_{task_id}.md"
-        if os.path.exists('report.md'):
-            os.rename('report.md', report_filename)
-            research_tasks[task_id]['report_file'] = report_filename
+        try:
+            content, findings = execute_research(task_id, topic, crew_class, store, budget, previous,
+                                                 progress=progress, batch_api=uses_batch_api(task_id))
+        finally:
+            research_tasks[task_id]['token_usage'] = budget.summary()
+        finish_research(task_id, topic, content, findings)
+        store.delete_outputs(task_id)
         
     except Exception as e:
-        research_tasks[task_id]['status'] = 'failed'
-        research_tasks[task_id]['error'] = str(e)
-        research_tasks[task_id]['end_time'] = datetime.now().isoformat()
+        update_task(task_id, status='failed', error=str(e), end_time=datetime.now().isoformat())
+
+def finish_research(task_id, topic, content, findings=None):
+    """Store and index a finished report (and its research findings) and mark its task completed"""
+    # Keep the report in the store (the crew's shared report.md is
+    # overwritten by concurrent runs)
+    report = get_report_store().put(task_id, content, findings=findings, topic=topic)
+    research_tasks[task_id]['report_digest'] = report['digest']
+    get_report_index().add(task_id, topic, content, datetime.now().isoformat())
+    # Retrieval pulls in numpy, so it is imported on first use rather than at startup
+    from firstcrew.retrieval import index_report
+    index_report(task_id, topic, content)
+    
+    update_task(
+        task_id,
+        status='completed',
+        progress='Research completed successfully!',
+        result=content,
+        end_time=datetime.now().isoformat()
+    )
+
+def uses_batch_api(task_id):
+    """Bulk runs send their LLM calls through provider batch APIs when LLM_BATCH_API=1"""
+    return LLM_BATCH_API and research_tasks[task_id].get('priority') == 'batch'
+
+def job_payload(task_id):
+    """Everything a research worker needs to run a task without the web app's stores"""
+    from firstcrew.retrieval import prior_findings
+
+    task = research_tasks[task_id]
+    previous = find_previous_report(get_report_store(), task['topic']) if task.get('refresh') else None
+    if previous:
+        update_task(task_id, refreshed_from=previous['task_id'])
+        previous = {**previous, 'created_at': previous['created_at'].isoformat()}
+    return {
+        'topic': task['topic'],
+        'token_budget': task.get('token_budget'),
+        'budget_mode': task.get('budget_mode'),
+        'previous': previous,
+        'passages': None if previous else prior_findings(task['topic']),
+        'batch_api': uses_batch_api(task_id),
+    }
+
+def dispatch_research(task_id, budget=None):
+    """Queue a research run: on the job queue if JOB_QUEUE_URL is set, otherwise in-process"""
+    task = research_tasks[task_id]
+    principal = task.get('principal', 'anonymous')
+    priority = task.get('priority', DEFAULT_PRIORITY)
+    broker = get_job_broker()
+    if broker is not None:
+        broker.submit(task_id, job_payload(task_id), principal=principal, priority=priority)
+    else:
+        pool = batch_pool if uses_batch_api(task_id) else worker_pool
+        pool.submit(
+            run_research, task_id, task['topic'], budget, task.get('refresh', False),
+            principal=principal, priority=priority
+        )
+
+def apply_job_change(broker, change):
+    """Mirror a job queue change into its task record"""
+    task_id = change['job_id']
+    task = research_tasks.get(task_id)
+    if task is None:
+        return
+    
+    status = change['status']
+    if status == QUEUED and task['status'] == 'running':
+        update_task(task_id, status='queued', progress='Waiting for a free research worker...')
+    elif status == RUNNING:
+        progress = change['fields'].get('progress', 'Starting AI research crew...')
+        if task['status'] != 'running' or task.get('worker') != change['worker_id']:
+            update_task(task_id, status='running', progress=progress, worker=change['worker_id'])
+        else:
+            task['progress'] = progress
+    elif status in FINISHED_STATUSES:
+        result = change['result'] or {}
+        task['token_usage'] = result.get('token_usage')
+        if result.get('trace'):
+            # Traces are recorded on the worker; keep them here for /api/trace
+            try:
+                save_trace(task_id, result['trace'])
+            except OSError as e:
+                print(f"⚠️  Could not save trace for {task_id}: {e}")
+        try:
+            if status == COMPLETED:
+                finish_research(task_id, task['topic'], result['content'], result.get('findings'))
+            else:
+                update_task(task_id, status='failed', error=change['error'], end_time=datetime.now().isoformat())
+        except Exception as e:
+            update_task(task_id, status='failed', error=str(e), end_time=datetime.now().isoformat())
+        broker.remove(task_id)
+
+def collect_jobs(broker, interval=JOB_POLL_INTERVAL):
+    """Follow progress and results reported by research workers"""
+    since, seen = 0.0, {}
+    while True:
+        try:
+            # Look back a little: a change can commit with a slightly older timestamp
+            for change in broker.changes(since - 1.0):
+                if seen.get(change['job_id']) == change['updated_at']:
+                    continue
+                seen[change['job_id']] = change['updated_at']
+                since = max(since, change['updated_at'])
+                apply_job_change(broker, change)
+                if change['status'] in FINISHED_STATUSES:
+                    seen.pop(change['job_id'], None)
+        except Exception as e:
+            print(f"⚠️  Job queue error: {e}")
+        time.sleep(interval)
+
+def export_queue_metrics(broker):
+    """Report the job queue's depth and running jobs as this process's queue gauges"""
+    def stat(key):
+        try:
+            return broker.stats()[key]
+        except Exception as e:
+            print(f"⚠️  Job queue error: {e}")
+            return 0
+
+    # The in-process worker pool never runs here, so the gauges would stay at 0
+    QUEUE_DEPTH.set_function(lambda: stat('queued'))
+    ACTIVE_WORKERS.set_function(lambda: stat('active'))
+
+def forget_reports(task_ids):
+    """Drop expired reports from the search and retrieval indexes"""
+    from firstcrew.retrieval import get_retrieval_index
+
+    get_report_index().remove(task_ids)
+    for task_id in task_ids:
+        get_retrieval_index().remove_source(f"report:{task_id}")
+
+def sync_retrieval():
+    """Embed stored reports the retrieval index is missing"""
+    from firstcrew.retrieval import get_retrieval_index, sync_reports
+    sync_reports(get_retrieval_index(), get_report_store())
+
+def restore_tasks():
+    """Load task records from the task store and resume interrupted runs"""
+    store = get_task_store()
+    research_tasks.update(store.load_tasks())
+
+    imported = import_report_files(get_report_store(), research_tasks)
+    if imported:
+        print(f"📦 Moved {len(imported)} report file(s) into the report store")
+    indexed = sync_index(get_report_index(), get_report_store())
+    if indexed['added']:
+        print(f"🔎 Indexed {indexed['added']} report(s) for search")
+    
+    # Embedding reports can take a while, don't hold up startup
+    threading.Thread(target=sync_retrieval, name="retrieval-sync", daemon=True).start()
+
+    resumed = 0
+    for task_id, task in research_tasks.items():
+        if task['status'] not in UNFINISHED_STATUSES:
+            continue
+        try:
+            budget = create_budget(task.get('token_budget'), task.get('budget_mode'))
+        except (TypeError, ValueError):
+            budget = None
+        update_task(task_id, status='queued', progress='Resuming after a restart...')
+        dispatch_research(task_id, budget)
+        resumed += 1
+
+    if resumed:
+        print(f"🔁 Resuming {resumed} interrupted research task(s)")
+
+def task_state(task):
+    """What a status poller is waiting to see change"""
+    return task.get('status'), task.get('progress'), task.get('error')
+
+def status_wait(args):
+    """Seconds a status request may wait for a change (?wait=N long polling)"""
+    return max(0.0, min(args.get('wait', 0, type=float) or 0.0, MAX_STATUS_WAIT))
 
 @app.route('/task_status/<task_id>')
 def task_status(task_id):
-    if task_id in research_tasks:
-        return jsonify(research_tasks[task_id])
-    else:
+    """Task record; with ?wait=N the response is held until the task changes (at most N seconds)"""
+    if task_id not in research_tasks:
         return jsonify({'error': 'Task not found'}), 404
+    
+    task = research_tasks[task_id]
+    state = task_state(task)
+    deadline = time.monotonic() + status_wait(request.args)
+    while task['status'] not in FINISHED_STATUSES and task_state(task) == state and time.monotonic() < deadline:
+        time.sleep(STATUS_POLL_INTERVAL)
+    return jsonify(task)
 
 @app.route('/download_report/<task_id>')
 def download_report(task_id):
-    if task_id in research_tasks and 'report_file' in research_tasks[task_id]:
-        report_file = research_tasks[task_id]['report_file']
-        if os.path.exists(report_file):
-            return send_file(report_file, as_attachment=True, download_name=f"research_report_{task_id}.md")
+    """Download a report (gzip/brotli, ETag/Last-Modified revalidation and Range requests)"""
+    if task_id in research_tasks:
+        found = get_report_store().get_bytes(task_id)
+        if found:
+            body, report = found
+            return conditional_response(
+                request, body, 'text/markdown',
+                etag=report['digest'][:20],
+                last_modified=report['created_at'],
+                accept_ranges=True,
+                headers={'Content-Disposition': f'attachment; filename="research_report_{task_id}.md"'}
+            )
     return jsonify({'error': 'Report not found'}), 404
 
 @app.route('/api/reports')
 def list_reports():
     """API endpoint to list all completed research reports"""
-    completed_tasks = {
+    return jsonify(completed_reports())
+
+def completed_reports():
+    """Summary of every completed research task by task id"""
+    return {
         task_id: {
             'topic': task_data['topic'],
             'start_time': task_data['start_time'],
             'end_time': task_data.get('end_time'),
             'status': task_data['status']
         }
-        for task_id, task_data in research_tasks.items()
+        for task_id, task_data in list(research_tasks.items())
         if task_data['status'] == 'completed'
     }
-    return jsonify(completed_tasks)
+
+@app.route('/api/reports/search')
+def search_reports():
+    """Full-text search over completed reports: ?q=<text>&limit=10&offset=0"""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'Query parameter q is required'}), 400
+    limit = request.args.get('limit', 10, type=int)
+    offset = request.args.get('offset', 0, type=int)
+    return jsonify(get_report_index().search(query, limit=limit, offset=offset))
 
 @app.route('/api/report/<task_id>')
 def get_report_content(task_id):
-    """API endpoint to get report content as JSON"""
+    """
+    API endpoint to get report content as JSON.
+
+    ?section=<heading or number> (repeatable or comma separated) returns only
+    those sections and ?max_chars=N cuts the content at a paragraph break.
+    """
     if task_id in research_tasks and research_tasks[task_id]['status'] == 'completed':
         task_data = research_tasks[task_id]
-        report_file = task_data.get('report_file')
+        report = get_report_store().entry(task_id)
         
-        if report_file and os.path.exists(report_file):
-            with open(report_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            return jsonify({
+        if report:
+            etag = make_etag(report['digest'], request.query_string)
+            cached = not_modified(request, etag, report['created_at'])
+            if cached is not None:
+                return cached
+
+            found = get_report_store().get_bytes(task_id)
+            if found is None:
+                return jsonify({'error': 'Report not found'}), 404
+            content = found[0].decode('utf-8')
+            shaped = shape_content(content, request.args)
+            payload = json.dumps({
                 'task_id': task_id,
                 'topic': task_data['topic'],
                 'start_time': task_data['start_time'],
                 'end_time': task_data['end_time'],
-                'content': content,
+                'content': shaped['content'],
+                'sections': shaped['sections'],
+                'truncated': shaped['truncated'],
+                'total_chars': len(content),
                 'status': 'success'
-            })
+            }).encode('utf-8')
+            return conditional_response(request, payload, 'application/json', etag, report['created_at'])
     
     return jsonify({'error': 'Report not found'}), 404
 
+@app.route('/api/report/<task_id>/findings')
+def get_report_findings(task_id):
+    """API endpoint to get the structured research findings a report was written from"""
+    findings = get_report_store().get_findings(task_id)
+    if findings is None:
+        return jsonify({'error': 'No findings stored for this report'}), 404
+    entry = get_report_store().entry(task_id)
+    return jsonify({
+        'task_id': task_id,
+        'topic': (entry or {}).get('topic'),
+        'findings': findings,
+        'status': 'success'
+    })
+
+@app.route('/api/trace/<task_id>')
+def get_trace(task_id):
+    """API endpoint to get the span timeline of a traced research run"""
+    trace = load_trace(task_id)
+    if trace is None:
+        return jsonify({'error': 'Trace not found (set TRACING_ENABLED=1 to record traces)'}), 404
+    return jsonify({
+        'task_id': task_id,
+        'timeline': build_timeline(trace),
+        'otlp': trace
+    })
+
 @app.route('/api/llm_status')
 def llm_status():
     """API endpoint to get LLM status and usage"""
@@ -149,9 +551,50 @@ def llm_status():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/llm_reload', methods=['POST'])
+def llm_reload():
+    """API endpoint to hot-reload LLM keys from the environment and .env file"""
+    if reload_llm_manager is None:
+        return jsonify({'error': 'Enhanced LLM manager not available'}), 501
+    try:
+        diff = reload_llm_manager()
+        return jsonify({'status': 'reloaded', **diff})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def start_background_services():
+    """Restore tasks and start the background threads of a serving process"""
+    # Optionally pick up .env key changes without a restart
+    reload_interval = os.getenv('LLM_RELOAD_INTERVAL')
+    if reload_interval and watch_llm_config is not None:
+        watch_llm_config(float(reload_interval))
+
+    # Pick up tasks from before the last restart and resume unfinished runs
+    restore_tasks()
+    get_report_store().start_compaction(on_expired=forget_reports)
+
+    # Research workers run the crews: follow their progress and results
+    broker = get_job_broker()
+    if broker is not None:
+        threading.Thread(target=collect_jobs, args=(broker,), name="job-collector", daemon=True).start()
+        export_queue_metrics(broker)
+        print(f"📬 Research runs go to the job queue ({os.getenv('JOB_QUEUE_URL')})")
+
+    # Warm up the crew imports in the background while requests are already served
+    elif os.getenv('PRELOAD_CREW', '1') == '1':
+        preload_thread = threading.Thread(target=get_crew_class, name="crew-preload")
+        preload_thread.daemon = True
+        preload_thread.start()
+
 if __name__ == '__main__':
     # Create templates directory if it doesn't exist
     os.makedirs('templates', exist_ok=True)
     os.makedirs('static', exist_ok=True)
-    
-    app.run(host='0.0.0.0', port=5000, debug=True)
\ No newline at end of file
+
+    # The debug reloader starts a second interpreter, doubling cold start
+    debug = os.getenv('FLASK_DEBUG', '1') == '1'
+    serving_process = not debug or os.environ.get('WERKZEUG_RUN_MAIN') == 'true'
+    if serving_process:
+        start_background_services()
+
+    app.run(host='0.0.0.0', port=int(os.getenv('PORT', 5000)), debug=debug)